@@ -0,0 +1,56 @@
+"""
+Mide el cálculo de estadísticas de uso (database.analytics.usage_stats) sobre una
+tabla grande de registros.
+
+Uso:
+    python benchmarks/bench_analytics.py [filas]
+
+Crea una base de datos temporal con el número de registros indicado (1 000 000 por
+defecto) repartidos entre 16 laboratorios, 40 docentes y 4 períodos, calcula
+resumen_diario y mide cada agrupación con y sin filtro de período.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TMP = tempfile.mkdtemp()
+
+os.environ["REGISTROS_DATABASE_URL"] = f"sqlite:///{os.path.join(TMP, 'bench.db')}"
+sys.path.insert(0, ROOT)
+
+from database.database import engine, session_scope
+from database.analytics import DIMENSIONES, usage_stats
+from database.daily_summary import ensure_daily_summary
+from seed import seed_registros
+
+
+def main():
+    filas = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+    start = time.perf_counter()
+    seed_registros(filas)
+    print(f"Registros: {filas}  (carga en {time.perf_counter() - start:.1f} s)")
+
+    # Los registros se insertaron sin triggers: calcular resumen_diario una vez
+    start = time.perf_counter()
+    ensure_daily_summary(engine)
+    print(f"Resumen diario calculado en {time.perf_counter() - start:.1f} s")
+
+    for dimension, titulo in DIMENSIONES:
+        for periodo_id in (None, 2):
+            with session_scope() as db:
+                start = time.perf_counter()
+                stats = usage_stats(db, dimension, periodo_id=periodo_id)
+                elapsed = (time.perf_counter() - start) * 1000
+            filtro = "período 2" if periodo_id else "sin filtro"
+            print(f"  {titulo:<12} {filtro:<11} {len(stats):3d} grupos  {elapsed:7.1f} ms")
+
+    shutil.rmtree(TMP, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Mide la exportación de registros (database.export.export_registros) en cada formato
+disponible.
+
+Uso:
+    python benchmarks/bench_export.py [filas]
+
+Crea una base de datos temporal con el número de registros indicado (1 000 000 por
+defecto), los exporta completos a CSV y, si pyarrow u openpyxl están instalados, a
+Parquet y Excel (este último solo si caben en una hoja), y muestra filas por segundo y
+tamaño del archivo. Al final repite la exportación a CSV con tracemalloc para medir el
+pico de memoria de Python, que debe quedar casi igual con 100 000 que con 1 000 000 de
+filas.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TMP = tempfile.mkdtemp()
+
+os.environ["REGISTROS_DATABASE_URL"] = f"sqlite:///{os.path.join(TMP, 'bench.db')}"
+sys.path.insert(0, ROOT)
+
+from database.export import MAX_FILAS_XLSX, available_formats, export_registros
+from seed import seed_registros
+
+
+def main():
+    filas = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+    start = time.perf_counter()
+    seed_registros(filas, carreras=1, laboratorios_por_carrera=8, docentes=30)
+    print(f"Registros: {filas}  (carga en {time.perf_counter() - start:.1f} s)")
+
+    for formato, _, _ in available_formats():
+        if formato == "xlsx" and filas > MAX_FILAS_XLSX:
+            print(f"  {formato:<8} omitido: más filas de las que admite una hoja de Excel")
+            continue
+        file_path = os.path.join(TMP, f"registros.{formato}")
+        resultado = export_registros(file_path)
+        tamano = os.path.getsize(file_path) / (1024 * 1024)
+        print(f"  {formato:<8} {resultado.filas} filas en {resultado.segundos:6.2f} s  "
+              f"{resultado.filas_por_segundo:9.0f} filas/s  {tamano:7.1f} MB")
+        os.remove(file_path)
+
+    # tracemalloc hace más lenta la exportación: se mide aparte del tiempo
+    tracemalloc.start()
+    export_registros(os.path.join(TMP, "memoria.csv"))
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"Pico de memoria de Python exportando a CSV: {pico / (1024 * 1024):.1f} MB")
+
+    shutil.rmtree(TMP, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Mide la generación de los reportes de un período completo (un PDF por laboratorio y
+docente) con uno y con varios procesos.
+
+Uso:
+    python benchmarks/bench_report_batch.py [procesos] [registros_por_reporte]
+
+Crea una base de datos temporal con 4 laboratorios y 6 docentes con registros en
+todos los pares (24 documentos, 300 registros cada uno por defecto) y genera el lote
+primero con un solo proceso y luego con el número de procesos indicado (por defecto
+el número de núcleos).
+"""
+
+import datetime
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, ROOT)
+
+LABORATORIOS = ["Resistencia de Materiales", "Turbomaquinaria e Hidráulica", "Metrología",
+                "Instrumentación y Control"]
+DOCENTES = 6
+
+
+def seed(registros_por_reporte):
+    from database.database import engine, SessionLocal
+    from database.models import Base, Carrera, Docente, Laboratorio, Periodo, RegistroUso
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    carrera = Carrera(nombre="Mecánica")
+    db.add(carrera)
+    db.flush()
+    labs = [Laboratorio(nombre=nombre, carrera_id=carrera.id) for nombre in LABORATORIOS]
+    docentes = [Docente(nombre="Docente", apellido=f"Número {i + 1}", carrera_id=carrera.id)
+                for i in range(DOCENTES)]
+    periodo = Periodo(nombre="2025-1", fecha_inicio=datetime.date(2025, 1, 1),
+                      fecha_fin=datetime.date(2025, 12, 31))
+    db.add_all(labs + docentes + [periodo])
+    db.flush()
+
+    filas = []
+    for lab in labs:
+        for docente in docentes:
+            for i in range(registros_por_reporte):
+                hora = 7 + i % 12
+                filas.append({
+                    "fecha": datetime.date(2025, 1, 1) + datetime.timedelta(days=i // 12),
+                    "hora_entrada": datetime.time(hora, 0),
+                    "hora_salida": datetime.time(hora, 50),
+                    "actividad": f"Práctica {i} de {lab.nombre}",
+                    "docente_id": docente.id,
+                    "laboratorio_id": lab.id,
+                    "periodo_id": periodo.id
+                })
+    db.bulk_insert_mappings(RegistroUso, filas)
+    db.commit()
+    periodo_id = periodo.id
+    db.close()
+    return periodo_id
+
+
+def run(periodo_id, procesos, tmp):
+    from ui.report_batch import generate_period_reports
+
+    output_dir = os.path.join(tmp, f"lote_{procesos}")
+    start = time.perf_counter()
+    _, resultados = generate_period_reports(periodo_id, output_dir, max_workers=procesos)
+    elapsed = time.perf_counter() - start
+
+    errores = [resultado.error for resultado in resultados if resultado.error]
+    if errores:
+        raise RuntimeError(f"Fallaron {len(errores)} documentos: {errores[0]}")
+    paginas = sum(resultado.paginas for resultado in resultados)
+    print(f"{procesos:2d} proceso(s): {len(resultados)} documentos, {paginas} páginas en {elapsed:.2f} s")
+    return elapsed
+
+
+def main():
+    procesos = int(sys.argv[1]) if len(sys.argv) > 1 else (os.cpu_count() or 1)
+    registros_por_reporte = int(sys.argv[2]) if len(sys.argv) > 2 else 300
+
+    # La base de datos se configura aquí y no al importar el módulo: los procesos del
+    # pool (spawn) vuelven a importar este script y heredan la variable de entorno
+    tmp = tempfile.mkdtemp()
+    os.environ["REGISTROS_DATABASE_URL"] = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+
+    periodo_id = seed(registros_por_reporte)
+    serial = run(periodo_id, 1, tmp)
+    if procesos > 1:
+        paralelo = run(periodo_id, procesos, tmp)
+        print(f"Aceleración: {serial / paralelo:.1f}x")
+
+    shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Mide el tiempo de generación de un reporte PDF grande con ui.report_renderer.
+
+Uso:
+    python benchmarks/bench_report_render.py [páginas]
+
+Genera registros sintéticos (actividades de distinta longitud, fechas y horas
+repetidas como en un período real) para el número de páginas indicado (500 por
+defecto) y los dibuja en un PDF temporal.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, ROOT)
+
+from PySide6.QtGui import QGuiApplication
+
+from ui.report_renderer import REGISTROS_POR_PAGINA, ReportInfo, ReportRow, render_report
+
+ACTIVIDADES = [
+    "Práctica de medición",
+    "Inducción del Laboratorio - Práctica de calibración de instrumentos",
+    "Ensayo de tracción en probetas de acero según norma ASTM E8, grupo de la tarde",
+]
+
+
+def generate_rows(total):
+    for i in range(total):
+        dia = i // 6
+        hora = 7 + (i % 6) * 2
+        yield ReportRow(
+            ACTIVIDADES[i % len(ACTIVIDADES)],
+            f"{1 + dia % 28:02d}/{1 + (dia // 28) % 12:02d}/2025",
+            f"{hora:02d}:00",
+            f"{hora + 1:02d}:50",
+        )
+
+
+def main():
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    total = pages * REGISTROS_POR_PAGINA
+
+    app = QGuiApplication(sys.argv)
+    info = ReportInfo("METROLOGÍA", "2025-1", "Ing. Ana Pérez", "Mecánica")
+
+    tmp = tempfile.mkdtemp()
+    path = os.path.join(tmp, "reporte.pdf")
+
+    start = time.perf_counter()
+    rendered = render_report(path, generate_rows(total), info, total_registros=total)
+    elapsed = time.perf_counter() - start
+
+    print(f"Páginas: {rendered}  Registros: {total}")
+    print(f"Tiempo: {elapsed:.2f} s  ({rendered / elapsed:.0f} páginas/s)")
+    print(f"Tamaño del PDF: {os.path.getsize(path) / 1024:.0f} KiB")
+
+    shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Cuenta las conexiones que se toman del pool (checkouts) y las sentencias SQL que se
+ejecutan en cada acción de la interfaz.
+
+Uso:
+    python benchmarks/bench_session_churn.py
+
+Las pestañas se construyen sin mostrar la ventana (QT_QPA_PLATFORM=offscreen) sobre
+una base de datos temporal con datos de ejemplo.
+"""
+
+import datetime
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TMP = tempfile.mkdtemp()
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+os.environ["REGISTROS_DATABASE_URL"] = f"sqlite:///{os.path.join(TMP, 'bench.db')}"
+sys.path.insert(0, ROOT)
+
+from PySide6.QtCore import QTime, QDate
+from PySide6.QtWidgets import QApplication, QMessageBox
+from sqlalchemy import event
+
+from database.database import engine, SessionLocal, QueryCounter
+from database.models import Base, Carrera, Docente, Laboratorio, Periodo, RegistroUso
+
+
+class CheckoutCounter:
+    def __init__(self):
+        self.count = 0
+        event.listen(engine, "checkout", self.on_checkout)
+
+    def on_checkout(self, *args):
+        self.count += 1
+
+    def measure(self, action):
+        before = self.count
+        with QueryCounter() as queries:
+            action()
+        return self.count - before, queries.count
+
+
+def seed():
+    """Crea carreras, laboratorios, docentes, un período y algunos registros"""
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    carreras = [Carrera(nombre=nombre) for nombre in ("Mecánica", "Industrial")]
+    db.add_all(carreras)
+    db.flush()
+    for carrera in carreras:
+        labs = [Laboratorio(nombre=nombre, carrera_id=carrera.id)
+                for nombre in ("Resistencia de Materiales", "Turbomaquinaria e Hidráulica",
+                               "Metrología", "Instrumentación y Control")]
+        db.add_all(labs)
+        docente = Docente(nombre="Ana", apellido=f"Pérez {carrera.id}", carrera_id=carrera.id)
+        docente.laboratorios = labs
+        db.add(docente)
+    periodo = Periodo(nombre="2025-1", fecha_inicio=datetime.date(2025, 1, 1),
+                      fecha_fin=datetime.date(2025, 12, 31))
+    db.add(periodo)
+    db.flush()
+    for i in range(500):
+        db.add(RegistroUso(fecha=datetime.date(2025, 1 + i % 12, 1 + i % 28),
+                           hora_entrada=datetime.time(7 + i % 10, 0), hora_salida=datetime.time(7 + i % 10, 50),
+                           actividad=f"Práctica {i}", docente_id=1, laboratorio_id=1 + i % 4, periodo_id=periodo.id))
+    db.commit()
+    db.close()
+
+
+def main():
+    seed()
+    app = QApplication(sys.argv)
+    for name in ("information", "warning", "critical"):
+        setattr(QMessageBox, name, staticmethod(lambda *args, **kwargs: None))
+
+    from ui.registros_tab import RegistrosTab
+    from ui.visualizacion_tab import VisualizacionTab
+
+    counter = CheckoutCounter()
+    tabs = {}
+
+    def save():
+        tab = tabs["registros"]
+        tab.fecha_edit.setDate(QDate(2025, 6, 30))
+        tab.hora_entrada.setTime(QTime(18, 0))
+        tab.hora_salida.setTime(QTime(19, 0))
+        tab.actividad_input.setText("Práctica de medición")
+        tab.save_registro()
+
+    def filter_carrera_periodo():
+        tab = tabs["visualizacion"]
+        tab.periodo_combo.setCurrentIndex(1)
+        tab.carrera_combo.setCurrentIndex(1)
+        tab.lab_combo.setCurrentIndex(0)
+        tab.filter_data()
+
+    actions = [
+        ("Construir RegistrosTab", lambda: tabs.setdefault("registros", RegistrosTab())),
+        ("Cambiar carrera", lambda: tabs["registros"].carrera_combo.setCurrentIndex(1)),
+        ("Guardar registro", save),
+        ("Construir VisualizacionTab", lambda: tabs.setdefault("visualizacion", VisualizacionTab())),
+        ("Filtrar", lambda: tabs["visualizacion"].filter_data()),
+        ("Filtrar por carrera y período", filter_carrera_periodo),
+        ("Siguiente página", lambda: tabs["visualizacion"].results_model.fetchMore()),
+    ]
+
+    print(f"{'Acción':<30}{'checkouts':>10}{'consultas':>10}")
+    for name, action in actions:
+        checkouts, queries = counter.measure(action)
+        print(f"{name:<30}{checkouts:>10}{queries:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Compara la importación CSV y la latencia de filtrado con y sin los PRAGMAs de SQLite.
+
+Uso:
+    python benchmarks/bench_sqlite_pragmas.py [filas]
+
+Cada variante corre en un proceso aparte (REGISTROS_SQLITE_TUNING=0/1) sobre una base
+de datos temporal, porque el engine se configura al importar database.database.
+"""
+
+import csv
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def generate_csv(path, rows):
+    """Genera un CSV de registros con horarios sin traslapes"""
+    random.seed(1)
+    with open(path, 'w', newline='', encoding='utf-8') as csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(["actividad", "fecha", "hora_entrada", "hora_salida"])
+        for i in range(rows):
+            dia = i // 12
+            hora = 7 + i % 12
+            writer.writerow([
+                f"Práctica {i}",
+                f"{1 + dia % 28:02d}/{1 + (dia // 28) % 12:02d}/{2000 + dia // 336}",
+                f"{hora:02d}:00",
+                f"{hora:02d}:50",
+            ])
+
+
+def run_variant(csv_path):
+    """Ejecuta la medición dentro del proceso hijo y la imprime como una línea"""
+    sys.path.insert(0, ROOT)
+    from database.database import engine, SessionLocal
+    from database.models import Base, Carrera, Docente, Laboratorio, Periodo, RegistroUso
+    from database.migrations import upgrade_schema
+    from database.importer import import_csv
+    from database.queries import paginate_registros
+    import datetime
+
+    Base.metadata.create_all(bind=engine)
+    upgrade_schema(engine)
+
+    db = SessionLocal()
+    carrera = Carrera(nombre="Mecánica")
+    db.add(carrera)
+    db.flush()
+    lab = Laboratorio(nombre="Metrología", carrera_id=carrera.id)
+    docente = Docente(nombre="Ana", apellido="Pérez", carrera_id=carrera.id)
+    periodo = Periodo(nombre="Benchmark", fecha_inicio=datetime.date(2000, 1, 1),
+                      fecha_fin=datetime.date(2100, 1, 1))
+    db.add_all([lab, docente, periodo])
+    db.commit()
+    ids = (periodo.id, lab.id, docente.id)
+    db.close()
+
+    resultado = import_csv(csv_path, *ids, reject_overlaps=False)
+
+    # Latencia de filtrado: conteo + primera página, como en la pestaña de Visualización
+    tiempos = []
+    for _ in range(20):
+        start = time.perf_counter()
+        db = SessionLocal()
+        query = db.query(RegistroUso).filter(RegistroUso.laboratorio_id == ids[1])
+        query.count()
+        paginate_registros(query)
+        db.close()
+        tiempos.append(time.perf_counter() - start)
+    tiempos.sort()
+
+    # Guardados individuales: una transacción por registro, como en el registro manual
+    start = time.perf_counter()
+    db = SessionLocal()
+    for i in range(300):
+        db.add(RegistroUso(fecha=datetime.date(1999, 1, 1), hora_entrada=datetime.time(8, 0),
+                           hora_salida=datetime.time(9, 0), actividad=f"Manual {i}",
+                           docente_id=ids[2], laboratorio_id=ids[1], periodo_id=ids[0]))
+        db.commit()
+    db.close()
+    commit_ms = (time.perf_counter() - start) / 300 * 1000
+
+    print(f"{resultado.inserted} {resultado.elapsed:.3f} {resultado.rows_per_second:.0f} "
+          f"{tiempos[len(tiempos) // 2] * 1000:.1f} {commit_ms:.2f}")
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "registros.csv")
+        generate_csv(csv_path, rows)
+
+        print(f"Filas: {rows}")
+        print(f"{'PRAGMAs':<10}{'import (s)':>12}{'filas/s':>12}{'filtro p50 (ms)':>18}{'commit (ms)':>14}")
+        for tuning in ("0", "1"):
+            env = dict(os.environ)
+            env["REGISTROS_SQLITE_TUNING"] = tuning
+            env["REGISTROS_DATABASE_URL"] = f"sqlite:///{os.path.join(tmp, f'bench_{tuning}.db')}"
+            output = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--run", csv_path],
+                env=env, capture_output=True, text=True, check=True
+            ).stdout.strip().splitlines()[-1]
+            _, elapsed, rows_per_second, filter_ms, commit_ms = output.split()
+            label = "sí" if tuning == "1" else "no"
+            print(f"{label:<10}{elapsed:>12}{rows_per_second:>12}{filter_ms:>18}{commit_ms:>14}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2 and sys.argv[1] == "--run":
+        run_variant(sys.argv[2])
+    else:
+        main()
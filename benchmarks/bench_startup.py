@@ -0,0 +1,69 @@
+"""
+Mide el tiempo de arranque de la aplicación: desde que se lanza el proceso hasta que
+la ventana principal está visible.
+
+Uso:
+    python benchmarks/bench_startup.py [repeticiones]
+
+Cada repetición lanza main.py en un proceso nuevo con REGISTROS_STARTUP_EXIT=1 (la
+aplicación se cierra tras el primer pintado) sobre una copia temporal de la base de
+datos del proyecto. Se informa el tiempo que mide main.py (sin contar el arranque del
+intérprete) y el tiempo total del proceso.
+"""
+
+import os
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_once(env):
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, os.path.join(ROOT, "main.py")], cwd=ROOT, env=env,
+                            capture_output=True, text=True, timeout=120)
+    wall_ms = (time.perf_counter() - start) * 1000
+
+    match = re.search(r"Ventana visible en (\d+) ms", result.stdout)
+    if not match:
+        raise RuntimeError(f"main.py no informó el tiempo de arranque:\n{result.stdout}\n{result.stderr}")
+    return int(match.group(1)), wall_ms
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    tmp = tempfile.mkdtemp()
+    db_path = os.path.join(tmp, "startup.db")
+    source = os.path.join(ROOT, "registros_laboratorios.db")
+    if os.path.exists(source):
+        shutil.copy(source, db_path)
+
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    env["REGISTROS_DATABASE_URL"] = f"sqlite:///{db_path}"
+    env["REGISTROS_STARTUP_EXIT"] = "1"
+
+    # Una ejecución previa para calentar la caché de disco y crear índices pendientes
+    run_once(env)
+
+    visible, wall = [], []
+    for _ in range(repeats):
+        visible_ms, wall_ms = run_once(env)
+        visible.append(visible_ms)
+        wall.append(wall_ms)
+
+    print(f"Repeticiones: {repeats}")
+    print(f"Ventana visible (mediana): {statistics.median(visible):.0f} ms")
+    print(f"Proceso completo (mediana): {statistics.median(wall):.0f} ms")
+
+    shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
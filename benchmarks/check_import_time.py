@@ -0,0 +1,108 @@
+"""
+Verifica el presupuesto de tiempo de importación de la ruta de arranque.
+
+Uso:
+    python benchmarks/check_import_time.py [presupuesto_ms]
+
+Ejecuta `python -X importtime` importando los módulos que se cargan antes de mostrar
+la ventana (main, la ventana principal y la primera pestaña) y falla (código de
+salida 1) si el tiempo acumulado supera el presupuesto o si se cargó alguno de los
+módulos pesados que solo deben importarse al usar la función que los necesita.
+También importa cada pestaña por separado y falla si alguna carga esos módulos.
+El presupuesto por defecto se puede cambiar con REGISTROS_IMPORT_BUDGET_MS.
+"""
+
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Módulos importados antes de que la ventana sea visible
+STARTUP_MODULES = ["main", "ui.main_window", "ui.periodos_tab"]
+
+# Módulos que no deben cargarse durante el arranque
+DEFERRED_MODULES = [
+    "pandas",              # análisis y parseo masivo de CSV
+    "numpy",
+    "PySide6.QtPrintSupport",  # generación de reportes
+]
+
+# Pestañas que se importan al abrirlas por primera vez
+TAB_MODULES = ["ui.periodos_tab", "ui.docentes_tab", "ui.registros_tab", "ui.visualizacion_tab",
+               "ui.estadisticas_tab"]
+
+# Módulos que tampoco debe cargar una pestaña al importarse. concurrent.futures no se
+# incluye porque SQLAlchemy ya lo importa; el pool de procesos de los reportes por lote
+# sí se detecta por concurrent.futures.process y multiprocessing
+TAB_DEFERRED_MODULES = DEFERRED_MODULES + ["concurrent.futures.process", "multiprocessing"]
+
+DEFAULT_BUDGET_MS = 1200
+
+
+def measure():
+    """Devuelve ({módulo: (propio_us, acumulado_us)}, total_us) de una importación en frío"""
+    code = "import " + ", ".join(STARTUP_MODULES)
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=ROOT,
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"No se pudo importar la ruta de arranque:\n{result.stderr}")
+
+    timings = {}
+    total_us = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        timings[name.strip()] = (int(self_us), int(cumulative_us))
+        # Los módulos de nivel superior no tienen sangría y su acumulado incluye a sus hijos
+        if not name[1:].startswith(" "):
+            total_us += int(cumulative_us)
+    return timings, total_us
+
+
+def deferred_loaded_by_tabs():
+    """Devuelve {pestaña: [módulos diferidos]} importando cada pestaña en un proceso nuevo"""
+    code = ("import importlib, sys; importlib.import_module(sys.argv[1]); "
+            "print(' '.join(name for name in sys.argv[2:] if name in sys.modules))")
+    loaded = {}
+    for module in TAB_MODULES:
+        result = subprocess.run([sys.executable, "-c", code, module] + TAB_DEFERRED_MODULES, cwd=ROOT,
+                                capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(f"No se pudo importar {module}:\n{result.stderr}")
+        if result.stdout.split():
+            loaded[module] = result.stdout.split()
+    return loaded
+
+
+def main():
+    budget_ms = float(sys.argv[1]) if len(sys.argv) > 1 else \
+        float(os.environ.get("REGISTROS_IMPORT_BUDGET_MS", DEFAULT_BUDGET_MS))
+
+    timings, total_us = measure()
+    total_ms = total_us / 1000
+    loaded = [name for name in DEFERRED_MODULES if name in timings]
+
+    print(f"Tiempo de importación del arranque: {total_ms:.0f} ms (presupuesto {budget_ms:.0f} ms)")
+    print("Módulos más pesados (acumulado):")
+    heaviest = sorted(timings.items(), key=lambda item: item[1][1], reverse=True)[:10]
+    for name, (_, cumulative) in heaviest:
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+    failed = False
+    if loaded:
+        print(f"ERROR: se importaron módulos diferidos durante el arranque: {', '.join(loaded)}")
+        failed = True
+    if total_ms > budget_ms:
+        print("ERROR: se superó el presupuesto de importación")
+        failed = True
+    for module, names in deferred_loaded_by_tabs().items():
+        print(f"ERROR: {module} importa módulos diferidos: {', '.join(names)}")
+        failed = True
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
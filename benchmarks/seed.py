@@ -0,0 +1,66 @@
+"""
+Datos sintéticos para los benchmarks que necesitan una tabla grande de registros.
+
+El benchmark debe fijar REGISTROS_DATABASE_URL con su base de datos temporal antes de
+llamar a seed_registros, que importa database.database.
+"""
+
+import datetime
+import random
+import sqlite3
+
+INICIO = datetime.date(2023, 1, 1)
+DIAS_POR_PERIODO = 182
+
+
+def seed_registros(filas, carreras=4, laboratorios_por_carrera=4, docentes=40, periodos=4, semilla=1):
+    """Crea las tablas e inserta catálogos y registros aleatorios en la base de datos del motor
+
+    Se inserta directamente con sqlite3 para que la carga no domine el tiempo. Los
+    registros caen en los períodos consecutivos de DIAS_POR_PERIODO días desde INICIO;
+    resumen_diario no se calcula (ver database.daily_summary.ensure_daily_summary).
+    """
+    from database.database import engine
+    from database.models import Base
+
+    Base.metadata.create_all(bind=engine)
+    laboratorios = carreras * laboratorios_por_carrera
+    dias = periodos * DIAS_POR_PERIODO
+
+    connection = sqlite3.connect(engine.url.database)
+    connection.executemany("INSERT INTO carreras (id, nombre) VALUES (?, ?)",
+                           [(i + 1, f"Carrera {i + 1}") for i in range(carreras)])
+    connection.executemany("INSERT INTO laboratorios (id, nombre, carrera_id) VALUES (?, ?, ?)",
+                           [(i + 1, f"Laboratorio {i + 1}", i // laboratorios_por_carrera + 1)
+                            for i in range(laboratorios)])
+    connection.executemany("INSERT INTO docentes (id, nombre, apellido, carrera_id) VALUES (?, ?, ?, ?)",
+                           [(i + 1, "Docente", str(i + 1), i % carreras + 1) for i in range(docentes)])
+    connection.executemany("INSERT INTO periodos (id, nombre, fecha_inicio, fecha_fin) VALUES (?, ?, ?, ?)",
+                           [(i + 1, f"Período {i + 1}",
+                             (INICIO + datetime.timedelta(days=DIAS_POR_PERIODO * i)).isoformat(),
+                             (INICIO + datetime.timedelta(days=DIAS_POR_PERIODO * (i + 1) - 1)).isoformat())
+                            for i in range(periodos)])
+
+    rng = random.Random(semilla)
+
+    def rows():
+        for i in range(filas):
+            hora = rng.randrange(7, 20)
+            duracion = rng.choice((50, 90, 110, 170))
+            salida = min(hora * 60 + duracion, 23 * 60 + 59)
+            yield (
+                (INICIO + datetime.timedelta(days=rng.randrange(dias))).isoformat(),
+                f"{hora:02d}:00:00.000000",
+                f"{salida // 60:02d}:{salida % 60:02d}:00.000000",
+                f"Práctica {i % 500}",
+                rng.randrange(docentes) + 1,
+                rng.randrange(laboratorios) + 1,
+                None
+            )
+
+    connection.executemany(
+        "INSERT INTO registros_uso (fecha, hora_entrada, hora_salida, actividad, docente_id, "
+        "laboratorio_id, periodo_id) VALUES (?, ?, ?, ?, ?, ?, ?)", rows())
+    connection.commit()
+    connection.execute("ANALYZE")
+    connection.close()
@@ -0,0 +1,136 @@
+from collections import namedtuple
+
+from sqlalchemy import Integer, cast, func, literal
+
+from .catalog import catalog
+from .models import ResumenDiario
+
+# Fila de estadísticas de uso de un laboratorio, docente, carrera o período
+UsageStat = namedtuple("UsageStat", ["clave", "nombre", "horas", "sesiones", "promedio_minutos"])
+
+# Dimensiones por las que se pueden agrupar las estadísticas, con su título
+DIMENSIONES = [
+    ("laboratorio", "Laboratorio"),
+    ("docente", "Docente"),
+    ("carrera", "Carrera"),
+    ("periodo", "Período"),
+]
+
+
+def minutes_of_day(column):
+    """Expresión SQL con los minutos desde la medianoche de una columna Time
+
+    SQLite guarda las horas como texto 'HH:MM:SS.ffffff': CAST toma las horas del
+    prefijo numérico y substr los minutos. Es bastante más barato que strftime o
+    julianday cuando se evalúa sobre muchos registros.
+    """
+    return cast(column, Integer) * 60 + cast(func.substr(column, 4, 2), Integer)
+
+
+def _filtered(query, docente_id=None, laboratorio_id=None, carrera_id=None, fecha_inicio=None, fecha_fin=None):
+    """Aplica los filtros de Visualización sobre las columnas de resumen_diario
+
+    No hay joins: la carrera se traduce a sus laboratorios y el período a su rango de
+    fechas con la caché de catálogos.
+    """
+    if docente_id:
+        query = query.filter(ResumenDiario.docente_id == docente_id)
+
+    if laboratorio_id:
+        query = query.filter(ResumenDiario.laboratorio_id == laboratorio_id)
+    elif carrera_id:
+        query = query.filter(ResumenDiario.laboratorio_id.in_(
+            [lab.id for lab in catalog.laboratorios(carrera_id)]
+        ))
+
+    if fecha_inicio is not None:
+        query = query.filter(ResumenDiario.fecha.between(fecha_inicio, fecha_fin))
+
+    return query
+
+
+def _aggregate(db, columna=None, **filtros):
+    """Devuelve [(clave, minutos, sesiones)] agrupando por columna, o una sola fila si es None"""
+    minutos = func.sum(ResumenDiario.minutos)
+    sesiones = func.sum(ResumenDiario.sesiones)
+    if columna is None:
+        query = db.query(literal(None), minutos, sesiones)
+        return [tuple(fila) for fila in _filtered(query, **filtros).all()]
+
+    query = db.query(columna, minutos, sesiones)
+    return [tuple(fila) for fila in _filtered(query, **filtros).group_by(columna).all()]
+
+
+def _display_name(dimension, clave):
+    """Nombre de la clave de una dimensión según el catálogo, o None si ya no existe"""
+    if dimension == "laboratorio":
+        item = catalog.laboratorio(clave)
+    elif dimension == "docente":
+        item = catalog.docente(clave)
+        if item:
+            return f"{item.nombre} {item.apellido}" if item.apellido else item.nombre
+    elif dimension == "carrera":
+        item = catalog.carrera(clave)
+    else:
+        item = catalog.periodo(clave)
+    return item.nombre if item else None
+
+
+def usage_stats(db, dimension, docente_id=None, laboratorio_id=None, carrera_id=None, periodo_id=None):
+    """Lista de UsageStat por dimension (clave de DIMENSIONES), de más a menos horas"""
+    # Se agrega sobre resumen_diario (un renglón por día, laboratorio y docente,
+    # mantenido por triggers) en lugar de recorrer registros_uso; las sesiones sin
+    # hora de salida o con salida anterior a la entrada no cuentan
+    if dimension not in dict(DIMENSIONES):
+        raise ValueError(f"Dimensión desconocida: {dimension}")
+
+    filtros = {"docente_id": docente_id, "laboratorio_id": laboratorio_id, "carrera_id": carrera_id}
+    periodos = catalog.periodos()
+    if periodo_id:
+        periodos = [periodo for periodo in periodos if periodo.id == periodo_id]
+        if not periodos:
+            return []
+
+    if dimension == "periodo":
+        # Un registro pertenece a todos los períodos cuyo rango de fechas lo contiene,
+        # así que se hace una consulta por período
+        filas = []
+        for periodo in periodos:
+            for _, minutos, sesiones in _aggregate(db, fecha_inicio=periodo.fecha_inicio,
+                                                   fecha_fin=periodo.fecha_fin, **filtros):
+                filas.append((periodo.id, minutos, sesiones))
+    else:
+        rango = {}
+        if periodo_id:
+            rango = {"fecha_inicio": periodos[0].fecha_inicio, "fecha_fin": periodos[0].fecha_fin}
+        columna = ResumenDiario.docente_id if dimension == "docente" else ResumenDiario.laboratorio_id
+        filas = _aggregate(db, columna, **rango, **filtros)
+
+    # Los registros de laboratorios o docentes eliminados no se cuentan, igual que el
+    # join de filter_registros; los nombres salen de la caché de catálogos
+    if dimension != "docente":
+        filas = [fila for fila in filas if dimension == "periodo" or catalog.laboratorio(fila[0])]
+    if dimension == "carrera":
+        por_carrera = {}
+        for laboratorio_id, minutos, sesiones in filas:
+            carrera_id = catalog.laboratorio(laboratorio_id).carrera_id
+            total = por_carrera.get(carrera_id, (0, 0))
+            por_carrera[carrera_id] = (total[0] + (minutos or 0), total[1] + sesiones)
+        filas = [(clave, minutos, sesiones) for clave, (minutos, sesiones) in por_carrera.items()]
+
+    stats = []
+    for clave, minutos, sesiones in filas:
+        nombre = _display_name(dimension, clave)
+        if nombre is None or not sesiones:
+            continue
+        minutos = minutos or 0
+        stats.append(UsageStat(clave, nombre, minutos / 60, sesiones, minutos / sesiones))
+    stats.sort(key=lambda stat: stat.horas, reverse=True)
+    return stats
+
+
+def total_stats(stats):
+    """Suma las filas de usage_stats en un UsageStat con el total"""
+    horas = sum(stat.horas for stat in stats)
+    sesiones = sum(stat.sesiones for stat in stats)
+    return UsageStat(None, "Total", horas, sesiones, horas * 60 / sesiones if sesiones else 0)
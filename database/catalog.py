@@ -0,0 +1,157 @@
+from collections import namedtuple
+
+from .database import session_scope
+from .models import Carrera, Docente, Laboratorio, Periodo, docente_laboratorio
+
+# Carreras y laboratorios que se crean en una base de datos nueva
+CARRERAS_INICIALES = ["Mecánica", "Industrial", "Automotriz", "Mantenimiento Industrial"]
+LABORATORIOS_POR_CARRERA = [
+    "Resistencia de Materiales",
+    "Turbomaquinaria e Hidráulica",
+    "Metrología",
+    "Instrumentación y Control"
+]
+
+# Filas de los catálogos, desvinculadas de la sesión
+CarreraItem = namedtuple("CarreraItem", ["id", "nombre"])
+LaboratorioItem = namedtuple("LaboratorioItem", ["id", "nombre", "carrera_id"])
+DocenteItem = namedtuple("DocenteItem", ["id", "nombre", "apellido", "carrera_id"])
+PeriodoItem = namedtuple("PeriodoItem", ["id", "nombre", "fecha_inicio", "fecha_fin"])
+
+
+class Catalog:
+    """Caché en memoria de carreras, laboratorios, docentes y períodos
+
+    Los catálogos son tablas pequeñas que los combos consultan continuamente; se
+    cargan completos la primera vez que se piden (una consulta por tabla) y a partir
+    de ahí se sirven sin tocar SQLite hasta que alguien llama a invalidate() tras
+    guardar cambios.
+    """
+
+    def __init__(self):
+        self._loaded = False
+        self.load_count = 0
+
+    def invalidate(self):
+        """Descarta los datos en caché; la siguiente lectura vuelve a cargarlos"""
+        self._loaded = False
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+
+        with session_scope() as db:
+            carreras = [CarreraItem(c.id, c.nombre)
+                        for c in db.query(Carrera.id, Carrera.nombre).order_by(Carrera.id)]
+            laboratorios = [LaboratorioItem(l.id, l.nombre, l.carrera_id)
+                            for l in db.query(Laboratorio.id, Laboratorio.nombre, Laboratorio.carrera_id)
+                            .order_by(Laboratorio.id)]
+            docentes = [DocenteItem(d.id, d.nombre, d.apellido, d.carrera_id)
+                        for d in db.query(Docente.id, Docente.nombre, Docente.apellido, Docente.carrera_id)
+                        .order_by(Docente.id)]
+            periodos = [PeriodoItem(p.id, p.nombre, p.fecha_inicio, p.fecha_fin)
+                        for p in db.query(Periodo.id, Periodo.nombre, Periodo.fecha_inicio, Periodo.fecha_fin)
+                        .order_by(Periodo.id)]
+            asignaciones = db.execute(
+                docente_laboratorio.select().order_by(docente_laboratorio.c.docente_id)
+            ).all()
+
+        self._carreras = carreras
+        self._laboratorios = laboratorios
+        self._docentes = docentes
+        self._periodos = periodos
+        self._by_id = {
+            "carrera": {c.id: c for c in carreras},
+            "laboratorio": {l.id: l for l in laboratorios},
+            "docente": {d.id: d for d in docentes},
+            "periodo": {p.id: p for p in periodos},
+        }
+
+        # Adyacencias: carrera -> laboratorios y laboratorio -> docentes
+        self._labs_by_carrera = {}
+        for lab in laboratorios:
+            self._labs_by_carrera.setdefault(lab.carrera_id, []).append(lab)
+        self._docentes_by_lab = {}
+        for docente_id, laboratorio_id in asignaciones:
+            docente = self._by_id["docente"].get(docente_id)
+            if docente is not None:
+                self._docentes_by_lab.setdefault(laboratorio_id, []).append(docente)
+
+        self._loaded = True
+        self.load_count += 1
+
+    def carreras(self):
+        self._ensure_loaded()
+        return list(self._carreras)
+
+    def periodos(self):
+        self._ensure_loaded()
+        return list(self._periodos)
+
+    def laboratorios(self, carrera_id=None):
+        """Laboratorios de la carrera indicada, o todos si no se indica ninguna"""
+        self._ensure_loaded()
+        if carrera_id is None:
+            return list(self._laboratorios)
+        return list(self._labs_by_carrera.get(carrera_id, []))
+
+    def docentes(self, carrera_id=None, laboratorio_id=None):
+        """Docentes filtrados por carrera y por laboratorio asignado"""
+        self._ensure_loaded()
+        if laboratorio_id is not None:
+            docentes = self._docentes_by_lab.get(laboratorio_id, [])
+        else:
+            docentes = self._docentes
+        if carrera_id is not None:
+            docentes = [d for d in docentes if d.carrera_id == carrera_id]
+        return list(docentes)
+
+    def carrera(self, carrera_id):
+        self._ensure_loaded()
+        return self._by_id["carrera"].get(carrera_id)
+
+    def laboratorio(self, laboratorio_id):
+        self._ensure_loaded()
+        return self._by_id["laboratorio"].get(laboratorio_id)
+
+    def docente(self, docente_id):
+        self._ensure_loaded()
+        return self._by_id["docente"].get(docente_id)
+
+    def periodo(self, periodo_id):
+        self._ensure_loaded()
+        return self._by_id["periodo"].get(periodo_id)
+
+
+# Caché compartida por toda la aplicación
+catalog = Catalog()
+
+
+def ensure_initial_catalog():
+    """Crea las carreras iniciales si no hay ninguna y los laboratorios que falten en cada una
+
+    Devuelve True si se añadió algo (y en ese caso invalida la caché).
+    """
+    changed = False
+    with session_scope() as db:
+        carreras = db.query(Carrera).all()
+        if not carreras:
+            carreras = [Carrera(nombre=nombre) for nombre in CARRERAS_INICIALES]
+            db.add_all(carreras)
+            db.flush()
+            changed = True
+
+        # Laboratorios existentes de todas las carreras en una sola consulta
+        existentes = set(db.query(Laboratorio.carrera_id, Laboratorio.nombre).all())
+        for carrera in carreras:
+            labs_to_add = [Laboratorio(nombre=nombre, carrera_id=carrera.id)
+                           for nombre in LABORATORIOS_POR_CARRERA
+                           if (carrera.id, nombre) not in existentes]
+            if labs_to_add:
+                db.add_all(labs_to_add)
+                changed = True
+                print(f"Se añadieron {len(labs_to_add)} laboratorios nuevos a la carrera {carrera.nombre}")
+
+    if changed:
+        catalog.invalidate()
+    return changed
@@ -0,0 +1,123 @@
+"""
+Mantenimiento de la tabla resumen_diario (minutos y sesiones por día, laboratorio y
+docente).
+
+Los triggers de registros_uso la actualizan en la misma transacción de cada INSERT,
+DELETE o UPDATE, sin importar si el cambio viene del registro manual, de la
+importación CSV o de la eliminación en Visualización. Para reconstruirla desde cero:
+
+    python -m database.daily_summary
+"""
+
+from sqlalchemy import text
+
+from .database import engine as default_engine
+
+
+def _minutes_sql(row):
+    """Duración en minutos de NEW/OLD en SQL, con el mismo cálculo que analytics.minutes_of_day"""
+    return (f"((CAST({row}.hora_salida AS INTEGER) - CAST({row}.hora_entrada AS INTEGER)) * 60"
+            f" + CAST(substr({row}.hora_salida, 4, 2) AS INTEGER)"
+            f" - CAST(substr({row}.hora_entrada, 4, 2) AS INTEGER))")
+
+
+def _counts_sql(row):
+    """Condición para que un registro cuente en el resumen"""
+    return (f"{row}.hora_salida > {row}.hora_entrada AND {row}.fecha IS NOT NULL"
+            f" AND {row}.laboratorio_id IS NOT NULL AND {row}.docente_id IS NOT NULL")
+
+
+def _add_sql(row):
+    return f"""
+        INSERT INTO resumen_diario (fecha, laboratorio_id, docente_id, minutos, sesiones)
+        SELECT {row}.fecha, {row}.laboratorio_id, {row}.docente_id, {_minutes_sql(row)}, 1
+        WHERE {_counts_sql(row)}
+        ON CONFLICT (fecha, laboratorio_id, docente_id)
+        DO UPDATE SET minutos = minutos + excluded.minutos, sesiones = sesiones + 1;"""
+
+
+def _subtract_sql(row):
+    return f"""
+        UPDATE resumen_diario
+        SET minutos = minutos - {_minutes_sql(row)}, sesiones = sesiones - 1
+        WHERE {_counts_sql(row)} AND fecha = {row}.fecha
+          AND laboratorio_id = {row}.laboratorio_id AND docente_id = {row}.docente_id;
+        DELETE FROM resumen_diario
+        WHERE sesiones <= 0 AND fecha = {row}.fecha
+          AND laboratorio_id = {row}.laboratorio_id AND docente_id = {row}.docente_id;"""
+
+
+TRIGGERS = {
+    "tr_resumen_diario_insert": f"""
+        CREATE TRIGGER IF NOT EXISTS tr_resumen_diario_insert AFTER INSERT ON registros_uso
+        BEGIN{_add_sql("NEW")}
+        END""",
+    "tr_resumen_diario_delete": f"""
+        CREATE TRIGGER IF NOT EXISTS tr_resumen_diario_delete AFTER DELETE ON registros_uso
+        BEGIN{_subtract_sql("OLD")}
+        END""",
+    "tr_resumen_diario_update": f"""
+        CREATE TRIGGER IF NOT EXISTS tr_resumen_diario_update
+        AFTER UPDATE OF fecha, hora_entrada, hora_salida, laboratorio_id, docente_id ON registros_uso
+        BEGIN{_subtract_sql("OLD")}{_add_sql("NEW")}
+        END""",
+}
+
+REBUILD_SQL = f"""
+    INSERT INTO resumen_diario (fecha, laboratorio_id, docente_id, minutos, sesiones)
+    SELECT fecha, laboratorio_id, docente_id, SUM({_minutes_sql("registros_uso")}), COUNT(*)
+    FROM registros_uso
+    WHERE {_counts_sql("registros_uso")}
+    GROUP BY fecha, laboratorio_id, docente_id
+"""
+
+
+def create_summary_triggers(connection):
+    """Crea los triggers que faltan; devuelve los nombres de los creados"""
+    created = []
+    for name, ddl in TRIGGERS.items():
+        existing = connection.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = :name"),
+            {"name": name}
+        ).first()
+        if existing is None:
+            connection.exec_driver_sql(ddl)
+            created.append(name)
+    return created
+
+
+def rebuild_daily_summary(engine=default_engine):
+    """Vacía resumen_diario y la vuelve a calcular desde registros_uso; devuelve sus filas"""
+    with engine.begin() as connection:
+        connection.execute(text("DELETE FROM resumen_diario"))
+        connection.exec_driver_sql(REBUILD_SQL)
+        return connection.execute(text("SELECT COUNT(*) FROM resumen_diario")).scalar()
+
+
+def ensure_daily_summary(engine=default_engine):
+    """Crea los triggers y llena el resumen si aún no se había calculado
+
+    Una base de datos anterior a los triggers tiene registros pero no el resumen: al
+    crear los triggers se reconstruye una sola vez y a partir de ahí ellos lo
+    mantienen.
+    """
+    with engine.begin() as connection:
+        created = create_summary_triggers(connection)
+        needs_rebuild = bool(created) or (
+            connection.execute(text("SELECT 1 FROM resumen_diario LIMIT 1")).first() is None
+            and connection.execute(text("SELECT 1 FROM registros_uso LIMIT 1")).first() is not None
+        )
+    if created:
+        print(f"Triggers creados: {', '.join(created)}")
+    if needs_rebuild:
+        filas = rebuild_daily_summary(engine)
+        print(f"Resumen diario calculado: {filas} filas")
+
+
+if __name__ == "__main__":
+    from .models import Base
+
+    Base.metadata.create_all(bind=default_engine)
+    with default_engine.begin() as connection:
+        create_summary_triggers(connection)
+    print(f"Resumen diario reconstruido: {rebuild_daily_summary()} filas")
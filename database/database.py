@@ -1,19 +1,114 @@
-from sqlalchemy import create_engine
+import os
+from contextlib import contextmanager
+
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import sessionmaker, scoped_session
+
+# Crear la base de datos SQLite (la ruta se puede cambiar con REGISTROS_DATABASE_URL)
+SQLALCHEMY_DATABASE_URL = os.environ.get("REGISTROS_DATABASE_URL", "sqlite:///./registros_laboratorios.db")
+
+
+def sqlite_pragmas():
+    """PRAGMAs aplicados a cada conexión SQLite, configurables por variables de entorno
+
+    REGISTROS_SQLITE_TUNING=0 desactiva todos los ajustes (útil para comparar rendimiento).
+    """
+    if os.environ.get("REGISTROS_SQLITE_TUNING", "1") == "0":
+        return {}
+
+    return {
+        # WAL permite leer mientras se escribe (importación y consulta simultáneas)
+        "journal_mode": os.environ.get("REGISTROS_SQLITE_JOURNAL_MODE", "WAL"),
+        # NORMAL es seguro con WAL y evita un fsync por cada transacción
+        "synchronous": os.environ.get("REGISTROS_SQLITE_SYNCHRONOUS", "NORMAL"),
+        # Valor negativo = tamaño de la caché de páginas en KiB
+        "cache_size": -int(os.environ.get("REGISTROS_SQLITE_CACHE_KB", "32768")),
+        "mmap_size": int(os.environ.get("REGISTROS_SQLITE_MMAP_BYTES", str(256 * 1024 * 1024))),
+        "temp_store": "MEMORY",
+        "foreign_keys": "ON",
+    }
+
+
+SQLITE_PRAGMAS = sqlite_pragmas()
+
+engine = create_engine(
+    SQLALCHEMY_DATABASE_URL,
+    # timeout: segundos que una conexión espera a que se libere un bloqueo antes de fallar
+    connect_args={"check_same_thread": False, "timeout": 15}
+)
+
+
+@event.listens_for(engine, "connect")
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Aplica los PRAGMAs de SQLITE_PRAGMAS al abrir cada conexión"""
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in SQLITE_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+
+class QueryCounter:
+    """Cuenta las sentencias SQL que se ejecutan en el motor dentro de un bloque with
+
+    Ejemplo:
+        with QueryCounter() as counter:
+            tab.filter_data()
+        print(counter.count)
+    """
+
+    def __init__(self, bind=None):
+        self.bind = bind if bind is not None else engine
+        self.count = 0
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+    def __enter__(self):
+        event.listen(self.bind, "before_cursor_execute", self._before_cursor_execute)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        event.remove(self.bind, "before_cursor_execute", self._before_cursor_execute)
+        return False
 
-# Crear la base de datos SQLite
-SQLALCHEMY_DATABASE_URL = "sqlite:///./registros_laboratorios.db"
-engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
 
 # Crear la sesión
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
-def get_db():
-    """Proporciona una sesión de base de datos"""
-    db = SessionLocal()
+# Una sesión por hilo: el hilo de la interfaz y cada worker reutilizan la suya
+ScopedSession = scoped_session(SessionLocal)
+
+
+@contextmanager
+def session_scope():
+    """Unidad de trabajo sobre la sesión del hilo actual
+
+    Confirma al salir, revierte si ocurre una excepción y al terminar devuelve la
+    conexión al pool. Los bloques anidados comparten la sesión y la transacción del
+    bloque exterior, de modo que una acción de la interfaz usa una sola conexión
+    aunque llame a varios métodos que abren su propio bloque.
+    """
+    session = ScopedSession()
+    depth = session.info.get("scope_depth", 0)
+    session.info["scope_depth"] = depth + 1
     try:
-        return db
+        yield session
+        if depth == 0:
+            session.commit()
+    except Exception:
+        if depth == 0:
+            session.rollback()
+        raise
     finally:
-        db.close() 
\ No newline at end of file
+        session.info["scope_depth"] = depth
+        if depth == 0:
+            session.close()
+
+
+def remove_thread_session():
+    """Descarta la sesión del hilo actual; los workers la llaman al terminar"""
+    ScopedSession.remove()
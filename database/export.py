@@ -0,0 +1,196 @@
+import csv
+import importlib
+import importlib.util
+import os
+import time
+from collections import namedtuple
+
+from .database import session_scope
+from .queries import export_query
+
+# Filas que se leen del cursor y se escriben de una vez; es lo único que se mantiene
+# en memoria durante la exportación
+EXPORT_BATCH_SIZE = 20000
+
+# Columnas del archivo exportado
+COLUMNAS = ["id", "fecha", "hora_entrada", "hora_salida", "actividad", "docente", "laboratorio"]
+
+# Una hoja de Excel admite 1 048 576 filas, incluida la de encabezados
+MAX_FILAS_XLSX = 1048576 - 1
+
+# Formatos de exportación: (clave, filtro del diálogo de archivos, módulo opcional que requiere)
+FORMATOS = [
+    ("csv", "CSV (*.csv)", None),
+    ("parquet", "Parquet (*.parquet)", "pyarrow"),
+    ("xlsx", "Excel (*.xlsx)", "openpyxl"),
+]
+
+# Resultado de una exportación
+ExportResult = namedtuple("ExportResult", ["file_path", "formato", "filas", "segundos", "filas_por_segundo"])
+
+
+class ExportCancelled(Exception):
+    """La exportación fue cancelada y el archivo parcial eliminado"""
+
+
+def available_formats():
+    """FORMATOS cuyo módulo opcional está instalado, sin llegar a importarlo"""
+    return [formato for formato in FORMATOS
+            if formato[2] is None or importlib.util.find_spec(formato[2]) is not None]
+
+
+def format_for_path(file_path):
+    """Formato de exportación según la extensión del archivo, o None si no se reconoce"""
+    extension = os.path.splitext(file_path)[1].lower().lstrip(".")
+    return extension if extension in WRITERS else None
+
+
+def _require(modulo, formato):
+    """Importa un módulo opcional o explica cómo instalarlo"""
+    try:
+        return importlib.import_module(modulo)
+    except ImportError:
+        paquete = modulo.split(".")[0]
+        raise RuntimeError(f"Para exportar a {formato} instale {paquete} (pip install {paquete})")
+
+
+def _docente(nombre, apellido):
+    return f"{nombre} {apellido}" if apellido else nombre
+
+
+class CsvExportWriter:
+    """CSV en UTF-8 con fechas ISO (aaaa-mm-dd) y horas hh:mm"""
+
+    def __init__(self, file_path):
+        self._file = open(file_path, "w", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(COLUMNAS)
+
+    def write(self, filas):
+        self._writer.writerows(
+            (
+                registro_id,
+                fecha.isoformat() if fecha else "",
+                entrada.isoformat("minutes") if entrada else "",
+                salida.isoformat("minutes") if salida else "",
+                actividad or "",
+                _docente(nombre, apellido),
+                laboratorio
+            )
+            for registro_id, fecha, entrada, salida, actividad, nombre, apellido, laboratorio in filas
+        )
+
+    def finish(self):
+        self._file.close()
+
+    def abort(self):
+        self._file.close()
+
+
+class ParquetExportWriter:
+    """Parquet con tipos fecha y hora; cada bloque de filas es un row group"""
+
+    def __init__(self, file_path):
+        self._pa = _require("pyarrow", "Parquet")
+        parquet = _require("pyarrow.parquet", "Parquet")
+        pa = self._pa
+        self._schema = pa.schema([
+            ("id", pa.int64()),
+            ("fecha", pa.date32()),
+            ("hora_entrada", pa.time64("us")),
+            ("hora_salida", pa.time64("us")),
+            ("actividad", pa.string()),
+            ("docente", pa.string()),
+            ("laboratorio", pa.string()),
+        ])
+        self._writer = parquet.ParquetWriter(file_path, self._schema)
+
+    def write(self, filas):
+        ids, fechas, entradas, salidas, actividades, nombres, apellidos, laboratorios = zip(*filas)
+        docentes = [_docente(nombre, apellido) for nombre, apellido in zip(nombres, apellidos)]
+        columnas = [ids, fechas, entradas, salidas, actividades, docentes, laboratorios]
+        self._writer.write_table(self._pa.Table.from_arrays(
+            [self._pa.array(valores, tipo.type) for valores, tipo in zip(columnas, self._schema)],
+            schema=self._schema
+        ))
+
+    def finish(self):
+        self._writer.close()
+
+    def abort(self):
+        self._writer.close()
+
+
+class XlsxExportWriter:
+    """Libro de Excel en modo write_only: openpyxl escribe las filas a disco al recibirlas"""
+
+    def __init__(self, file_path):
+        openpyxl = _require("openpyxl", "Excel")
+        self._file_path = file_path
+        self._workbook = openpyxl.Workbook(write_only=True)
+        self._sheet = self._workbook.create_sheet("Registros")
+        self._sheet.append(COLUMNAS)
+
+    def write(self, filas):
+        for registro_id, fecha, entrada, salida, actividad, nombre, apellido, laboratorio in filas:
+            self._sheet.append((registro_id, fecha, entrada, salida, actividad or "",
+                                _docente(nombre, apellido), laboratorio))
+
+    def finish(self):
+        self._workbook.save(self._file_path)
+
+    def abort(self):
+        # El libro solo se escribe en file_path al guardarlo
+        pass
+
+
+WRITERS = {
+    "csv": CsvExportWriter,
+    "parquet": ParquetExportWriter,
+    "xlsx": XlsxExportWriter,
+}
+
+
+def export_registros(file_path, formato=None, batch_size=EXPORT_BATCH_SIZE, progress_callback=None,
+                     should_cancel=None, **filtros):
+    """Exporta los registros filtrados a CSV, Parquet o Excel y devuelve un ExportResult"""
+    # Sin formato se deduce de la extensión; los filtros son los de Visualización
+    formato = formato or format_for_path(file_path)
+    writer_class = WRITERS.get(formato)
+    if writer_class is None:
+        raise ValueError(f"Formato de exportación desconocido: {formato or file_path}")
+
+    start = time.perf_counter()
+    filas = 0
+    with session_scope() as db:
+        query = export_query(db, **filtros)
+        total = query.order_by(None).count()
+        if formato == "xlsx" and total > MAX_FILAS_XLSX:
+            raise ValueError(f"Una hoja de Excel admite {MAX_FILAS_XLSX} registros y el filtro tiene "
+                             f"{total}; exporte a CSV o Parquet")
+
+        writer = writer_class(file_path)
+        try:
+            # Se ejecuta como sentencia Core sobre la conexión de la sesión: las filas son
+            # tuplas planas y no pasan por la carga del ORM. Con yield_per cada bloque se
+            # escribe antes de leer el siguiente, así que la memoria no crece con el total
+            result = db.connection().execute(query.statement, execution_options={"yield_per": batch_size})
+            for bloque in result.partitions():
+                writer.write(bloque)
+                filas += len(bloque)
+
+                if progress_callback:
+                    progress_callback(filas, total)
+
+                if should_cancel and should_cancel():
+                    raise ExportCancelled()
+            writer.finish()
+        except BaseException:
+            # Al cancelar o ante un error no queda un archivo a medias
+            writer.abort()
+            if os.path.exists(file_path):
+                os.remove(file_path)
+            raise
+
+    segundos = time.perf_counter() - start
+    return ExportResult(file_path, formato, filas, segundos, filas / segundos if segundos > 0 else 0.0)
@@ -0,0 +1,318 @@
+import csv
+import os
+import time
+from collections import namedtuple
+
+from sqlalchemy import select
+
+from .database import engine
+from .models import RegistroUso
+from .queries import load_interval_index
+from utils.helpers import parse_dates, parse_times
+from utils.intervals import IntervalIndex, minutes_to_text
+
+# Número de filas por cada INSERT ejecutado con executemany
+DEFAULT_BATCH_SIZE = 1000
+
+# Número de filas CSV que se convierten de una vez con pandas; con bloques más
+# pequeños el costo fijo de cada llamada a pandas se come la ventaja sobre strptime
+DEFAULT_PARSE_BATCH_SIZE = 20000
+
+# Número de filas rechazadas que se guardan en memoria antes de volcarlas a disco
+DEFAULT_REJECT_THRESHOLD = 1000
+
+# Resultado de una importación
+ImportResult = namedtuple("ImportResult", ["inserted", "skipped", "elapsed", "rows_per_second", "rejects",
+                                           "duplicates"])
+
+# Columnas que identifican un registro repetido
+DUPLICATE_KEY_COLUMNS = ("docente_id", "laboratorio_id", "fecha", "hora_entrada", "hora_salida", "actividad")
+
+# Avance parcial de una importación en curso
+ImportProgress = namedtuple("ImportProgress", ["parsed", "inserted", "rejected", "rows_per_second"])
+
+
+class ImportCancelled(Exception):
+    """La importación fue cancelada y su transacción revertida"""
+
+
+class RejectReport:
+    """Filas rechazadas de una importación con su número de línea y motivo
+
+    Las primeras `threshold` filas se guardan en memoria; a partir de ahí todas se
+    escriben en un archivo <csv>.rejects.csv junto al original para que el uso de
+    memoria no crezca con el tamaño del archivo. Cada fila del archivo lleva la línea,
+    el motivo y los campos originales en sus propias columnas.
+    """
+
+    HEADER = ["linea", "motivo", "actividad", "fecha", "hora_entrada", "hora_salida"]
+
+    def __init__(self, source_path, threshold=DEFAULT_REJECT_THRESHOLD):
+        self.source_path = source_path
+        self.threshold = threshold
+        self.count = 0
+        self.entries = []  # Tuplas (línea, motivo, fila original)
+        self.path = None
+        self._file = None
+        self._writer = None
+
+    def add(self, line, reason, row):
+        self.count += 1
+        if self._writer is None and len(self.entries) < self.threshold:
+            self.entries.append((line, reason, row))
+            return
+
+        if self._writer is None:
+            self._spill()
+        self._writer.writerow([line, reason, *row])
+
+    def _spill(self):
+        """Abre el archivo de rechazos y vuelca en él las entradas en memoria"""
+        self.path = f"{self.source_path}.rejects.csv"
+        self._file = open(self.path, 'w', newline='', encoding='utf-8')
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(self.HEADER)
+        for line, reason, row in self.entries:
+            self._writer.writerow([line, reason, *row])
+        self.entries = []
+
+    @property
+    def spilled(self):
+        return self.path is not None
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._writer = None
+
+    def discard(self):
+        """Cierra y elimina el archivo de rechazos de una importación que no se confirmó"""
+        self.close()
+        if self.path is not None and os.path.exists(self.path):
+            os.remove(self.path)
+        self.path = None
+
+    def summary(self, limit=10):
+        """Texto breve con las primeras filas rechazadas o la ruta del archivo de rechazos"""
+        if self.spilled:
+            return f"Detalle de las {self.count} filas rechazadas en: {self.path}"
+        lines = [f"Línea {line}: {reason}" for line, reason, _ in self.entries[:limit]]
+        if self.count > limit:
+            lines.append(f"... y {self.count - limit} más")
+        return "\n".join(lines)
+
+
+def parse_csv_chunk(rows):
+    """Convierte un bloque de filas CSV (actividad, fecha, hora_entrada, hora_salida) en diccionarios
+
+    Las fechas y horas de todo el bloque se convierten de una sola vez. Devuelve
+    (registros, rechazadas): registros es una lista de (índice, diccionario) y rechazadas
+    una lista ordenada de (índice, motivo), ambos con índices dentro del bloque.
+    """
+    # Filas con suficientes columnas; las demás se rechazan directamente
+    complete = [i for i, row in enumerate(rows) if len(row) >= 4]
+    rejected = [(i, "columnas insuficientes") for i, row in enumerate(rows) if len(row) < 4]
+    if not complete:
+        return [], rejected
+
+    fechas, fechas_ok = parse_dates([rows[i][1] for i in complete])
+    entradas, entradas_ok = parse_times([rows[i][2] for i in complete])
+    salidas, salidas_ok = parse_times([rows[i][3] for i in complete])
+
+    registros = []
+    for pos, i in enumerate(complete):
+        if not fechas_ok[pos]:
+            rejected.append((i, "fecha inválida"))
+        elif not entradas_ok[pos]:
+            rejected.append((i, "hora de entrada inválida"))
+        elif not salidas_ok[pos]:
+            rejected.append((i, "hora de salida inválida"))
+        elif salidas[pos] <= entradas[pos]:
+            rejected.append((i, "hora de salida no posterior a la de entrada"))
+        else:
+            registros.append((i, {
+                "actividad": rows[i][0].strip(),
+                "fecha": fechas[pos],
+                "hora_entrada": entradas[pos],
+                "hora_salida": salidas[pos],
+            }))
+
+    rejected.sort()
+    return registros, rejected
+
+
+def bulk_insert_registros(connection, registros, batch_size=DEFAULT_BATCH_SIZE, ignore_conflicts=False):
+    """Inserta diccionarios de registros en lotes con INSERT ... executemany
+
+    No crea objetos ORM, por lo que evita el mapa de identidad y el flush por objeto.
+    Con ignore_conflicts=True se usa INSERT OR IGNORE, de modo que las filas que violan
+    el índice único de registros se descartan en lugar de abortar la importación.
+    Devuelve el número de filas que la base de datos insertó realmente.
+    """
+    insert_stmt = RegistroUso.__table__.insert()
+    if ignore_conflicts:
+        insert_stmt = insert_stmt.prefix_with("OR IGNORE")
+    inserted = 0
+    batch = []
+
+    for registro in registros:
+        batch.append(registro)
+        if len(batch) >= batch_size:
+            inserted += connection.execute(insert_stmt, batch).rowcount
+            batch = []
+
+    if batch:
+        inserted += connection.execute(insert_stmt, batch).rowcount
+
+    return inserted
+
+
+def duplicate_key(registro):
+    """Clave con la que se comparan registros para detectar duplicados"""
+    return tuple(registro[column] for column in DUPLICATE_KEY_COLUMNS)
+
+
+def load_existing_keys(connection, periodo_id):
+    """Obtiene en una sola consulta las claves de todos los registros del período"""
+    table = RegistroUso.__table__
+    columns = [table.c[column] for column in DUPLICATE_KEY_COLUMNS]
+    result = connection.execute(select(*columns).where(table.c.periodo_id == periodo_id))
+    return {tuple(row) for row in result}
+
+
+def count_csv_rows(file_path):
+    """Cuenta las filas de datos de un CSV (sin encabezado) leyendo el archivo en bloques"""
+    lines = 0
+    last_chunk = b""
+    with open(file_path, 'rb') as csv_file:
+        for chunk in iter(lambda: csv_file.read(1024 * 1024), b""):
+            lines += chunk.count(b"\n")
+            last_chunk = chunk
+    # Contar la última línea si no termina en salto de línea
+    if last_chunk and not last_chunk.endswith(b"\n"):
+        lines += 1
+    return max(0, lines - 1)
+
+
+def import_csv(file_path, periodo_id, laboratorio_id, docente_id, batch_size=DEFAULT_BATCH_SIZE,
+               progress_callback=None, should_cancel=None, reject_threshold=DEFAULT_REJECT_THRESHOLD,
+               skip_duplicates=True, reject_overlaps=True, parse_batch_size=DEFAULT_PARSE_BATCH_SIZE):
+    """Importa un archivo CSV de registros en una sola transacción usando inserciones en lote
+
+    El archivo se lee y convierte por bloques de parse_batch_size filas, que se insertan
+    en lotes de batch_size; tras insertar cada bloque se llama a
+    progress_callback(ImportProgress). Si should_cancel() devuelve True se revierte toda la
+    transacción y se lanza ImportCancelled. Las filas inválidas se registran en un
+    RejectReport que se devuelve en el resultado.
+
+    Con skip_duplicates=True la importación es idempotente: las claves de los registros
+    existentes del período se cargan en un conjunto y cada fila repetida (en la base o
+    dentro del mismo archivo) se omite y se anota como "registro duplicado".
+
+    Con reject_overlaps=True se rechazan las filas cuyo horario se traslapa con otra
+    sesión del mismo laboratorio y día. La ocupación se carga en un IntervalIndex por
+    bloque (una consulta para las fechas nuevas) y se actualiza con cada fila aceptada.
+    """
+    start = time.perf_counter()
+    parsed = 0
+    inserted = 0
+    duplicates = 0
+    ignored = 0
+    existing_keys = None
+    # Ocupación conocida por esta importación: vive solo dentro de su transacción, así
+    # que nunca ve eliminaciones y no necesita quitar intervalos
+    occupancy = IntervalIndex()
+    loaded_dates = set()
+    rejects = RejectReport(file_path, reject_threshold)
+
+    def flush(connection, chunk, line_numbers):
+        nonlocal inserted, duplicates, ignored
+        registros, rejected = parse_csv_chunk(chunk)
+
+        if reject_overlaps:
+            # Cargar de una vez la ocupación de las fechas que aparecen por primera vez
+            new_dates = {registro["fecha"] for _, registro in registros} - loaded_dates
+            load_interval_index(connection, laboratorio_id, new_dates, occupancy)
+            loaded_dates.update(new_dates)
+
+        nuevos = []
+        for i, registro in registros:
+            registro["docente_id"] = docente_id
+            registro["laboratorio_id"] = laboratorio_id
+            registro["periodo_id"] = periodo_id
+
+            if existing_keys is not None:
+                key = duplicate_key(registro)
+                if key in existing_keys:
+                    duplicates += 1
+                    rejected.append((i, "registro duplicado"))
+                    continue
+                existing_keys.add(key)
+
+            if reject_overlaps:
+                conflicts = occupancy.overlaps(laboratorio_id, registro["fecha"],
+                                               registro["hora_entrada"], registro["hora_salida"])
+                if conflicts:
+                    inicio, fin, _ = conflicts[0]
+                    rejected.append((i, f"laboratorio ocupado ({minutes_to_text(inicio)}-{minutes_to_text(fin)})"))
+                    continue
+                occupancy.add(laboratorio_id, registro["fecha"],
+                              registro["hora_entrada"], registro["hora_salida"])
+
+            nuevos.append(registro)
+
+        # Los rechazos del bloque se anotan en el orden de las líneas del archivo
+        rejected.sort()
+        for i, reason in rejected:
+            rejects.add(line_numbers[i], reason, chunk[i])
+
+        added = bulk_insert_registros(connection, nuevos, batch_size, ignore_conflicts=skip_duplicates)
+        inserted += added
+        # Filas descartadas por el índice único: repetidas en otro período, sin línea en el reporte
+        ignored += len(nuevos) - added
+
+        if progress_callback:
+            elapsed = time.perf_counter() - start
+            rows_per_second = inserted / elapsed if elapsed > 0 else 0.0
+            progress_callback(ImportProgress(parsed, inserted, rejects.count, rows_per_second))
+
+        if should_cancel and should_cancel():
+            # Al salir con excepción, engine.begin() revierte la transacción completa
+            raise ImportCancelled()
+
+    try:
+        # engine.begin() confirma al final o revierte todo si ocurre un error
+        with engine.begin() as connection, open(file_path, 'r', encoding='utf-8') as csv_file:
+            if skip_duplicates:
+                existing_keys = load_existing_keys(connection, periodo_id)
+
+            csv_reader = csv.reader(csv_file)
+            next(csv_reader, None)  # Saltar encabezado
+
+            # Acumular filas crudas (con su número de línea) y convertirlas por bloques
+            chunk = []
+            line_numbers = []
+            for row in csv_reader:
+                parsed += 1
+                chunk.append(row)
+                line_numbers.append(csv_reader.line_num)
+
+                if len(chunk) >= parse_batch_size:
+                    flush(connection, chunk, line_numbers)
+                    chunk = []
+                    line_numbers = []
+
+            flush(connection, chunk, line_numbers)
+    except BaseException:
+        # La transacción se revirtió: los rechazos no corresponden a nada importado
+        rejects.discard()
+        raise
+    finally:
+        rejects.close()
+
+    elapsed = time.perf_counter() - start
+    rows_per_second = inserted / elapsed if elapsed > 0 else 0.0
+
+    return ImportResult(inserted, rejects.count + ignored, elapsed, rows_per_second, rejects,
+                        duplicates + ignored)
@@ -0,0 +1,76 @@
+from sqlalchemy import text
+
+from .database import Base
+from .daily_summary import ensure_daily_summary
+
+
+def upgrade_schema(engine):
+    """Aplica sobre una base de datos existente los cambios de esquema que create_all no cubre"""
+    create_missing_indexes(engine)
+    # Triggers de resumen_diario y su cálculo inicial en bases de datos anteriores
+    ensure_daily_summary(engine)
+
+
+def create_missing_indexes(engine):
+    """Crea los índices declarados en los modelos que aún no existen en la base de datos
+
+    create_all solo crea los índices junto con tablas nuevas, por lo que los archivos
+    .db anteriores se quedan sin ellos. CREATE INDEX no modifica los datos existentes.
+    """
+    created = []
+    with engine.begin() as connection:
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                existing = connection.execute(
+                    text("SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = :name"),
+                    {"name": index.name}
+                ).first()
+                if existing is None:
+                    index.create(bind=connection)
+                    created.append(index.name)
+
+        # Actualizar las estadísticas para que el planificador use los nuevos índices
+        if created:
+            connection.execute(text("ANALYZE"))
+
+    if created:
+        print(f"Índices creados: {', '.join(created)}")
+    return created
+
+
+# Índice único opcional que impide registros repetidos a nivel de base de datos
+UNIQUE_REGISTRO_INDEX = "ux_registros_uso_registro"
+UNIQUE_REGISTRO_COLUMNS = ("docente_id", "laboratorio_id", "fecha", "hora_entrada", "hora_salida", "actividad")
+
+
+def remove_duplicate_registros(engine):
+    """Elimina los registros repetidos conservando el de menor id; devuelve cuántos se borraron"""
+    columns = ", ".join(UNIQUE_REGISTRO_COLUMNS)
+    with engine.begin() as connection:
+        result = connection.execute(text(
+            f"DELETE FROM registros_uso WHERE id NOT IN "
+            f"(SELECT MIN(id) FROM registros_uso GROUP BY {columns})"
+        ))
+    return result.rowcount
+
+
+def enable_unique_registros(engine, remove_duplicates=False):
+    """Crea el índice único sobre la clave de duplicados de registros_uso
+
+    Si ya existen registros repetidos la creación falla, salvo que se pida
+    remove_duplicates=True para depurarlos antes. Devuelve cuántos registros se borraron.
+    """
+    removed = remove_duplicate_registros(engine) if remove_duplicates else 0
+
+    columns = ", ".join(UNIQUE_REGISTRO_COLUMNS)
+    with engine.begin() as connection:
+        connection.execute(text(
+            f"CREATE UNIQUE INDEX IF NOT EXISTS {UNIQUE_REGISTRO_INDEX} ON registros_uso ({columns})"
+        ))
+    return removed
+
+
+def disable_unique_registros(engine):
+    """Elimina el índice único de registros si existe"""
+    with engine.begin() as connection:
+        connection.execute(text(f"DROP INDEX IF EXISTS {UNIQUE_REGISTRO_INDEX}"))
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Date, Time, Table
+from sqlalchemy import Column, Integer, String, ForeignKey, Date, Time, Table, Index
 from sqlalchemy.orm import relationship
 from .database import Base
 
@@ -59,6 +59,15 @@ class Periodo(Base):
 class RegistroUso(Base):
     __tablename__ = "registros_uso"
     
+    # Índices compuestos para los filtros de Visualización: todos terminan en
+    # (fecha, hora_entrada, id) para servir el rango de fechas y el orden sin ordenar en memoria
+    __table_args__ = (
+        Index("ix_registros_uso_fecha_hora", "fecha", "hora_entrada", "id"),
+        Index("ix_registros_uso_docente_fecha", "docente_id", "fecha", "hora_entrada", "id"),
+        Index("ix_registros_uso_laboratorio_fecha", "laboratorio_id", "fecha", "hora_entrada", "id"),
+        Index("ix_registros_uso_periodo", "periodo_id"),
+    )
+    
     id = Column(Integer, primary_key=True, index=True)
     fecha = Column(Date)
     hora_entrada = Column(Time)
@@ -73,4 +82,17 @@ class RegistroUso(Base):
     # Relaciones
     docente = relationship("Docente", back_populates="registros")
     laboratorio = relationship("Laboratorio", back_populates="registros")
-    periodo = relationship("Periodo", back_populates="registros") 
\ No newline at end of file
+    periodo = relationship("Periodo", back_populates="registros") 
+
+# Minutos ocupados y sesiones por día, laboratorio y docente. Se mantiene con triggers
+# sobre registros_uso (ver database.daily_summary) para que las estadísticas lean unos
+# cientos de filas en lugar de todos los registros. Solo cuenta las sesiones con hora
+# de salida posterior a la de entrada.
+class ResumenDiario(Base):
+    __tablename__ = "resumen_diario"
+    
+    fecha = Column(Date, primary_key=True)
+    laboratorio_id = Column(Integer, ForeignKey("laboratorios.id"), primary_key=True)
+    docente_id = Column(Integer, ForeignKey("docentes.id"), primary_key=True)
+    minutos = Column(Integer, nullable=False, default=0)
+    sesiones = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,140 @@
+from collections import namedtuple
+
+from sqlalchemy import Integer, cast, func
+
+from .analytics import minutes_of_day
+from .catalog import catalog
+from .models import RegistroUso
+
+# Días de la semana en el orden de las filas de la matriz (lunes primero)
+DIAS_SEMANA = ["Lunes", "Martes", "Miércoles", "Jueves", "Viernes", "Sábado", "Domingo"]
+
+MINUTOS_DIA = 24 * 60
+
+# Matriz de ocupación de un laboratorio: utilizacion[día, franja] entre 0 y 1 (fracción
+# del tiempo disponible de la franja que estuvo ocupada), los minutos ocupados y el
+# número de veces que ese día de la semana aparece en el rango de fechas
+UtilizationMatrix = namedtuple("UtilizationMatrix", ["utilizacion", "minutos", "dias", "slot_minutes",
+                                                     "fecha_inicio", "fecha_fin"])
+
+
+def weekday_counts(fecha_inicio, fecha_fin):
+    """Número de lunes, martes, ... domingos entre las dos fechas (inclusive)"""
+    import numpy as np
+
+    dias = (fecha_fin - fecha_inicio).days + 1
+    if dias <= 0:
+        return np.zeros(7, dtype=np.int64)
+    return np.bincount((fecha_inicio.weekday() + np.arange(dias)) % 7, minlength=7)
+
+
+def bin_sessions(dias, inicios, fines, slot_minutes=60):
+    """Minutos ocupados por día de la semana y franja horaria
+
+    dias, inicios y fines son arreglos con el día de la semana (0 = lunes) y los
+    minutos de entrada y salida de cada sesión. Cada sesión suma +1 en su minuto de
+    entrada y -1 en el de salida de un arreglo de diferencias; la suma acumulada da
+    las sesiones activas en cada minuto y sumar por bloques de slot_minutes reparte
+    las sesiones que abarcan varias franjas sin recorrerlas una por una.
+    """
+    import numpy as np
+
+    if MINUTOS_DIA % slot_minutes:
+        raise ValueError("La franja debe dividir exactamente las 24 horas")
+
+    ancho = MINUTOS_DIA + 1
+    diferencias = (np.bincount(dias * ancho + inicios, minlength=7 * ancho)
+                   - np.bincount(dias * ancho + fines, minlength=7 * ancho))
+    activas = np.cumsum(diferencias.reshape(7, ancho), axis=1)[:, :MINUTOS_DIA]
+    return activas.reshape(7, MINUTOS_DIA // slot_minutes, slot_minutes).sum(axis=2)
+
+
+def _date_range(db, laboratorio_id, periodo_id):
+    """Rango de fechas de la matriz: el del período o el de los registros del laboratorio"""
+    if periodo_id:
+        periodo = catalog.periodo(periodo_id)
+        if periodo is None:
+            return None, None
+        return periodo.fecha_inicio, periodo.fecha_fin
+    return db.query(func.min(RegistroUso.fecha), func.max(RegistroUso.fecha)).filter(
+        RegistroUso.laboratorio_id == laboratorio_id
+    ).one()
+
+
+def _range_filter(query, laboratorio_id, fecha_inicio, fecha_fin):
+    return query.filter(
+        RegistroUso.laboratorio_id == laboratorio_id,
+        RegistroUso.fecha.between(fecha_inicio, fecha_fin)
+    )
+
+
+class UtilizationCache:
+    """Matrices de ocupación calculadas, por (laboratorio, período, franja)
+
+    Cada entrada se valida con el número de registros y el id máximo del laboratorio
+    en el rango de fechas: una consulta que se resuelve con el índice por laboratorio y
+    fecha sin leer la tabla. Si coinciden se devuelve la matriz guardada.
+
+    Esa firma no detecta una eliminación seguida de una inserción que reutiliza el id,
+    así que la interfaz llama a invalidate() cada vez que guarda, elimina o importa
+    registros; la firma cubre los cambios hechos desde otros procesos.
+    """
+
+    def __init__(self):
+        self._entries = {}
+
+    def invalidate(self):
+        self._entries = {}
+
+    def get(self, db, laboratorio_id, periodo_id=None, slot_minutes=60):
+        fecha_inicio, fecha_fin = _date_range(db, laboratorio_id, periodo_id)
+        if fecha_inicio is None:
+            return None
+
+        firma = _range_filter(
+            db.query(func.count(RegistroUso.id), func.max(RegistroUso.id)),
+            laboratorio_id, fecha_inicio, fecha_fin
+        ).one()
+        key = (laboratorio_id, periodo_id, slot_minutes)
+        firma = (tuple(firma), fecha_inicio, fecha_fin)
+
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == firma:
+            return entry[1]
+
+        matriz = utilization_matrix(db, laboratorio_id, fecha_inicio, fecha_fin, slot_minutes)
+        self._entries[key] = (firma, matriz)
+        return matriz
+
+
+def utilization_matrix(db, laboratorio_id, fecha_inicio, fecha_fin, slot_minutes=60):
+    """Calcula la matriz de ocupación (7 x franjas) del laboratorio entre dos fechas
+
+    SQL devuelve ya el día de la semana y los minutos de entrada y salida como
+    enteros; el reparto en franjas se hace con NumPy (ver bin_sessions).
+    """
+    # Importación diferida: las pestañas importan este módulo por la caché sin usar NumPy
+    import numpy as np
+
+    # strftime('%w') numera desde el domingo (0); la matriz empieza en lunes
+    dia = (cast(func.strftime("%w", RegistroUso.fecha), Integer) + 6) % 7
+    filas = _range_filter(
+        db.query(dia, minutes_of_day(RegistroUso.hora_entrada), minutes_of_day(RegistroUso.hora_salida)),
+        laboratorio_id, fecha_inicio, fecha_fin
+    ).filter(RegistroUso.hora_salida > RegistroUso.hora_entrada).all()
+
+    sesiones = np.array(filas, dtype=np.int64).reshape(-1, 3)
+    minutos = bin_sessions(sesiones[:, 0], sesiones[:, 1], sesiones[:, 2], slot_minutes)
+
+    dias = weekday_counts(fecha_inicio, fecha_fin)
+    disponible = dias[:, np.newaxis] * slot_minutes
+    with np.errstate(divide="ignore", invalid="ignore"):
+        utilizacion = np.where(disponible > 0, minutos / disponible, 0.0)
+    # Dos sesiones traslapadas en el mismo laboratorio no cuentan como más del 100 %
+    utilizacion = np.clip(utilizacion, 0.0, 1.0)
+
+    return UtilizationMatrix(utilizacion, minutos, dias, slot_minutes, fecha_inicio, fecha_fin)
+
+
+# Caché compartida por toda la aplicación
+utilization_cache = UtilizationCache()
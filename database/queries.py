@@ -0,0 +1,232 @@
+from collections import namedtuple
+
+from sqlalchemy import tuple_, literal, select, and_, func
+
+from .models import Docente, Laboratorio, Periodo, RegistroUso
+from utils.intervals import IntervalIndex
+
+# Tamaño de página por defecto para la navegación de registros
+PAGE_SIZE = 200
+
+# Página de resultados con los cursores de sus extremos
+KeysetPage = namedtuple("KeysetPage", ["rows", "first_cursor", "last_cursor", "has_next", "has_previous"])
+
+
+def registro_cursor(row):
+    """Obtiene el cursor (fecha, hora_entrada, id) de un registro o fila proyectada"""
+    return (row.fecha, row.hora_entrada, row.id)
+
+
+def _cursor_key():
+    return tuple_(RegistroUso.fecha, RegistroUso.hora_entrada, RegistroUso.id)
+
+
+def _cursor_value(cursor):
+    fecha, hora_entrada, registro_id = cursor
+    return tuple_(
+        literal(fecha, RegistroUso.fecha.type),
+        literal(hora_entrada, RegistroUso.hora_entrada.type),
+        literal(registro_id, RegistroUso.id.type)
+    )
+
+
+def paginate_registros(query, cursor=None, limit=PAGE_SIZE, backward=False):
+    """Devuelve una página de registros usando paginación por cursor (keyset)
+
+    Los registros se ordenan por fecha y hora de entrada descendentes, con el id
+    como desempate. Para avanzar se pasa el last_cursor de la página actual; para
+    retroceder, su first_cursor con backward=True. A diferencia de OFFSET, el
+    costo de cada página es el mismo sin importar su profundidad.
+    """
+    key = _cursor_key()
+
+    if backward:
+        # Recorrer en orden inverso desde el cursor y luego voltear el resultado
+        if cursor is not None:
+            query = query.filter(key > _cursor_value(cursor))
+        query = query.order_by(None).order_by(
+            RegistroUso.fecha.asc(), RegistroUso.hora_entrada.asc(), RegistroUso.id.asc()
+        )
+    else:
+        if cursor is not None:
+            query = query.filter(key < _cursor_value(cursor))
+        query = query.order_by(None).order_by(
+            RegistroUso.fecha.desc(), RegistroUso.hora_entrada.desc(), RegistroUso.id.desc()
+        )
+
+    # Pedir una fila extra para saber si hay más resultados en esa dirección
+    rows = query.limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    if backward:
+        rows.reverse()
+        has_next = cursor is not None
+        has_previous = has_more
+    else:
+        has_next = has_more
+        has_previous = cursor is not None
+
+    first_cursor = registro_cursor(rows[0]) if rows else None
+    last_cursor = registro_cursor(rows[-1]) if rows else None
+
+    return KeysetPage(rows, first_cursor, last_cursor, has_next, has_previous)
+
+
+def registros_display_query(db):
+    """Consulta plana con solo las columnas que muestra la tabla de registros
+
+    Devuelve tuplas (id, fecha, hora_entrada, hora_salida, actividad, docente_nombre,
+    docente_apellido) con el docente ya unido, de modo que una página completa se
+    obtiene en una sola consulta sin cargas perezosas por fila.
+    """
+    return db.query(
+        RegistroUso.id,
+        RegistroUso.fecha,
+        RegistroUso.hora_entrada,
+        RegistroUso.hora_salida,
+        RegistroUso.actividad,
+        Docente.nombre.label("docente_nombre"),
+        Docente.apellido.label("docente_apellido")
+    ).join(Docente, RegistroUso.docente_id == Docente.id)
+
+
+def filter_registros(query, docente_id=None, laboratorio_id=None, carrera_id=None, periodo_id=None):
+    """Aplica los filtros de la visualización a una consulta de registros
+
+    Todos los criterios se compilan en la misma sentencia SQL: la carrera se filtra
+    a través del join con Laboratorio y el período con un join sobre sus fechas, sin
+    consultas previas para obtener los ids de laboratorios o el rango de fechas.
+    """
+    # Solo se muestran registros con laboratorio existente
+    query = query.join(Laboratorio, RegistroUso.laboratorio_id == Laboratorio.id)
+
+    if docente_id:
+        query = query.filter(RegistroUso.docente_id == docente_id)
+
+    # Un laboratorio concreto tiene prioridad sobre la carrera
+    if laboratorio_id:
+        query = query.filter(RegistroUso.laboratorio_id == laboratorio_id)
+    elif carrera_id:
+        query = query.filter(Laboratorio.carrera_id == carrera_id)
+
+    # El período filtra por su rango de fechas, no por el periodo_id del registro
+    if periodo_id:
+        query = query.join(Periodo, and_(
+            Periodo.id == periodo_id,
+            RegistroUso.fecha.between(Periodo.fecha_inicio, Periodo.fecha_fin)
+        ))
+
+    return query
+
+
+def count_registros(db, docente_id=None, laboratorio_id=None, carrera_id=None, periodo_id=None):
+    """Número de registros que muestra la tabla de Visualización con los filtros dados
+
+    Es una consulta aparte de la paginación: la primera página no espera a que se
+    cuenten todas las filas.
+    """
+    query = db.query(func.count(RegistroUso.id)).select_from(RegistroUso).join(
+        Docente, RegistroUso.docente_id == Docente.id
+    )
+    return filter_registros(
+        query,
+        docente_id=docente_id,
+        laboratorio_id=laboratorio_id,
+        carrera_id=carrera_id,
+        periodo_id=periodo_id
+    ).scalar()
+
+
+def report_query(db, docente_id=None, laboratorio_id=None, carrera_id=None, periodo_id=None):
+    """Registros filtrados para el reporte, ordenados por fecha y hora ascendentes
+
+    Usa los mismos filtros y columnas que la tabla de Visualización, pero ordena en SQL
+    de la más antigua a la más reciente para que el reporte no tenga que ordenar en
+    memoria.
+    """
+    query = filter_registros(
+        registros_display_query(db),
+        docente_id=docente_id,
+        laboratorio_id=laboratorio_id,
+        carrera_id=carrera_id,
+        periodo_id=periodo_id
+    )
+    return query.order_by(RegistroUso.fecha.asc(), RegistroUso.hora_entrada.asc(), RegistroUso.id.asc())
+
+
+def export_query(db, docente_id=None, laboratorio_id=None, carrera_id=None, periodo_id=None):
+    """report_query con el nombre del laboratorio, para la exportación de datos
+
+    El laboratorio ya está unido por filter_registros, así que la columna extra no
+    añade otro join.
+    """
+    query = report_query(
+        db,
+        docente_id=docente_id,
+        laboratorio_id=laboratorio_id,
+        carrera_id=carrera_id,
+        periodo_id=periodo_id
+    )
+    return query.add_columns(Laboratorio.nombre.label("laboratorio_nombre"))
+
+
+def report_pairs(db, periodo_id):
+    """Pares (laboratorio_id, docente_id) con al menos un registro en el período
+
+    Usa el mismo criterio de período que filter_registros (rango de fechas), de modo
+    que cada par corresponde a un reporte no vacío de report_query.
+    """
+    query = filter_registros(
+        db.query(RegistroUso.laboratorio_id, RegistroUso.docente_id)
+        .join(Docente, RegistroUso.docente_id == Docente.id),
+        periodo_id=periodo_id
+    )
+    return query.distinct().order_by(RegistroUso.laboratorio_id, RegistroUso.docente_id).all()
+
+
+def iter_report_rows(query, fetch_size=PAGE_SIZE):
+    """Recorre el resultado de report_query leyendo del cursor en bloques de fetch_size
+
+    Es una sola consulta: las filas se van obteniendo a medida que se consumen, sin
+    cargar todo el resultado en memoria.
+    """
+    for row in query.yield_per(fetch_size):
+        yield row
+
+
+def load_interval_index(connection, laboratorio_id, fechas, index=None):
+    """Carga en un IntervalIndex la ocupación del laboratorio en las fechas indicadas
+
+    connection puede ser una conexión o una sesión. Si se pasa un índice existente
+    se completa con los intervalos de las nuevas fechas.
+    """
+    if index is None:
+        index = IntervalIndex()
+
+    fechas = list(fechas)
+    if not fechas:
+        return index
+
+    query = select(
+        RegistroUso.id, RegistroUso.fecha, RegistroUso.hora_entrada, RegistroUso.hora_salida
+    ).where(
+        RegistroUso.laboratorio_id == laboratorio_id,
+        RegistroUso.fecha.in_(fechas),
+        RegistroUso.hora_entrada.isnot(None),
+        RegistroUso.hora_salida.isnot(None)
+    )
+    for registro_id, fecha, hora_entrada, hora_salida in connection.execute(query):
+        index.add(laboratorio_id, fecha, hora_entrada, hora_salida, registro_id)
+
+    return index
+
+
+def find_overlaps(connection, laboratorio_id, fecha, hora_entrada, hora_salida):
+    """Devuelve los intervalos ya registrados que se traslapan con el horario dado
+
+    El índice se carga de la base de datos en cada llamada, de modo que siempre refleja
+    las eliminaciones hechas desde cualquier pestaña.
+    """
+    index = load_interval_index(connection, laboratorio_id, [fecha])
+    return index.overlaps(laboratorio_id, fecha, hora_entrada, hora_salida)
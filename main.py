@@ -1,20 +1,49 @@
+import time
+
+# Marca de tiempo lo más temprana posible para medir el arranque
+STARTUP_START = time.perf_counter()
+
+import multiprocessing
+import os
 import sys
+from PySide6.QtCore import QTimer
 from PySide6.QtWidgets import QApplication
 
 from database.database import engine
 from database.models import Base
+from database.migrations import upgrade_schema
+from database.catalog import ensure_initial_catalog
 from ui.main_window import MainWindow
 
+def report_startup_time():
+    """Muestra el tiempo desde el inicio del proceso hasta que la ventana está visible
+
+    Con REGISTROS_STARTUP_EXIT=1 la aplicación se cierra después de medir, lo que
+    permite registrar el tiempo de arranque desde un script.
+    """
+    elapsed_ms = (time.perf_counter() - STARTUP_START) * 1000
+    print(f"Ventana visible en {elapsed_ms:.0f} ms")
+    if os.environ.get("REGISTROS_STARTUP_EXIT") == "1":
+        QApplication.quit()
+
 def main():
     # Crear tablas en la base de datos
     Base.metadata.create_all(bind=engine)
+    # Actualizar bases de datos existentes (índices nuevos, etc.)
+    upgrade_schema(engine)
+    # Crear las carreras y laboratorios iniciales si faltan
+    ensure_initial_catalog()
     
     # Iniciar la aplicación
     app = QApplication(sys.argv)
     app.setApplicationName("REGISTROS_LABORATORIOS")
     window = MainWindow()
     window.show()
+    # Se ejecuta en la primera vuelta del bucle de eventos, tras el primer pintado
+    QTimer.singleShot(0, report_startup_time)
     sys.exit(app.exec())
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    # Necesario en el ejecutable de PyInstaller para los procesos de los reportes por lote
+    multiprocessing.freeze_support()
+    main()
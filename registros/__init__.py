@@ -0,0 +1 @@
+# Línea de comandos de la aplicación: python -m registros --help
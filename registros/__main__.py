@@ -0,0 +1,9 @@
+import multiprocessing
+import sys
+
+from .cli import main
+
+if __name__ == "__main__":
+    # Necesario en el ejecutable de PyInstaller para los procesos de los reportes por lote
+    multiprocessing.freeze_support()
+    sys.exit(main())
@@ -0,0 +1,292 @@
+"""
+Línea de comandos para los trabajos sin interfaz: importar CSV, exportar registros,
+generar reportes PDF y calcular estadísticas.
+
+Uso:
+    python -m registros import ARCHIVO.csv --periodo P --laboratorio L --docente D
+    python -m registros export ARCHIVO.csv|.parquet|.xlsx [filtros]
+    python -m registros report ARCHIVO.pdf [filtros]
+    python -m registros report --lote CARPETA --periodo P
+    python -m registros stats laboratorio|docente|carrera|periodo [filtros] [--csv]
+    python -m registros unique-index on|off [--eliminar-duplicados]
+
+Los filtros son --periodo, --laboratorio, --docente y --carrera, con el id o el nombre
+tal como aparece en los catálogos. La base de datos es la de REGISTROS_DATABASE_URL o
+el archivo indicado con --db. Cada orden usa las mismas funciones que las pestañas y
+termina con código 0 si todo salió bien o 1 si hubo un error. Ninguna abre ventanas
+ni ejecuta el bucle de eventos de Qt: report solo crea la QGuiApplication que necesita
+QPainter, con la plataforma offscreen si no se indica otra.
+"""
+
+import argparse
+import contextlib
+import csv
+import os
+import sys
+import time
+
+# Tipos de catálogo que aceptan los filtros: (atributo de args, nombre para los mensajes)
+FILTROS = [
+    ("periodo", "Período"),
+    ("laboratorio", "Laboratorio"),
+    ("docente", "Docente"),
+    ("carrera", "Carrera"),
+]
+
+
+class CliError(Exception):
+    """Error de uso que se informa con un mensaje, sin traceback"""
+
+
+def _add_filters(parser, required=(), exclude=()):
+    for nombre, titulo in FILTROS:
+        if nombre in exclude:
+            continue
+        parser.add_argument(f"--{nombre}", required=nombre in required,
+                            help=f"{titulo} (id o nombre)")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m registros",
+        description="Registros de laboratorios sin interfaz gráfica"
+    )
+    parser.add_argument("--db", help="Archivo SQLite (por defecto el de REGISTROS_DATABASE_URL "
+                                     "o registros_laboratorios.db)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    importar = subparsers.add_parser("import", help="Importa un CSV de registros")
+    importar.add_argument("archivo", help="CSV con actividad, fecha, hora_entrada y hora_salida")
+    # La carrera sale del laboratorio: import no la acepta
+    _add_filters(importar, required=("periodo", "laboratorio", "docente"), exclude=("carrera",))
+    importar.add_argument("--permitir-duplicados", action="store_true",
+                          help="No omitir los registros que ya existen")
+    importar.add_argument("--permitir-traslapes", action="store_true",
+                          help="No rechazar las sesiones que se traslapan en el laboratorio")
+    importar.set_defaults(func=cmd_import)
+
+    exportar = subparsers.add_parser("export", help="Exporta los registros filtrados")
+    exportar.add_argument("archivo", help="Archivo de salida (.csv, .parquet o .xlsx)")
+    exportar.add_argument("--formato", choices=["csv", "parquet", "xlsx"],
+                          help="Formato si el archivo no tiene una extensión reconocida")
+    _add_filters(exportar)
+    exportar.set_defaults(func=cmd_export)
+
+    reporte = subparsers.add_parser("report", help="Genera el reporte PDF o los reportes del período")
+    reporte.add_argument("archivo", nargs="?", help="PDF de salida con los registros filtrados")
+    reporte.add_argument("--lote", metavar="CARPETA",
+                         help="Un PDF por laboratorio/docente del período en esta carpeta")
+    reporte.add_argument("--procesos", type=int, help="Procesos para --lote (por defecto, los núcleos)")
+    _add_filters(reporte)
+    reporte.set_defaults(func=cmd_report)
+
+    estadisticas = subparsers.add_parser("stats", help="Horas, sesiones y duración promedio de uso")
+    estadisticas.add_argument("dimension", choices=["laboratorio", "docente", "carrera", "periodo"],
+                              help="Agrupación")
+    _add_filters(estadisticas)
+    estadisticas.add_argument("--csv", action="store_true", help="Escribe el resultado como CSV")
+    estadisticas.set_defaults(func=cmd_stats)
+
+    indice = subparsers.add_parser("unique-index",
+                                   help="Activa o quita el índice único que impide registros repetidos")
+    indice.add_argument("estado", choices=["on", "off"], help="on para crearlo, off para eliminarlo")
+    indice.add_argument("--eliminar-duplicados", action="store_true",
+                        help="Borra antes los registros repetidos, conservando el de menor id")
+    indice.set_defaults(func=cmd_unique_index)
+
+    return parser
+
+
+def _candidates(tipo):
+    from database.catalog import catalog
+
+    if tipo == "periodo":
+        return [(item.id, item.nombre) for item in catalog.periodos()]
+    if tipo == "laboratorio":
+        return [(item.id, item.nombre) for item in catalog.laboratorios()]
+    if tipo == "carrera":
+        return [(item.id, item.nombre) for item in catalog.carreras()]
+    return [(item.id, f"{item.nombre} {item.apellido}" if item.apellido else item.nombre)
+            for item in catalog.docentes()]
+
+
+def resolve(tipo, valor):
+    """Id del catálogo a partir de un id o de un nombre (sin distinguir mayúsculas)"""
+    if valor is None:
+        return None
+
+    candidatos = _candidates(tipo)
+    if valor.isdigit():
+        if int(valor) not in {clave for clave, _ in candidatos}:
+            raise CliError(f"No existe {tipo} con id {valor}")
+        return int(valor)
+
+    encontrados = [clave for clave, nombre in candidatos if nombre.casefold() == valor.strip().casefold()]
+    if not encontrados:
+        raise CliError(f"No existe {tipo} con nombre '{valor}'")
+    if len(encontrados) > 1:
+        # Los laboratorios se repiten en cada carrera: hay que indicar el id
+        ids = ", ".join(str(clave) for clave in encontrados)
+        raise CliError(f"Hay varios {tipo}s con nombre '{valor}' (ids {ids}); indique el id")
+    return encontrados[0]
+
+
+def _filtros(args):
+    return {
+        "docente_id": resolve("docente", args.docente),
+        "laboratorio_id": resolve("laboratorio", args.laboratorio),
+        "carrera_id": resolve("carrera", getattr(args, "carrera", None)),
+        "periodo_id": resolve("periodo", args.periodo),
+    }
+
+
+def prepare_database():
+    """Crea las tablas y aplica las mismas actualizaciones que main.py al arrancar"""
+    from database.database import engine
+    from database.models import Base
+    from database.migrations import upgrade_schema
+    from database.catalog import ensure_initial_catalog
+
+    Base.metadata.create_all(bind=engine)
+    upgrade_schema(engine)
+    ensure_initial_catalog()
+
+
+def cmd_import(args):
+    from database.importer import import_csv
+
+    filtros = _filtros(args)
+    resultado = import_csv(
+        args.archivo,
+        filtros["periodo_id"],
+        filtros["laboratorio_id"],
+        filtros["docente_id"],
+        skip_duplicates=not args.permitir_duplicados,
+        reject_overlaps=not args.permitir_traslapes
+    )
+    print(f"Importados {resultado.inserted} registros en {resultado.elapsed:.2f} s "
+          f"({resultado.rows_per_second:.0f} filas/s)")
+    if resultado.skipped:
+        print(f"Rechazados {resultado.skipped} (duplicados: {resultado.duplicates})")
+        print(resultado.rejects.summary())
+    return 0
+
+
+def cmd_export(args):
+    from database.export import export_registros
+
+    resultado = export_registros(args.archivo, args.formato, **_filtros(args))
+    print(f"Exportados {resultado.filas} registros a {resultado.file_path} en {resultado.segundos:.2f} s "
+          f"({resultado.filas_por_segundo:.0f} filas/s)")
+    return 0
+
+
+def _qt_application():
+    """QGuiApplication para dibujar los PDF; no se ejecuta su bucle de eventos"""
+    from PySide6.QtGui import QGuiApplication
+
+    return QGuiApplication.instance() or QGuiApplication([sys.argv[0]])
+
+
+def cmd_report(args):
+    # Antes de importar Qt; los procesos del lote heredan la variable
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from ui.report_batch import BatchJob, generate_period_reports, render_job, report_info
+
+    filtros = _filtros(args)
+    inicio = time.perf_counter()
+
+    if args.lote:
+        if not filtros["periodo_id"]:
+            raise CliError("--lote requiere --periodo")
+        resumen, resultados = generate_period_reports(filtros["periodo_id"], args.lote,
+                                                      max_workers=args.procesos)
+        fallidos = [resultado for resultado in resultados if resultado.error]
+        print(f"Generados {len(resultados) - len(fallidos)} reportes "
+              f"({sum(resultado.paginas for resultado in resultados)} páginas) "
+              f"en {time.perf_counter() - inicio:.2f} s")
+        print(f"Resumen: {resumen}")
+        for resultado in fallidos:
+            print(f"Error en {resultado.file_path}: {resultado.error}", file=sys.stderr)
+        return 1 if fallidos else 0
+
+    if not args.archivo:
+        raise CliError("Indique el PDF de salida o --lote CARPETA")
+
+    # La aplicación debe existir mientras se dibuja el PDF
+    app = _qt_application()
+    resultado = render_job(BatchJob(args.archivo, filtros, report_info(**filtros)))
+    if resultado.error:
+        raise CliError(f"Error al generar el PDF: {resultado.error}")
+    print(f"Reporte {resultado.file_path}: {resultado.registros} registros, {resultado.paginas} páginas "
+          f"en {resultado.segundos:.2f} s")
+    return 0
+
+
+def cmd_stats(args):
+    from database.database import session_scope
+    from database.analytics import usage_stats, total_stats
+
+    filtros = _filtros(args)
+    inicio = time.perf_counter()
+    with session_scope() as db:
+        stats = usage_stats(db, args.dimension, **filtros)
+    elapsed_ms = (time.perf_counter() - inicio) * 1000
+
+    if args.csv:
+        writer = csv.writer(sys.stdout)
+        writer.writerow(["id", "nombre", "horas", "sesiones", "promedio_minutos"])
+        for stat in stats:
+            writer.writerow([stat.clave, stat.nombre, f"{stat.horas:.2f}", stat.sesiones,
+                             f"{stat.promedio_minutos:.1f}"])
+    else:
+        ancho = max([len(stat.nombre) for stat in stats] + [len("Nombre")])
+        print(f"{'Nombre':<{ancho}}  {'Horas':>9}  {'Sesiones':>8}  {'Promedio (min)':>14}")
+        for stat in stats + [total_stats(stats)]:
+            print(f"{stat.nombre:<{ancho}}  {stat.horas:9.1f}  {stat.sesiones:8d}  "
+                  f"{stat.promedio_minutos:14.0f}")
+
+    # El tiempo va a stderr para no mezclarse con el CSV
+    print(f"Calculado en {elapsed_ms:.0f} ms", file=sys.stderr)
+    return 0
+
+
+def cmd_unique_index(args):
+    from sqlalchemy.exc import IntegrityError
+    from database.database import engine
+    from database.migrations import enable_unique_registros, disable_unique_registros
+
+    if args.estado == "off":
+        disable_unique_registros(engine)
+        print("Índice único de registros eliminado")
+        return 0
+
+    try:
+        removed = enable_unique_registros(engine, remove_duplicates=args.eliminar_duplicados)
+    except IntegrityError:
+        raise CliError("Hay registros repetidos; use --eliminar-duplicados para depurarlos")
+    if removed:
+        print(f"Registros duplicados eliminados: {removed}")
+    print("Índice único de registros activado")
+    return 0
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    # La ruta de la base de datos se fija antes de importar database.database
+    if args.db:
+        os.environ["REGISTROS_DATABASE_URL"] = f"sqlite:///{os.path.abspath(args.db)}"
+
+    try:
+        # Los avisos de la actualización del esquema van a stderr para no mezclarse
+        # con la salida de las órdenes (por ejemplo stats --csv)
+        with contextlib.redirect_stdout(sys.stderr):
+            prepare_database()
+        return args.func(args)
+    except KeyboardInterrupt:
+        print("Cancelado", file=sys.stderr)
+        return 130
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
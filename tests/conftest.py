@@ -0,0 +1,81 @@
+import datetime
+import os
+import shutil
+import sys
+import tempfile
+from collections import namedtuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TMP = tempfile.mkdtemp()
+
+# La base de datos de las pruebas se fija antes de importar database.database
+os.environ["REGISTROS_DATABASE_URL"] = f"sqlite:///{os.path.join(TMP, 'pruebas.db')}"
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, ROOT)
+
+import pytest
+
+from database.database import engine
+from database.models import Base, Carrera, Docente, Laboratorio, Periodo, RegistroUso, docente_laboratorio
+from database.daily_summary import ensure_daily_summary
+from database.catalog import catalog
+from database.occupancy import utilization_cache
+
+# Ids del catálogo mínimo que crea el fixture datos
+Datos = namedtuple("Datos", ["periodo_id", "laboratorio_id", "docente_id", "fecha_inicio", "fecha_fin"])
+
+
+@pytest.fixture(scope="session", autouse=True)
+def esquema():
+    Base.metadata.create_all(bind=engine)
+    ensure_daily_summary(engine)
+    yield
+    engine.dispose()
+    shutil.rmtree(TMP, ignore_errors=True)
+
+
+@pytest.fixture
+def datos():
+    """Base de datos vacía con una carrera, dos laboratorios, un docente y un período"""
+    fecha_inicio = datetime.date(2025, 1, 1)
+    fecha_fin = datetime.date(2025, 6, 30)
+    with engine.begin() as connection:
+        for table in reversed(Base.metadata.sorted_tables):
+            connection.execute(table.delete())
+        connection.execute(Carrera.__table__.insert(), [{"id": 1, "nombre": "Mecánica"}])
+        connection.execute(Laboratorio.__table__.insert(), [
+            {"id": 1, "nombre": "Metrología", "carrera_id": 1},
+            {"id": 2, "nombre": "Hidráulica", "carrera_id": 1},
+        ])
+        connection.execute(Docente.__table__.insert(),
+                           [{"id": 1, "nombre": "Ana", "apellido": "Pérez", "carrera_id": 1}])
+        connection.execute(docente_laboratorio.insert(), [
+            {"docente_id": 1, "laboratorio_id": 1},
+            {"docente_id": 1, "laboratorio_id": 2},
+        ])
+        connection.execute(Periodo.__table__.insert(), [
+            {"id": 1, "nombre": "2025-1", "fecha_inicio": fecha_inicio, "fecha_fin": fecha_fin}
+        ])
+    catalog.invalidate()
+    utilization_cache.invalidate()
+    return Datos(1, 1, 1, fecha_inicio, fecha_fin)
+
+
+@pytest.fixture
+def add_registros(datos):
+    """Función que inserta registros con los valores por defecto del catálogo de datos"""
+    def add(*registros):
+        filas = [{
+            "fecha": datos.fecha_inicio,
+            "hora_entrada": datetime.time(8, 0),
+            "hora_salida": datetime.time(9, 0),
+            "actividad": "Práctica",
+            "docente_id": datos.docente_id,
+            "laboratorio_id": datos.laboratorio_id,
+            "periodo_id": datos.periodo_id,
+            **registro
+        } for registro in registros]
+        with engine.begin() as connection:
+            connection.execute(RegistroUso.__table__.insert(), filas)
+
+    return add
@@ -0,0 +1,53 @@
+import datetime
+
+import pytest
+
+from database.analytics import UsageStat, total_stats, usage_stats
+from database.database import session_scope
+
+
+def hora(texto):
+    return datetime.datetime.strptime(texto, "%H:%M").time()
+
+
+@pytest.fixture
+def sesiones(datos, add_registros):
+    add_registros(
+        {"hora_entrada": hora("08:00"), "hora_salida": hora("09:30")},                    # 90 min
+        {"hora_entrada": hora("10:00"), "hora_salida": hora("11:00")},                    # 60 min
+        {"hora_entrada": hora("14:15"), "hora_salida": hora("16:00"), "laboratorio_id": 2},  # 105 min
+        # Salida anterior a la entrada: no cuenta
+        {"hora_entrada": hora("12:00"), "hora_salida": hora("11:00")},
+        # Fuera del período: 45 min
+        {"fecha": datos.fecha_fin + datetime.timedelta(days=1),
+         "hora_entrada": hora("08:00"), "hora_salida": hora("08:45")},
+    )
+    return datos
+
+
+def test_usage_by_laboratorio(sesiones):
+    with session_scope() as db:
+        assert usage_stats(db, "laboratorio") == [
+            UsageStat(1, "Metrología", 195 / 60, 3, 65.0),
+            UsageStat(2, "Hidráulica", 105 / 60, 1, 105.0),
+        ]
+        assert usage_stats(db, "laboratorio", periodo_id=sesiones.periodo_id) == [
+            UsageStat(1, "Metrología", 150 / 60, 2, 75.0),
+            UsageStat(2, "Hidráulica", 105 / 60, 1, 105.0),
+        ]
+
+
+def test_usage_by_other_dimensions(sesiones):
+    with session_scope() as db:
+        assert usage_stats(db, "docente") == [UsageStat(1, "Ana Pérez", 300 / 60, 4, 75.0)]
+        assert usage_stats(db, "carrera", laboratorio_id=2) == [UsageStat(1, "Mecánica", 105 / 60, 1, 105.0)]
+        # El período cuenta solo los registros dentro de su rango de fechas
+        assert usage_stats(db, "periodo") == [UsageStat(1, "2025-1", 255 / 60, 3, 85.0)]
+
+        total = total_stats(usage_stats(db, "laboratorio"))
+        assert (total.horas, total.sesiones) == (300 / 60, 4)
+
+
+def test_unknown_dimension(sesiones):
+    with session_scope() as db, pytest.raises(ValueError):
+        usage_stats(db, "aula")
@@ -0,0 +1,25 @@
+from database.catalog import catalog
+from database.database import QueryCounter, engine
+from database.models import Laboratorio
+
+
+def test_catalog_is_cached_until_invalidated(datos):
+    assert [lab.nombre for lab in catalog.laboratorios(1)] == ["Metrología", "Hidráulica"]
+    loads = catalog.load_count
+
+    # Las lecturas siguientes no vuelven a consultar SQLite
+    with QueryCounter() as counter:
+        assert catalog.periodo(datos.periodo_id).nombre == "2025-1"
+        assert [docente.id for docente in catalog.docentes(carrera_id=1, laboratorio_id=2)] == [1]
+        assert catalog.laboratorio(3) is None
+    assert counter.count == 0
+    assert catalog.load_count == loads
+
+    with engine.begin() as connection:
+        connection.execute(Laboratorio.__table__.insert(), [{"id": 3, "nombre": "Soldadura", "carrera_id": 1}])
+    assert catalog.laboratorio(3) is None
+
+    catalog.invalidate()
+    assert catalog.laboratorio(3).nombre == "Soldadura"
+    assert len(catalog.laboratorios(1)) == 3
+    assert catalog.load_count == loads + 1
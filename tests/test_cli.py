@@ -0,0 +1,75 @@
+import csv
+import datetime
+import os
+import subprocess
+import sys
+
+from database.database import engine
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def registros_cli(*argv):
+    """Ejecuta python -m registros sobre la base de datos de las pruebas"""
+    return subprocess.run(
+        [sys.executable, "-m", "registros", "--db", engine.url.database, *argv],
+        cwd=ROOT, capture_output=True, text=True, encoding="utf-8"
+    )
+
+
+def test_import_and_export(datos, tmp_path):
+    entrada = tmp_path / "registros.csv"
+    with open(entrada, "w", newline="", encoding="utf-8") as csv_file:
+        csv.writer(csv_file).writerows([
+            ["actividad", "fecha", "hora_entrada", "hora_salida"],
+            ["Práctica", "03/02/2025", "08:00", "09:00"],
+            ["Práctica", "04/02/2025", "10:00", "11:30"],
+        ])
+
+    importar = registros_cli("import", str(entrada), "--periodo", "2025-1", "--laboratorio", "1",
+                             "--docente", "ana pérez")
+    assert importar.returncode == 0, importar.stderr
+    assert importar.stdout.startswith("Importados 2 registros")
+
+    salida = tmp_path / "exportados.csv"
+    exportar = registros_cli("export", str(salida), "--laboratorio", "1")
+    assert exportar.returncode == 0, exportar.stderr
+    assert exportar.stdout.startswith("Exportados 2 registros")
+    with open(salida, newline="", encoding="utf-8") as csv_file:
+        filas = list(csv.reader(csv_file))
+    assert [fila[1:4] for fila in filas[1:]] == [["2025-02-03", "08:00", "09:00"],
+                                                 ["2025-02-04", "10:00", "11:30"]]
+
+
+def test_errors_leave_stdout_empty(datos, tmp_path):
+    # Docente inexistente: error con mensaje y código 1
+    resultado = registros_cli("import", str(tmp_path / "registros.csv"), "--periodo", "1",
+                              "--laboratorio", "1", "--docente", "99")
+    assert resultado.returncode == 1
+    assert resultado.stdout == ""
+    assert "No existe docente con id 99" in resultado.stderr
+
+    # import no acepta --carrera: error de argparse, código 2
+    resultado = registros_cli("import", str(tmp_path / "registros.csv"), "--periodo", "1",
+                              "--laboratorio", "1", "--docente", "1", "--carrera", "1")
+    assert resultado.returncode == 2
+    assert resultado.stdout == ""
+
+
+def test_stats_csv_writes_only_data(datos, add_registros):
+    add_registros(
+        {},
+        {"hora_entrada": datetime.time(10, 0), "hora_salida": datetime.time(12, 0)},
+        {"laboratorio_id": 2, "hora_entrada": datetime.time(14, 0), "hora_salida": datetime.time(14, 30)},
+    )
+
+    resultado = registros_cli("stats", "laboratorio", "--periodo", "1", "--csv")
+
+    assert resultado.returncode == 0, resultado.stderr
+    assert list(csv.reader(resultado.stdout.splitlines())) == [
+        ["id", "nombre", "horas", "sesiones", "promedio_minutos"],
+        ["1", "Metrología", "3.00", "2", "90.0"],
+        ["2", "Hidráulica", "0.50", "1", "30.0"],
+    ]
+    # Los avisos del esquema y el tiempo van a stderr
+    assert "Calculado en" in resultado.stderr
@@ -0,0 +1,45 @@
+import datetime
+
+from sqlalchemy import text
+
+from database.database import engine
+from database.daily_summary import rebuild_daily_summary
+
+
+def resumen():
+    with engine.connect() as connection:
+        return connection.execute(text(
+            "SELECT fecha, laboratorio_id, docente_id, minutos, sesiones FROM resumen_diario "
+            "ORDER BY fecha, laboratorio_id, docente_id"
+        )).all()
+
+
+def assert_matches_rebuild():
+    """El resumen mantenido por los triggers es igual al que calcula REBUILD_SQL"""
+    mantenido = resumen()
+    rebuild_daily_summary(engine)
+    assert mantenido == resumen()
+
+
+def test_triggers_match_rebuild(datos, add_registros):
+    add_registros(
+        {},
+        {"hora_entrada": datetime.time(10, 0), "hora_salida": datetime.time(11, 30)},
+        {"laboratorio_id": 2},
+        # Salida anterior a la entrada: no cuenta en el resumen
+        {"hora_entrada": datetime.time(12, 0), "hora_salida": datetime.time(11, 0)},
+    )
+    assert_matches_rebuild()
+    assert [(fila.minutos, fila.sesiones) for fila in resumen()] == [(150, 2), (60, 1)]
+
+    with engine.begin() as connection:
+        connection.execute(text(
+            "UPDATE registros_uso SET hora_salida = '12:45:00.000000', fecha = :fecha "
+            "WHERE hora_entrada = '10:00:00.000000'"
+        ), {"fecha": (datos.fecha_inicio + datetime.timedelta(days=1)).isoformat()})
+    assert_matches_rebuild()
+
+    with engine.begin() as connection:
+        connection.execute(text("DELETE FROM registros_uso WHERE laboratorio_id = 2"))
+    assert_matches_rebuild()
+    assert len(resumen()) == 2
@@ -0,0 +1,59 @@
+import csv
+import datetime
+import os
+
+import pytest
+
+from database.export import COLUMNAS, ExportCancelled, export_registros
+
+
+def read_csv(path):
+    with open(path, newline="", encoding="utf-8") as csv_file:
+        return list(csv.reader(csv_file))
+
+
+def test_csv_export_round_trip_with_filters(datos, add_registros, tmp_path):
+    segundo_dia = datos.fecha_inicio + datetime.timedelta(days=1)
+    add_registros(
+        {"fecha": segundo_dia, "hora_entrada": datetime.time(10, 0), "hora_salida": datetime.time(11, 30),
+         "actividad": "Calibración, patrones"},
+        {},
+        {"hora_entrada": datetime.time(14, 0), "hora_salida": datetime.time(15, 0), "laboratorio_id": 2},
+        # Fuera del rango de fechas del período
+        {"fecha": datos.fecha_fin + datetime.timedelta(days=1)},
+        {"fecha": segundo_dia, "hora_entrada": datetime.time(7, 15), "hora_salida": datetime.time(8, 0)},
+    )
+    file_path = str(tmp_path / "registros.csv")
+
+    # Un bloque de dos filas obliga a escribir en varias pasadas
+    resultado = export_registros(file_path, batch_size=2, laboratorio_id=datos.laboratorio_id,
+                                 periodo_id=datos.periodo_id)
+
+    filas = read_csv(file_path)
+    assert (resultado.formato, resultado.filas) == ("csv", 3)
+    assert filas[0] == COLUMNAS
+    assert [fila[1:] for fila in filas[1:]] == [
+        ["2025-01-01", "08:00", "09:00", "Práctica", "Ana Pérez", "Metrología"],
+        ["2025-01-02", "07:15", "08:00", "Práctica", "Ana Pérez", "Metrología"],
+        ["2025-01-02", "10:00", "11:30", "Calibración, patrones", "Ana Pérez", "Metrología"],
+    ]
+    assert [int(fila[0]) for fila in filas[1:]] == [2, 5, 1]
+
+    # Sin filtros se exportan todos los registros
+    assert export_registros(file_path).filas == 5
+    assert len(read_csv(file_path)) == 6
+
+
+def test_cancelled_export_removes_file(datos, add_registros, tmp_path):
+    add_registros({}, {"hora_entrada": datetime.time(10, 0), "hora_salida": datetime.time(11, 0)})
+    file_path = str(tmp_path / "registros.csv")
+
+    with pytest.raises(ExportCancelled):
+        export_registros(file_path, batch_size=1, should_cancel=lambda: True)
+
+    assert not os.path.exists(file_path)
+
+
+def test_unknown_format_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        export_registros(str(tmp_path / "registros.txt"))
@@ -0,0 +1,115 @@
+import csv
+import datetime
+import os
+
+import pytest
+from sqlalchemy import text
+
+from database.database import engine
+from database.importer import RejectReport, ImportCancelled, import_csv, parse_csv_chunk
+
+
+def write_csv(path, rows):
+    with open(path, "w", newline="", encoding="utf-8") as csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(["actividad", "fecha", "hora_entrada", "hora_salida"])
+        writer.writerows(rows)
+    return str(path)
+
+
+def count_registros():
+    with engine.connect() as connection:
+        return connection.execute(text("SELECT COUNT(*) FROM registros_uso")).scalar()
+
+
+def test_parse_csv_chunk():
+    registros, rechazadas = parse_csv_chunk([
+        ["Práctica", "03/02/2025", "08:00", "09:30"],
+        ["Corta"],
+        ["Práctica", "31/02/2025", "08:00", "09:00"],
+        ["Práctica", "03/02/2025", "8h", "09:00"],
+        ["Práctica", "03/02/2025", "08:00", "xx"],
+        ["Práctica", "03/02/2025", "10:00", "10:00"],
+        ["Práctica", "03/02/2025", "11:00", "10:00"],
+    ])
+
+    assert registros == [(0, {
+        "actividad": "Práctica",
+        "fecha": datetime.date(2025, 2, 3),
+        "hora_entrada": datetime.time(8, 0),
+        "hora_salida": datetime.time(9, 30),
+    })]
+    assert rechazadas == [
+        (1, "columnas insuficientes"),
+        (2, "fecha inválida"),
+        (3, "hora de entrada inválida"),
+        (4, "hora de salida inválida"),
+        (5, "hora de salida no posterior a la de entrada"),
+        (6, "hora de salida no posterior a la de entrada"),
+    ]
+
+
+def test_reject_report_spills_to_file(tmp_path):
+    report = RejectReport(str(tmp_path / "datos.csv"), threshold=2)
+    report.add(2, "fecha inválida", ["a", "xx", "08:00", "09:00"])
+    report.add(3, "columnas insuficientes", ["b"])
+    assert not report.spilled
+    report.add(5, "registro duplicado", ["c", "03/02/2025", "08:00", "09:00"])
+    report.close()
+
+    assert report.spilled and report.count == 3
+    with open(report.path, newline="", encoding="utf-8") as rejects_file:
+        filas = list(csv.reader(rejects_file))
+    assert filas == [
+        RejectReport.HEADER,
+        ["2", "fecha inválida", "a", "xx", "08:00", "09:00"],
+        ["3", "columnas insuficientes", "b"],
+        ["5", "registro duplicado", "c", "03/02/2025", "08:00", "09:00"],
+    ]
+
+
+def test_import_skips_duplicates(datos, tmp_path):
+    file_path = write_csv(tmp_path / "registros.csv", [
+        ["Práctica", "03/02/2025", "08:00", "09:00"],
+        ["Práctica", "03/02/2025", "10:00", "11:00"],
+        ["Práctica", "03/02/2025", "10:00", "11:00"],
+    ])
+
+    primero = import_csv(file_path, datos.periodo_id, datos.laboratorio_id, datos.docente_id)
+    assert (primero.inserted, primero.duplicates) == (2, 1)
+
+    segundo = import_csv(file_path, datos.periodo_id, datos.laboratorio_id, datos.docente_id)
+    assert (segundo.inserted, segundo.duplicates, segundo.skipped) == (0, 3, 3)
+    assert count_registros() == 2
+
+
+def test_import_rejects_in_line_order(datos, tmp_path):
+    file_path = write_csv(tmp_path / "registros.csv", [
+        ["Práctica", "03/02/2025", "08:00", "09:00"],
+        ["Práctica", "03/02/2025", "08:30", "09:30"],
+        ["Práctica", "xx", "08:00", "09:00"],
+        ["Práctica", "03/02/2025", "08:00", "09:00"],
+    ])
+
+    resultado = import_csv(file_path, datos.periodo_id, datos.laboratorio_id, datos.docente_id)
+
+    assert resultado.inserted == 1
+    assert [(line, reason) for line, reason, _ in resultado.rejects.entries] == [
+        (3, "laboratorio ocupado (08:00-09:00)"),
+        (4, "fecha inválida"),
+        (5, "registro duplicado"),
+    ]
+
+
+def test_cancelled_import_removes_rejects(datos, tmp_path):
+    file_path = write_csv(tmp_path / "registros.csv", [
+        ["Práctica", "xx", "08:00", "09:00"],
+        ["Práctica", "03/02/2025", "08:00", "09:00"],
+    ])
+
+    with pytest.raises(ImportCancelled):
+        import_csv(file_path, datos.periodo_id, datos.laboratorio_id, datos.docente_id,
+                   reject_threshold=0, should_cancel=lambda: True)
+
+    assert not os.path.exists(f"{file_path}.rejects.csv")
+    assert count_registros() == 0
@@ -0,0 +1,61 @@
+import datetime
+import random
+
+from utils.intervals import IntervalIndex, minutes_to_text, time_to_minutes
+
+FECHA = datetime.date(2025, 3, 3)
+
+
+def hora(minutos):
+    return datetime.time(minutos // 60, minutos % 60)
+
+
+def test_overlaps_and_touching_ends():
+    index = IntervalIndex()
+    index.add(1, FECHA, hora(480), hora(540), 10)
+    index.add(1, FECHA, hora(600), hora(660), 11)
+
+    assert index.overlaps(1, FECHA, hora(510), hora(620)) == [(480, 540, 10), (600, 660, 11)]
+    # Una sesión que empieza cuando la otra termina no se traslapa
+    assert index.overlaps(1, FECHA, hora(540), hora(600)) == []
+    # Otro laboratorio u otro día no comparten ocupación
+    assert index.overlaps(2, FECHA, hora(480), hora(540)) == []
+    assert index.overlaps(1, FECHA + datetime.timedelta(days=1), hora(480), hora(540)) == []
+
+
+def test_add_same_interval_with_and_without_id():
+    # Un intervalo sin id junto a otro igual con id no debe comparar los ids
+    index = IntervalIndex()
+    index.add(1, FECHA, hora(600), hora(660), 5)
+    index.add(1, FECHA, hora(600), hora(660))
+    index.add(1, FECHA, hora(600), hora(660), 3)
+
+    assert len(index) == 3
+    assert sorted(index.overlaps(1, FECHA, hora(630), hora(640)), key=repr) == sorted(
+        [(600, 660, 5), (600, 660, None), (600, 660, 3)], key=repr
+    )
+
+
+def test_overlaps_matches_brute_force():
+    rng = random.Random(7)
+    for _ in range(200):
+        index = IntervalIndex()
+        guardados = []
+        for registro_id in range(rng.randrange(1, 25)):
+            inicio = rng.randrange(0, 1300)
+            fin = inicio + rng.randrange(1, 140)
+            registro_id = None if rng.random() < 0.3 else registro_id
+            index.add(1, FECHA, hora(inicio), hora(fin), registro_id)
+            guardados.append((inicio, fin, registro_id))
+
+        for _ in range(10):
+            inicio = rng.randrange(0, 1300)
+            fin = inicio + rng.randrange(1, 140)
+            esperados = [entry for entry in guardados if entry[0] < fin and entry[1] > inicio]
+            obtenidos = index.overlaps(1, FECHA, hora(inicio), hora(fin))
+            assert sorted(obtenidos, key=repr) == sorted(esperados, key=repr)
+
+
+def test_minutes_conversion():
+    assert time_to_minutes(datetime.time(13, 45)) == 825
+    assert minutes_to_text(825) == "13:45"
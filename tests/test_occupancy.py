@@ -0,0 +1,82 @@
+import datetime
+
+import numpy as np
+import pytest
+from sqlalchemy import text
+
+from database.database import engine, session_scope
+from database.occupancy import bin_sessions, utilization_cache, utilization_matrix, weekday_counts
+
+
+def sesiones(*filas):
+    dias, inicios, fines = np.array(filas, dtype=np.int64).reshape(-1, 3).T
+    return dias, inicios, fines
+
+
+def test_session_split_across_hours():
+    # Lunes de 08:30 a 10:15: 30, 60 y 15 minutos en tres franjas de una hora
+    minutos = bin_sessions(*sesiones((0, 8 * 60 + 30, 10 * 60 + 15)))
+    assert minutos.shape == (7, 24)
+    assert minutos[0, 8:11].tolist() == [30, 60, 15]
+    assert minutos.sum() == 105
+
+    # Con franjas de 30 minutos
+    minutos = bin_sessions(*sesiones((0, 8 * 60 + 30, 10 * 60 + 15)), slot_minutes=30)
+    assert minutos[0, 16:21].tolist() == [0, 30, 30, 30, 15]
+
+
+def test_sessions_up_to_midnight_stay_in_their_day():
+    # Domingo de 23:00 al final del día y lunes desde las 00:00
+    minutos = bin_sessions(*sesiones((6, 23 * 60, 24 * 60), (6, 23 * 60 + 30, 23 * 60 + 59), (0, 0, 45)))
+    assert minutos[6, 23] == 60 + 29
+    assert minutos[6, :23].sum() == 0
+    assert minutos[0, 0] == 45
+    assert minutos[0, 1:].sum() == 0
+    assert minutos.sum() == 60 + 29 + 45
+
+
+def test_slot_must_divide_the_day():
+    with pytest.raises(ValueError):
+        bin_sessions(*sesiones((0, 0, 10)), slot_minutes=7)
+
+
+def test_weekday_counts():
+    # Del miércoles 1 al martes 14 de enero de 2025: dos de cada día
+    assert weekday_counts(datetime.date(2025, 1, 1), datetime.date(2025, 1, 14)).tolist() == [2] * 7
+    assert weekday_counts(datetime.date(2025, 1, 6), datetime.date(2025, 1, 8)).tolist() == [1, 1, 1, 0, 0, 0, 0]
+
+
+def test_utilization_matrix_from_registros(datos, add_registros):
+    lunes = datetime.date(2025, 1, 6)
+    add_registros(
+        {"fecha": lunes, "hora_entrada": datetime.time(8, 30), "hora_salida": datetime.time(10, 15)},
+        {"fecha": lunes, "hora_entrada": datetime.time(23, 0), "hora_salida": datetime.time(23, 59)},
+        # Cruza la medianoche (salida anterior a la entrada): no cuenta
+        {"fecha": lunes, "hora_entrada": datetime.time(22, 0), "hora_salida": datetime.time(1, 0)},
+    )
+
+    with session_scope() as db:
+        matriz = utilization_matrix(db, datos.laboratorio_id, lunes, lunes + datetime.timedelta(days=6))
+    assert matriz.minutos[0, 8:11].tolist() == [30, 60, 15]
+    assert matriz.minutos[0, 22:].tolist() == [0, 59]
+    assert matriz.minutos.sum() == 105 + 59
+    assert matriz.utilizacion[0, 9] == 1.0
+    assert matriz.dias.tolist() == [1] * 7
+
+
+def test_cache_invalidate_after_id_reuse(datos, add_registros):
+    add_registros({"hora_entrada": datetime.time(8, 0), "hora_salida": datetime.time(9, 0)})
+    with session_scope() as db:
+        antes = utilization_cache.get(db, datos.laboratorio_id, datos.periodo_id)
+
+    # Eliminar y volver a insertar reutiliza el id: la firma (número, id máximo) no cambia
+    with engine.begin() as connection:
+        connection.execute(text("DELETE FROM registros_uso"))
+    add_registros({"hora_entrada": datetime.time(15, 0), "hora_salida": datetime.time(16, 0)})
+    utilization_cache.invalidate()
+
+    with session_scope() as db:
+        despues = utilization_cache.get(db, datos.laboratorio_id, datos.periodo_id)
+    assert antes.minutos.sum(axis=0)[8] == 60
+    assert despues.minutos.sum(axis=0)[8] == 0
+    assert despues.minutos.sum(axis=0)[15] == 60
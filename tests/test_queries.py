@@ -0,0 +1,59 @@
+import datetime
+
+from database.database import session_scope
+from database.queries import count_registros, filter_registros, paginate_registros, registros_display_query
+
+
+def registros_ordenados(add_registros, datos, cantidad):
+    """Inserta registros en horarios distintos; devuelve (fecha, hora) del más reciente al más antiguo"""
+    registros = [{
+        "fecha": datos.fecha_inicio + datetime.timedelta(days=i // 3),
+        "hora_entrada": datetime.time(8 + i % 3 * 2, 0),
+        "hora_salida": datetime.time(9 + i % 3 * 2, 0),
+    } for i in range(cantidad)]
+    add_registros(*registros)
+    return [(r["fecha"], r["hora_entrada"]) for r in reversed(registros)]
+
+
+def test_paginate_forward_and_backward(datos, add_registros):
+    esperados = registros_ordenados(add_registros, datos, 10)
+
+    with session_scope() as db:
+        query = registros_display_query(db)
+        paginas = []
+        cursor = None
+        while True:
+            page = paginate_registros(query, cursor, limit=4)
+            paginas.append(page)
+            if not page.has_next:
+                break
+            cursor = page.last_cursor
+
+        assert [len(page.rows) for page in paginas] == [4, 4, 2]
+        assert [(row.fecha, row.hora_entrada) for page in paginas for row in page.rows] == esperados
+        assert not paginas[0].has_previous and paginas[1].has_previous
+
+        # Volver desde la última página a la anterior con su first_cursor
+        anterior = paginate_registros(query, paginas[2].first_cursor, limit=4, backward=True)
+        assert [row.id for row in anterior.rows] == [row.id for row in paginas[1].rows]
+        assert anterior.has_next and anterior.has_previous
+
+
+def test_count_matches_filters(datos, add_registros):
+    add_registros(
+        {},
+        {"hora_entrada": datetime.time(10, 0), "hora_salida": datetime.time(11, 0)},
+        {"laboratorio_id": 2},
+        # Fuera del rango de fechas del período
+        {"fecha": datos.fecha_fin + datetime.timedelta(days=1)},
+    )
+
+    with session_scope() as db:
+        for filtros, esperado in (
+            ({}, 4),
+            ({"laboratorio_id": 1}, 3),
+            ({"laboratorio_id": 1, "periodo_id": datos.periodo_id}, 2),
+            ({"carrera_id": 1, "periodo_id": datos.periodo_id}, 3),
+        ):
+            filas = filter_registros(registros_display_query(db), **filtros).count()
+            assert count_registros(db, **filtros) == filas == esperado
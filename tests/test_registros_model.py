@@ -0,0 +1,46 @@
+from PySide6.QtCore import QModelIndex
+
+from ui.registros_model import RegistrosTableModel
+
+
+def list_fetcher(ids):
+    """page_fetcher sobre una lista de ids ordenada de forma descendente"""
+    def fetch(cursor, limit):
+        pendientes = [registro_id for registro_id in ids if cursor is None or registro_id < cursor]
+        rows = [(registro_id, "Docente", "Práctica", "08:00", "09:00", "03/02/2025")
+                for registro_id in pendientes[:limit]]
+        return rows, rows[-1][0] if len(pendientes) > limit else None
+
+    return fetch
+
+
+def test_pages_are_bounded_and_refetched():
+    ids = list(range(1000, 0, -1))
+    model = RegistrosTableModel()
+    model.PAGE_SIZE = 10
+    model.MAX_PAGES = 3
+    model.set_page_fetcher(list_fetcher(ids))
+    while model.canFetchMore(QModelIndex()):
+        model.fetchMore(QModelIndex())
+
+    assert model.rowCount() == 1000
+    assert len(model._pages) == 3
+    assert [model.registro_id(row) for row in (0, 555, 999)] == [1000, 445, 1]
+    assert len(model._pages) == 3
+
+
+def test_registro_id_is_none_when_a_refetched_page_shrinks():
+    ids = list(range(100, 0, -1))
+    model = RegistrosTableModel()
+    model.PAGE_SIZE = 10
+    model.MAX_PAGES = 1
+    model.set_page_fetcher(list_fetcher(ids))
+    while model.canFetchMore(QModelIndex()):
+        model.fetchMore(QModelIndex())
+
+    # La última página se descarta y luego se eliminan dos de sus registros
+    assert model.registro_id(0) == 100
+    ids.remove(3)
+    ids.remove(2)
+    assert model.registro_id(97) == 1
+    assert model.registro_id(99) is None
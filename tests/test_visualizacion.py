@@ -0,0 +1,76 @@
+import datetime
+import time
+
+import pytest
+from PySide6.QtWidgets import QApplication
+
+from database.database import QueryCounter, session_scope
+from database.models import RegistroUso
+from database.queries import PAGE_SIZE
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+def test_one_statement_per_page(app, datos, add_registros):
+    from ui.visualizacion_tab import VisualizacionTab
+
+    add_registros(*[{
+        "fecha": datos.fecha_inicio + datetime.timedelta(days=i // 10),
+        "hora_entrada": datetime.time(7 + i % 10, 0),
+        "hora_salida": datetime.time(7 + i % 10, 50),
+    } for i in range(PAGE_SIZE * 2 + 10)])
+
+    tab = VisualizacionTab()
+    app.processEvents()
+    model = tab.results_model
+
+    # Sin laboratorio no hay mapa de calor: solo la primera página; el total se cuenta después
+    with QueryCounter() as counter:
+        tab.filter_data()
+    assert counter.count == 1
+    assert model.rowCount() == PAGE_SIZE
+
+    for esperado in (PAGE_SIZE * 2, PAGE_SIZE * 2 + 10):
+        with QueryCounter() as counter:
+            model.fetchMore()
+        assert counter.count == 1
+        assert model.rowCount() == esperado
+    assert not model.canFetchMore()
+
+    # El conteo termina en su hilo y actualiza el estado
+    esperado = f"Se encontraron {PAGE_SIZE * 2 + 10} registros."
+    for _ in range(500):
+        app.processEvents()
+        if tab.status_label.text() == esperado:
+            break
+        time.sleep(0.01)
+    assert tab.status_label.text() == esperado
+
+
+def test_delete_refuses_stale_selection(app, datos, add_registros, monkeypatch):
+    from PySide6.QtCore import QItemSelectionModel
+    from PySide6.QtWidgets import QMessageBox
+    from ui.visualizacion_tab import VisualizacionTab
+
+    add_registros({}, {"hora_entrada": datetime.time(10, 0), "hora_salida": datetime.time(11, 0)})
+    tab = VisualizacionTab()
+    app.processEvents()
+    tab.filter_data()
+
+    avisos = []
+    monkeypatch.setattr(QMessageBox, "warning", lambda *args: avisos.append(args[1]))
+    monkeypatch.setattr(QMessageBox, "question", lambda *args: pytest.fail("no debe pedir confirmación"))
+    # La segunda fila desaparece de la página vuelta a leer
+    monkeypatch.setattr(tab.results_model, "registro_id", lambda row: None if row == 1 else 1)
+
+    selection = tab.results_table.selectionModel()
+    for row in (0, 1):
+        selection.select(tab.results_model.index(row, 0), QItemSelectionModel.Select | QItemSelectionModel.Rows)
+    tab.delete_selected_records()
+
+    assert avisos == ["Selección desactualizada"]
+    with session_scope() as db:
+        assert db.query(RegistroUso).count() == 2
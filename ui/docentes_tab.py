@@ -5,12 +5,14 @@ from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QFormLayout,
 from PySide6.QtCore import Qt
 from PySide6.QtGui import QFont, QIcon
 
-from database.database import get_db
-from database.models import Docente, Carrera, Laboratorio
+from database.catalog import catalog
+from database.database import session_scope
+from database.models import Docente, Laboratorio
 
 class DocentesTab(QWidget):
-    def __init__(self):
+    def __init__(self, main_window=None):
         super().__init__()
+        self.main_window = main_window
         self.setup_ui()
         self.load_data()
         
@@ -260,92 +262,10 @@ class DocentesTab(QWidget):
         
     def load_data(self):
         """Carga los datos iniciales en los combos"""
-        db = get_db()
-        
-        # Cargar carreras
-        carreras = db.query(Carrera).all()
-        for carrera in carreras:
-            self.carrera_combo.addItem(carrera.nombre, carrera.id)
-            
-        # Si no hay carreras, cargar datos iniciales
-        if not carreras:
-            self.load_initial_data()
-        else:
-            # Asegurar que todas las carreras tengan los 4 laboratorios
-            self.verify_laboratories()
-    
-    def load_initial_data(self):
-        """Carga los datos iniciales en la base de datos"""
-        db = get_db()
-        
-        # Crear carreras
-        carreras = [
-            Carrera(nombre="Mecánica"),
-            Carrera(nombre="Industrial"),
-            Carrera(nombre="Automotriz"),
-            Carrera(nombre="Mantenimiento Industrial")
-        ]
-        db.add_all(carreras)
-        db.commit()
-        
-        # Obtener las carreras con sus IDs asignados
-        carreras_db = db.query(Carrera).all()
-        
-        # Crear los cuatro laboratorios para cada carrera
-        laboratorios = []
-        for carrera in carreras_db:
-            laboratorios.extend([
-                Laboratorio(nombre="Resistencia de Materiales", carrera_id=carrera.id),
-                Laboratorio(nombre="Turbomaquinaria e Hidráulica", carrera_id=carrera.id),
-                Laboratorio(nombre="Metrología", carrera_id=carrera.id),
-                Laboratorio(nombre="Instrumentación y Control", carrera_id=carrera.id)
-            ])
-        
-        db.add_all(laboratorios)
-        db.commit()
-        
-        # Recargar datos
-        self.carrera_combo.clear()
-        carreras = db.query(Carrera).all()
-        for carrera in carreras:
+        # Las carreras y laboratorios iniciales se crean al arrancar (ensure_initial_catalog)
+        for carrera in catalog.carreras():
             self.carrera_combo.addItem(carrera.nombre, carrera.id)
     
-    def verify_laboratories(self):
-        """Verifica que todas las carreras tengan los 4 laboratorios y los añade si faltan"""
-        db = get_db()
-        
-        # Nombres de los laboratorios que deben existir para cada carrera
-        lab_names = [
-            "Resistencia de Materiales", 
-            "Turbomaquinaria e Hidráulica", 
-            "Metrología", 
-            "Instrumentación y Control"
-        ]
-        
-        # Verificar para cada carrera
-        carreras = db.query(Carrera).all()
-        for carrera in carreras:
-            # Obtener laboratorios existentes para esta carrera
-            existing_labs = db.query(Laboratorio).filter(
-                Laboratorio.carrera_id == carrera.id
-            ).all()
-            
-            # Verificar qué laboratorios faltan
-            existing_names = [lab.nombre for lab in existing_labs]
-            
-            # Añadir los laboratorios que faltan
-            labs_to_add = []
-            for lab_name in lab_names:
-                if lab_name not in existing_names:
-                    labs_to_add.append(
-                        Laboratorio(nombre=lab_name, carrera_id=carrera.id)
-                    )
-                    
-            if labs_to_add:
-                db.add_all(labs_to_add)
-                db.commit()
-                print(f"Se añadieron {len(labs_to_add)} laboratorios nuevos a la carrera {carrera.nombre}")
-    
     def update_laboratorios(self):
         """Actualiza la lista de laboratorios según la carrera seleccionada"""
         self.lab_combo.clear()
@@ -354,10 +274,7 @@ class DocentesTab(QWidget):
         if not carrera_id:
             return
             
-        db = get_db()
-        labs = db.query(Laboratorio).filter(Laboratorio.carrera_id == carrera_id).all()
-        
-        for lab in labs:
+        for lab in catalog.laboratorios(carrera_id):
             self.lab_combo.addItem(lab.nombre, lab.id)
     
     def add_laboratorio(self):
@@ -395,26 +312,29 @@ class DocentesTab(QWidget):
             return
         
         # Crear docente
-        db = get_db()
-        nuevo_docente = Docente(
-            nombre=nombre,
-            apellido=apellido,
-            carrera_id=carrera_id
-        )
-        db.add(nuevo_docente)
-        db.commit()
-        
-        # Asignar laboratorios
-        for i in range(self.lab_list.count()):
-            lab_id = self.lab_list.item(i).data(Qt.UserRole)
-            lab = db.query(Laboratorio).get(lab_id)
-            nuevo_docente.laboratorios.append(lab)
-        
-        db.commit()
+        with session_scope() as db:
+            nuevo_docente = Docente(
+                nombre=nombre,
+                apellido=apellido,
+                carrera_id=carrera_id
+            )
+            db.add(nuevo_docente)
+            
+            # Asignar laboratorios
+            for i in range(self.lab_list.count()):
+                lab_id = self.lab_list.item(i).data(Qt.UserRole)
+                lab = db.get(Laboratorio, lab_id)
+                nuevo_docente.laboratorios.append(lab)
+        
+        # Emitir señal para actualizar los docentes en otras pestañas
+        if self.main_window and hasattr(self.main_window, "refresh_docentes_signal"):
+            self.main_window.refresh_docentes_signal.emit()
+        else:
+            catalog.invalidate()
         
         QMessageBox.information(self, "Éxito", f"Docente {nombre} {apellido} guardado correctamente.")
         self.clear_form()
-        
+            
     def clear_form(self):
         """Limpia el formulario"""
         self.nombre_input.clear()
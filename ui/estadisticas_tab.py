@@ -0,0 +1,123 @@
+from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QFormLayout,
+                              QLabel, QComboBox, QPushButton, QTableWidget,
+                              QTableWidgetItem, QHeaderView, QMessageBox)
+from PySide6.QtCore import Qt
+
+from database.database import session_scope
+from database.catalog import catalog
+from database.analytics import DIMENSIONES, usage_stats, total_stats
+
+
+class EstadisticasTab(QWidget):
+    """Estadísticas de uso y ocupación: horas, sesiones y duración promedio"""
+
+    HEADERS = ["Nombre", "Horas ocupadas", "Sesiones", "Promedio por sesión (min)"]
+
+    def __init__(self):
+        super().__init__()
+        self.setup_ui()
+        self.load_data()
+
+    def setup_ui(self):
+        # Layout principal
+        main_layout = QVBoxLayout(self)
+        main_layout.setContentsMargins(20, 20, 20, 20)
+
+        # Título del módulo
+        title_label = QLabel("Estadísticas de Uso")
+        title_label.setStyleSheet("font-size: 18pt; font-weight: bold;")
+        main_layout.addWidget(title_label)
+
+        # Agrupación y filtros
+        filter_layout = QHBoxLayout()
+
+        dimension_form = QFormLayout()
+        self.dimension_combo = QComboBox()
+        for dimension, titulo in DIMENSIONES:
+            self.dimension_combo.addItem(titulo, dimension)
+        dimension_form.addRow("Agrupar por:", self.dimension_combo)
+        filter_layout.addLayout(dimension_form)
+
+        periodo_form = QFormLayout()
+        self.periodo_combo = QComboBox()
+        self.periodo_combo.addItem("-- Todos --", None)
+        periodo_form.addRow("Período:", self.periodo_combo)
+        filter_layout.addLayout(periodo_form)
+
+        carrera_form = QFormLayout()
+        self.carrera_combo = QComboBox()
+        self.carrera_combo.addItem("-- Todas --", None)
+        carrera_form.addRow("Carrera:", self.carrera_combo)
+        filter_layout.addLayout(carrera_form)
+
+        self.calculate_btn = QPushButton("Calcular")
+        self.calculate_btn.clicked.connect(self.calculate)
+        filter_layout.addWidget(self.calculate_btn, alignment=Qt.AlignBottom)
+
+        main_layout.addLayout(filter_layout)
+
+        # Totales del cálculo
+        self.total_label = QLabel("")
+        self.total_label.setStyleSheet("font-size: 12pt; font-style: italic;")
+        main_layout.addWidget(self.total_label)
+
+        # Tabla de resultados
+        self.stats_table = QTableWidget(0, len(self.HEADERS))
+        self.stats_table.setHorizontalHeaderLabels(self.HEADERS)
+        self.stats_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.stats_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        main_layout.addWidget(self.stats_table)
+
+    def load_data(self):
+        """Carga los combos desde la caché de catálogos y calcula las estadísticas"""
+        self.load_periodos()
+
+        self.carrera_combo.clear()
+        self.carrera_combo.addItem("-- Todas --", None)
+        for carrera in catalog.carreras():
+            self.carrera_combo.addItem(carrera.nombre, carrera.id)
+
+        self.calculate()
+
+    def load_periodos(self):
+        """Carga los períodos académicos en el combo conservando la selección"""
+        selected_id = self.periodo_combo.currentData()
+
+        self.periodo_combo.clear()
+        self.periodo_combo.addItem("-- Todos --", None)
+        for periodo in catalog.periodos():
+            self.periodo_combo.addItem(periodo.nombre, periodo.id)
+
+        if selected_id:
+            index = self.periodo_combo.findData(selected_id)
+            if index >= 0:
+                self.periodo_combo.setCurrentIndex(index)
+
+    def calculate(self):
+        """Calcula las estadísticas de la agrupación y filtros seleccionados"""
+        try:
+            with session_scope() as db:
+                stats = usage_stats(
+                    db,
+                    self.dimension_combo.currentData(),
+                    carrera_id=self.carrera_combo.currentData(),
+                    periodo_id=self.periodo_combo.currentData()
+                )
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Error al calcular las estadísticas: {str(e)}")
+            return
+
+        self.stats_table.setRowCount(len(stats))
+        for i, stat in enumerate(stats):
+            valores = [stat.nombre, f"{stat.horas:.1f}", str(stat.sesiones), f"{stat.promedio_minutos:.0f}"]
+            for j, valor in enumerate(valores):
+                item = QTableWidgetItem(valor)
+                if j > 0:
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.stats_table.setItem(i, j, item)
+
+        total = total_stats(stats)
+        texto = f"Total: {total.horas:.1f} horas en {total.sesiones} sesiones"
+        if total.sesiones:
+            texto += f" (promedio {total.promedio_minutos:.0f} min por sesión)"
+        self.total_label.setText(texto)
@@ -0,0 +1,121 @@
+import math
+from functools import lru_cache
+
+from PySide6.QtCore import Qt, QRect
+from PySide6.QtGui import QImage, QPainter, QPalette
+from PySide6.QtWidgets import QWidget, QToolTip
+
+
+@lru_cache(maxsize=None)
+def _color_table(pasos=256):
+    """Tabla de colores de 0 (gris oscuro) a 1 (rojo intenso) como arreglo (pasos, 3)"""
+    import numpy as np
+
+    t = np.linspace(0.0, 1.0, pasos)[:, np.newaxis]
+    inicio = np.array([42, 42, 42], dtype=np.float64)   # Fondo de las tablas
+    fin = np.array([255, 40, 40], dtype=np.float64)
+    return (inicio + (fin - inicio) * t).astype(np.uint8)
+
+
+def matrix_to_image(matriz):
+    """Convierte una matriz de valores no negativos en una QImage de un píxel por celda
+
+    La escala va de 0 al máximo de la matriz (el color más intenso). El color de cada
+    celda se obtiene indexando la tabla de colores con toda la matriz a la vez, sin
+    recorrer las celdas en Python.
+    """
+    # NumPy se importa al dibujar la primera matriz, no al abrir la pestaña
+    import numpy as np
+
+    colores = _color_table()
+    maximo = matriz.max() if matriz.size else 0
+    escala = matriz / maximo if maximo > 0 else np.zeros_like(matriz, dtype=np.float64)
+    indices = np.clip(np.rint(escala * (len(colores) - 1)), 0, len(colores) - 1).astype(np.intp)
+    rgb = np.ascontiguousarray(colores[indices])
+    alto, ancho = matriz.shape
+    imagen = QImage(rgb.data, ancho, alto, ancho * 3, QImage.Format_RGB888)
+    # QImage no copia el búfer: copiarla para que no dependa del arreglo temporal
+    return imagen.copy()
+
+
+class HeatmapWidget(QWidget):
+    """Mapa de calor de una matriz (filas x columnas) con sus etiquetas
+
+    La matriz se dibuja como una imagen de un píxel por celda escalada al área del
+    widget; las celdas no son widgets ni se pintan una por una.
+    """
+
+    MARGEN_IZQUIERDO = 90
+    MARGEN_SUPERIOR = 22
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setMouseTracking(True)
+        self.setMinimumHeight(180)
+        self._imagen = None
+        self._matriz = None
+        self._filas = []
+        self._columnas = []
+        self._tooltip = None
+
+    def set_matrix(self, matriz, filas, columnas, tooltip=None):
+        """Muestra la matriz con las etiquetas de filas y columnas
+
+        tooltip(fila, columna) devuelve el texto de ayuda de una celda.
+        """
+        self._matriz = matriz
+        self._imagen = matrix_to_image(matriz)
+        self._filas = filas
+        self._columnas = columnas
+        self._tooltip = tooltip
+        self.update()
+
+    def clear(self):
+        self._matriz = None
+        self._imagen = None
+        self.update()
+
+    def _grid_rect(self):
+        return QRect(self.MARGEN_IZQUIERDO, self.MARGEN_SUPERIOR,
+                     max(1, self.width() - self.MARGEN_IZQUIERDO - 10),
+                     max(1, self.height() - self.MARGEN_SUPERIOR - 5))
+
+    def paintEvent(self, event):
+        if self._imagen is None:
+            return
+
+        painter = QPainter(self)
+        area = self._grid_rect()
+        alto, ancho = self._matriz.shape
+
+        # La imagen se escala sin suavizado para que cada celda quede como un bloque
+        painter.drawImage(area, self._imagen)
+
+        painter.setPen(self.palette().color(QPalette.WindowText))
+        alto_fila = area.height() / alto
+        for i, etiqueta in enumerate(self._filas):
+            y = area.top() + int(i * alto_fila)
+            painter.drawText(QRect(0, y, self.MARGEN_IZQUIERDO - 6, int(alto_fila)),
+                             Qt.AlignRight | Qt.AlignVCenter, etiqueta)
+
+        # Mostrar solo las etiquetas de columna que caben sin encimarse
+        ancho_columna = area.width() / ancho
+        paso = max(1, math.ceil(40 / ancho_columna))
+        for j in range(0, ancho, paso):
+            x = area.left() + int(j * ancho_columna)
+            painter.drawText(QRect(x, 0, int(ancho_columna * paso), self.MARGEN_SUPERIOR),
+                             Qt.AlignLeft | Qt.AlignVCenter, self._columnas[j])
+        painter.end()
+
+    def mouseMoveEvent(self, event):
+        if self._matriz is None or self._tooltip is None:
+            return
+        area = self._grid_rect()
+        pos = event.position().toPoint()
+        if not area.contains(pos):
+            QToolTip.hideText()
+            return
+        alto, ancho = self._matriz.shape
+        fila = min(alto - 1, int((pos.y() - area.top()) * alto / area.height()))
+        columna = min(ancho - 1, int((pos.x() - area.left()) * ancho / area.width()))
+        QToolTip.showText(event.globalPosition().toPoint(), self._tooltip(fila, columna), self)
@@ -2,14 +2,21 @@ from PySide6.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QTabWidget, QAp
 from PySide6.QtCore import Qt, Signal
 from PySide6.QtGui import QPalette, QColor
 
-from .docentes_tab import DocentesTab
-from .periodos_tab import PeriodosTab
-from .registros_tab import RegistrosTab
-from .visualizacion_tab import VisualizacionTab
+from database.catalog import catalog
 
 class MainWindow(QMainWindow):
     # Añadir esta señal para comunicar entre pestañas
     refresh_periodos_signal = Signal()
+    refresh_docentes_signal = Signal()
+    
+    # Pestañas en orden: (atributo, título)
+    TABS = [
+        ("periodos_tab", "Períodos Académicos"),
+        ("docentes_tab", "Gestión de Docentes"),
+        ("registros_tab", "Registro de Uso"),
+        ("visualizacion_tab", "Visualización"),
+        ("estadisticas_tab", "Estadísticas"),
+    ]
     
     def __init__(self):
         super().__init__()
@@ -34,18 +41,14 @@ class MainWindow(QMainWindow):
         
         # Conectar la señal a la actualización de períodos
         self.refresh_periodos_signal.connect(self.update_periodos_in_tabs)
+        self.refresh_docentes_signal.connect(self.update_docentes_in_tabs)
         
-        # Añadir las pestañas para cada módulo - CAMBIO DE ORDEN
-        self.periodos_tab = PeriodosTab(self)
-        self.docentes_tab = DocentesTab()
-        self.registros_tab = RegistrosTab()
-        self.visualizacion_tab = VisualizacionTab()
-        
-        # Añadir pestañas en el nuevo orden
-        self.tab_widget.addTab(self.periodos_tab, "Períodos Académicos")
-        self.tab_widget.addTab(self.docentes_tab, "Gestión de Docentes")
-        self.tab_widget.addTab(self.registros_tab, "Registro de Uso")
-        self.tab_widget.addTab(self.visualizacion_tab, "Visualización")
+        # Añadir las pestañas en el nuevo orden; cada una se construye la primera vez
+        # que se activa, así que al inicio solo se crea la pestaña visible
+        for attr, title in self.TABS:
+            self.tab_widget.addTab(QWidget(), title)
+        self.tab_widget.currentChanged.connect(self.ensure_tab)
+        self.ensure_tab(self.tab_widget.currentIndex())
         
         # Estilo específico para las pestañas
         self.tab_widget.setStyleSheet("""
@@ -65,6 +68,50 @@ class MainWindow(QMainWindow):
             }
         """)
     
+    def create_tab(self, attr):
+        """Construye la pestaña correspondiente al atributo indicado
+
+        Los módulos de las pestañas se importan aquí para que su costo de carga (y el
+        de sus dependencias) se pague al abrir la pestaña y no al arrancar.
+        """
+        if attr == "periodos_tab":
+            from .periodos_tab import PeriodosTab
+            return PeriodosTab(self)
+        if attr == "docentes_tab":
+            from .docentes_tab import DocentesTab
+            return DocentesTab(self)
+        if attr == "registros_tab":
+            from .registros_tab import RegistrosTab
+            return RegistrosTab()
+        if attr == "visualizacion_tab":
+            from .visualizacion_tab import VisualizacionTab
+            return VisualizacionTab()
+        from .estadisticas_tab import EstadisticasTab
+        return EstadisticasTab()
+    
+    def ensure_tab(self, index):
+        """Construye la pestaña del índice dado si aún no existe y la devuelve"""
+        if index < 0:
+            return None
+        
+        attr, title = self.TABS[index]
+        if hasattr(self, attr):
+            return getattr(self, attr)
+        
+        tab = self.create_tab(attr)
+        setattr(self, attr, tab)
+        
+        # Reemplazar el marcador de posición sin disparar otra vez currentChanged
+        current = self.tab_widget.currentIndex()
+        placeholder = self.tab_widget.widget(index)
+        self.tab_widget.blockSignals(True)
+        self.tab_widget.removeTab(index)
+        self.tab_widget.insertTab(index, tab, title)
+        self.tab_widget.setCurrentIndex(current)
+        self.tab_widget.blockSignals(False)
+        placeholder.deleteLater()
+        return tab
+    
     def apply_styles(self):
         """Aplica un tema de colores rojo y negro a toda la aplicación"""
         # Crear una paleta personalizada para la aplicación
@@ -175,6 +222,9 @@ class MainWindow(QMainWindow):
     
     def update_periodos_in_tabs(self):
         """Actualiza los períodos académicos en todas las pestañas que los usan"""
+        # Descartar la caché de catálogos para que las pestañas lean el período nuevo
+        catalog.invalidate()
+        
         # Actualizar en la pestaña de Registro
         if hasattr(self, "registros_tab"):
             self.registros_tab.load_periodos()
@@ -182,4 +232,18 @@ class MainWindow(QMainWindow):
         # Actualizar en la pestaña de Visualización si es necesario
         if hasattr(self, "visualizacion_tab"):
             if hasattr(self.visualizacion_tab, "load_periodos"):
-                self.visualizacion_tab.load_periodos() 
\ No newline at end of file
+                self.visualizacion_tab.load_periodos()
+        
+        if hasattr(self, "estadisticas_tab"):
+            self.estadisticas_tab.load_periodos()
+    
+    def update_docentes_in_tabs(self):
+        """Actualiza los docentes en todas las pestañas que los usan"""
+        catalog.invalidate()
+        
+        if hasattr(self, "registros_tab"):
+            self.registros_tab.update_docentes()
+            self.registros_tab.csv_update_docentes()
+        
+        if hasattr(self, "visualizacion_tab"):
+            self.visualizacion_tab.load_docentes()
@@ -3,7 +3,8 @@ from PySide6.QtWidgets import (QWidget, QVBoxLayout, QFormLayout, QHBoxLayout,
                               QMessageBox, QDateEdit, QFrame)
 from PySide6.QtCore import Qt, QDate
 
-from database.database import get_db
+from database.catalog import catalog
+from database.database import session_scope
 from database.models import Periodo
 
 class PeriodosTab(QWidget):
@@ -136,20 +137,20 @@ class PeriodosTab(QWidget):
             return
         
         # Guardar en la base de datos
-        db = get_db()
-        nuevo_periodo = Periodo(
-            nombre=nombre,
-            fecha_inicio=fecha_inicio,
-            fecha_fin=fecha_fin
-        )
-        db.add(nuevo_periodo)
-        db.commit()
+        with session_scope() as db:
+            nuevo_periodo = Periodo(
+                nombre=nombre,
+                fecha_inicio=fecha_inicio,
+                fecha_fin=fecha_fin
+            )
+            db.add(nuevo_periodo)
         
         # Emitir señal para actualizar otros componentes
         if self.main_window and hasattr(self.main_window, "refresh_periodos_signal"):
             self.main_window.refresh_periodos_signal.emit()
             print("Señal de actualización emitida")
         else:
+            catalog.invalidate()
             print("No se pudo emitir la señal de actualización")
         
         QMessageBox.information(self, "Éxito", "Período académico guardado correctamente.")
@@ -0,0 +1,132 @@
+from collections import OrderedDict
+
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+
+class RegistrosTableModel(QAbstractTableModel):
+    """Modelo de tabla que obtiene los registros de uso por páginas bajo demanda
+
+    Solo se guardan en memoria las últimas MAX_PAGES páginas consultadas; de las
+    demás se conserva el cursor con el que empiezan, así que al volver a ellas se
+    leen de nuevo con una consulta por cursor y la memoria no crece al recorrer
+    todo el resultado.
+    """
+
+    HEADERS = ["Docente", "Actividad", "Hora Entrada", "Hora Salida", "Fecha"]
+    PAGE_SIZE = 200
+    MAX_PAGES = 20
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # Páginas en memoria: índice de página -> lista de tuplas
+        # (id, docente, actividad, hora_entrada, hora_salida, fecha)
+        self._pages = OrderedDict()
+        # Cursor con el que se obtiene cada página ya descubierta, más el de la siguiente
+        self._page_cursors = [None]
+        self._row_count = 0
+        self._page_fetcher = None
+        self._has_more = False
+
+    def set_page_fetcher(self, page_fetcher):
+        """Reinicia el modelo con una nueva función de obtención de páginas
+
+        page_fetcher(cursor, limit) debe devolver (filas, siguiente_cursor). El
+        cursor inicial es None y un siguiente_cursor None indica el final.
+        """
+        self.beginResetModel()
+        self._pages = OrderedDict()
+        self._page_cursors = [None]
+        self._row_count = 0
+        self._page_fetcher = page_fetcher
+        self._has_more = page_fetcher is not None
+        self.endResetModel()
+
+        # Cargar la primera página para el primer pintado
+        if self._has_more:
+            self.fetchMore(QModelIndex())
+
+    def clear(self):
+        """Vacía el modelo"""
+        self.set_page_fetcher(None)
+
+    def _store_page(self, page, rows):
+        self._pages[page] = rows
+        self._pages.move_to_end(page)
+        while len(self._pages) > self.MAX_PAGES:
+            self._pages.popitem(last=False)
+
+    def _page(self, page):
+        """Filas de una página ya descubierta, leyéndola de nuevo si se había descartado"""
+        rows = self._pages.get(page)
+        if rows is None:
+            rows, _ = self._page_fetcher(self._page_cursors[page], self.PAGE_SIZE)
+            self._store_page(page, rows)
+        else:
+            self._pages.move_to_end(page)
+        return rows
+
+    def _row(self, row):
+        page, offset = divmod(row, self.PAGE_SIZE)
+        rows = self._page(page)
+        # Si la página cambió desde que se leyó (registros eliminados) puede ser más corta
+        return rows[offset] if offset < len(rows) else None
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return self._row_count
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.HEADERS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role != Qt.DisplayRole:
+            return None
+        row = self._row(index.row())
+        # La columna 0 de la tupla es el ID del registro
+        return row[index.column() + 1] if row else None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return section + 1
+
+    def canFetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return False
+        return self._has_more
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or not self._has_more:
+            return
+
+        page = len(self._page_cursors) - 1
+        rows, next_cursor = self._page_fetcher(self._page_cursors[page], self.PAGE_SIZE)
+        self._has_more = next_cursor is not None and len(rows) == self.PAGE_SIZE
+
+        if not rows:
+            return
+
+        if self._has_more:
+            self._page_cursors.append(next_cursor)
+        self._store_page(page, rows)
+
+        first = self._row_count
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        self._row_count += len(rows)
+        self.endInsertRows()
+
+    def registro_id(self, row):
+        """Devuelve el ID del registro mostrado en la fila indicada
+
+        Devuelve None si la fila ya no existe: al volver a leer una página descartada
+        puede llegar más corta si se eliminaron registros desde que se mostró.
+        """
+        if 0 <= row < self._row_count:
+            registro = self._row(row)
+            return registro[0] if registro else None
+        return None
@@ -2,15 +2,20 @@ from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QFormLayout,
                               QLabel, QLineEdit, QComboBox, QPushButton,
                               QDateEdit, QTimeEdit, QMessageBox, QFrame,
                               QScrollArea, QGridLayout, QSizePolicy, QTabWidget,
-                              QFileDialog, QTableWidget, QTableWidgetItem, QHeaderView)
+                              QFileDialog, QTableWidget, QTableWidgetItem, QHeaderView,
+                              QProgressBar, QCheckBox)
 from PySide6.QtCore import Qt, QDate, QTime
 from PySide6.QtGui import QFont
 
 import csv
-import datetime
 
-from database.database import get_db
-from database.models import Docente, Carrera, Laboratorio, Periodo, RegistroUso
+from database.database import session_scope
+from database.catalog import catalog
+from database.models import RegistroUso
+from database.queries import find_overlaps
+from database.occupancy import utilization_cache
+from utils.intervals import minutes_to_text
+from .workers import CsvImportWorker, start_worker
 
 class RegistrosTab(QWidget):
     def __init__(self):
@@ -24,6 +29,8 @@ class RegistrosTab(QWidget):
         self.csv_file_path = None
         self.preview_table = None
         self.selected_file_label = None
+        self.import_worker = None
+        self.import_thread = None
         
         self.setup_ui()
         self.load_data()
@@ -366,11 +373,8 @@ class RegistrosTab(QWidget):
         
     def load_data(self):
         """Carga los datos iniciales en los selectores"""
-        db = get_db()
-        
-        # Cargar carreras en ambas pestañas
-        carreras = db.query(Carrera).all()
-        for carrera in carreras:
+        # Cargar carreras en ambas pestañas (desde la caché de catálogos)
+        for carrera in catalog.carreras():
             self.carrera_combo.addItem(carrera.nombre, carrera.id)
             if self.csv_carrera_combo:
                 self.csv_carrera_combo.addItem(carrera.nombre, carrera.id)
@@ -397,9 +401,7 @@ class RegistrosTab(QWidget):
         if self.csv_periodo_combo:
             self.csv_periodo_combo.clear()
         
-        db = get_db()
-        periodos = db.query(Periodo).all()
-        for periodo in periodos:
+        for periodo in catalog.periodos():
             self.periodo_combo.addItem(periodo.nombre, periodo.id)
             if self.csv_periodo_combo:
                 self.csv_periodo_combo.addItem(periodo.nombre, periodo.id)
@@ -419,10 +421,7 @@ class RegistrosTab(QWidget):
         if not carrera_id:
             return
             
-        db = get_db()
-        labs = db.query(Laboratorio).filter(Laboratorio.carrera_id == carrera_id).all()
-        
-        for lab in labs:
+        for lab in catalog.laboratorios(carrera_id):
             self.lab_combo.addItem(lab.nombre, lab.id)
     
     def update_docentes(self):
@@ -435,16 +434,9 @@ class RegistrosTab(QWidget):
         if not carrera_id or not lab_id:
             return
             
-        db = get_db()
-        
         try:
-            # Consulta mejorada para obtener docentes que pertenecen a la carrera 
-            # y tienen asignado el laboratorio seleccionado
-            docentes = db.query(Docente)\
-                .filter(Docente.carrera_id == carrera_id)\
-                .join(Docente.laboratorios)\
-                .filter(Laboratorio.id == lab_id)\
-                .all()
+            # Docentes que pertenecen a la carrera y tienen asignado el laboratorio seleccionado
+            docentes = catalog.docentes(carrera_id=carrera_id, laboratorio_id=lab_id)
             
             # Mostrar mensaje si no hay docentes asignados
             if not docentes:
@@ -479,8 +471,7 @@ class RegistrosTab(QWidget):
                 return
                 
             # NUEVA VALIDACIÓN: Verificar que la fecha está dentro del período académico
-            db = get_db()
-            periodo = db.query(Periodo).get(periodo_id)
+            periodo = catalog.periodo(periodo_id)
             if periodo and (fecha < periodo.fecha_inicio or fecha > periodo.fecha_fin):
                 QMessageBox.warning(self, "Fecha inválida", 
                                    f"La fecha seleccionada ({fecha.strftime('%d/%m/%Y')}) no está dentro del período académico "
@@ -507,20 +498,32 @@ class RegistrosTab(QWidget):
                 QMessageBox.warning(self, "Horario inválido", "La hora de entrada debe ser anterior a la hora de salida.")
                 return
             
-            # Guardar en la base de datos
-            db = get_db()
-            nuevo_registro = RegistroUso(
-                fecha=fecha,
-                hora_entrada=hora_entrada,
-                hora_salida=hora_salida,
-                actividad=actividad,
-                docente_id=docente_id,
-                laboratorio_id=lab_id,
-                periodo_id=periodo_id
-            )
-            db.add(nuevo_registro)
-            db.commit()
+            # La sesión solo cubre la verificación de traslapes y la inserción; los
+            # diálogos se muestran después de cerrarla para no retener la transacción
+            with session_scope() as db:
+                # Verificar que el laboratorio no esté ocupado en ese horario
+                conflictos = find_overlaps(db, lab_id, fecha, hora_entrada, hora_salida)
+                if not conflictos:
+                    # Guardar en la base de datos
+                    nuevo_registro = RegistroUso(
+                        fecha=fecha,
+                        hora_entrada=hora_entrada,
+                        hora_salida=hora_salida,
+                        actividad=actividad,
+                        docente_id=docente_id,
+                        laboratorio_id=lab_id,
+                        periodo_id=periodo_id
+                    )
+                    db.add(nuevo_registro)
+            
+            if conflictos:
+                horarios = ", ".join(f"{minutes_to_text(inicio)}-{minutes_to_text(fin)}" for inicio, fin, _ in conflictos)
+                QMessageBox.warning(self, "Laboratorio ocupado", 
+                                   f"El laboratorio ya tiene registros el {fecha.strftime('%d/%m/%Y')} "
+                                   f"que se traslapan con el horario seleccionado: {horarios}.")
+                return
             
+            utilization_cache.invalidate()
             QMessageBox.information(self, "Éxito", "Registro guardado correctamente.")
             self.clear_form()
             
@@ -741,12 +744,74 @@ class RegistrosTab(QWidget):
         
         import_layout.addLayout(buttons_layout)
         
+        # Importación idempotente: no volver a insertar registros ya existentes
+        self.skip_duplicates_check = QCheckBox("Omitir registros duplicados del período")
+        self.skip_duplicates_check.setStyleSheet("font-size: 12pt; color: #ddd; margin-top: 10px;")
+        self.skip_duplicates_check.setChecked(True)
+        import_layout.addWidget(self.skip_duplicates_check)
+        
+        # Validar que el laboratorio no esté ocupado en el horario de cada fila
+        self.reject_overlaps_check = QCheckBox("Rechazar registros que se traslapan con otros del laboratorio")
+        self.reject_overlaps_check.setStyleSheet("font-size: 12pt; color: #ddd;")
+        self.reject_overlaps_check.setChecked(True)
+        import_layout.addWidget(self.reject_overlaps_check)
+        
         # Etiqueta de archivo seleccionado
         self.selected_file_label = QLabel("Ningún archivo seleccionado")
         self.selected_file_label.setStyleSheet("font-size: 12pt; color: #aaa; margin-top: 10px;")
         self.selected_file_label.setAlignment(Qt.AlignCenter)
         import_layout.addWidget(self.selected_file_label)
         
+        # Progreso de la importación (visible solo mientras se importa)
+        progress_layout = QHBoxLayout()
+        progress_layout.setSpacing(20)
+        
+        self.import_progress = QProgressBar()
+        self.import_progress.setStyleSheet("""
+            QProgressBar {
+                background-color: #3a3a3a;
+                color: white;
+                border: 1px solid #555;
+                border-radius: 8px;
+                text-align: center;
+                font-size: 12pt;
+                min-height: 30px;
+            }
+            QProgressBar::chunk {
+                background-color: #C00;
+                border-radius: 8px;
+            }
+        """)
+        progress_layout.addWidget(self.import_progress, 4)
+        
+        self.cancel_import_btn = QPushButton("Cancelar")
+        self.cancel_import_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #444;
+                color: white;
+                border-radius: 8px;
+                padding: 8px 20px;
+                font-size: 12pt;
+                border: 1px solid #555;
+            }
+            QPushButton:hover {
+                background-color: #555;
+            }
+        """)
+        self.cancel_import_btn.clicked.connect(self.cancel_import)
+        progress_layout.addWidget(self.cancel_import_btn, 1)
+        
+        import_layout.addLayout(progress_layout)
+        
+        self.import_status_label = QLabel("")
+        self.import_status_label.setStyleSheet("font-size: 12pt; color: #ddd;")
+        self.import_status_label.setAlignment(Qt.AlignCenter)
+        import_layout.addWidget(self.import_status_label)
+        
+        self.import_progress.setVisible(False)
+        self.cancel_import_btn.setVisible(False)
+        self.import_status_label.setVisible(False)
+        
         info_layout.addWidget(import_frame)
         
         # Vista previa de datos
@@ -813,31 +878,21 @@ class RegistrosTab(QWidget):
             
         self.csv_lab_combo.clear()
         
-        session = get_db()
-        try:
-            carrera_id = self.csv_carrera_combo.currentData()
-            if carrera_id:
-                laboratorios = session.query(Laboratorio).filter_by(carrera_id=carrera_id).all()
-                for lab in laboratorios:
-                    self.csv_lab_combo.addItem(lab.nombre, lab.id)
-        finally:
-            session.close()
-            
+        carrera_id = self.csv_carrera_combo.currentData()
+        if carrera_id:
+            for lab in catalog.laboratorios(carrera_id):
+                self.csv_lab_combo.addItem(lab.nombre, lab.id)
+                
     def csv_update_docentes(self):
         if not self.csv_docente_combo or not self.csv_carrera_combo:
             return
             
         self.csv_docente_combo.clear()
         
-        session = get_db()
-        try:
-            carrera_id = self.csv_carrera_combo.currentData()
-            if carrera_id:
-                docentes = session.query(Docente).filter_by(carrera_id=carrera_id).all()
-                for docente in docentes:
-                    self.csv_docente_combo.addItem(f"{docente.nombre} {docente.apellido}", docente.id)
-        finally:
-            session.close()
+        carrera_id = self.csv_carrera_combo.currentData()
+        if carrera_id:
+            for docente in catalog.docentes(carrera_id=carrera_id):
+                self.csv_docente_combo.addItem(f"{docente.nombre} {docente.apellido}", docente.id)
 
     def select_csv_file(self):
         file_dialog = QFileDialog()
@@ -899,65 +954,84 @@ class RegistrosTab(QWidget):
             QMessageBox.warning(self, "Datos incompletos", "Por favor seleccione período, laboratorio y docente.")
             return
         
-        try:
-            total_importados = 0
-            with open(self.csv_file_path, 'r', encoding='utf-8') as csv_file:
-                csv_reader = csv.reader(csv_file)
-                next(csv_reader)  # Saltar encabezado
-                
-                session = get_db()
-                try:
-                    for row in csv_reader:
-                        if len(row) < 4:  # Verificar que haya suficientes columnas
-                            continue
-                        
-                        actividad, fecha_str, hora_entrada_str, hora_salida_str = row
-                        
-                        # Convertir fecha (formato esperado: DD/MM/YYYY)
-                        try:
-                            fecha_obj = datetime.datetime.strptime(fecha_str.strip(), "%d/%m/%Y").date()
-                        except ValueError:
-                            continue  # Saltar si la fecha no es válida
-                        
-                        # Convertir horas (formato esperado: HH:MM)
-                        try:
-                            hora_entrada_obj = datetime.datetime.strptime(hora_entrada_str.strip(), "%H:%M").time()
-                            hora_salida_obj = datetime.datetime.strptime(hora_salida_str.strip(), "%H:%M").time()
-                        except ValueError:
-                            continue  # Saltar si las horas no son válidas
-                        
-                        # Crear nuevo registro
-                        nuevo_registro = RegistroUso(
-                            actividad=actividad.strip(),
-                            fecha=fecha_obj,
-                            hora_entrada=hora_entrada_obj,
-                            hora_salida=hora_salida_obj,
-                            docente_id=docente_id,
-                            laboratorio_id=laboratorio_id,
-                            periodo_id=periodo_id
-                        )
-                        
-                        session.add(nuevo_registro)
-                        total_importados += 1
-                    
-                    session.commit()
-                    QMessageBox.information(self, "Importación exitosa", 
-                                          f"Se importaron {total_importados} registros correctamente.")
-                except Exception as e:
-                    session.rollback()
-                    QMessageBox.critical(self, "Error", f"Error al importar datos: {str(e)}")
-                finally:
-                    session.close()
-                    
-                # Limpiar después de importar
-                self.csv_file_path = None
-                self.import_btn.setEnabled(False)
-                self.preview_table.setRowCount(0)
-                self.preview_table.setColumnCount(0)
-                
-                # Restablecer etiqueta de archivo seleccionado
-                self.selected_file_label.setText("Ningún archivo seleccionado")
-                self.selected_file_label.setStyleSheet("font-size: 12pt; color: #aaa; margin-top: 10px;")
-                
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Error al procesar archivo CSV: {str(e)}") 
\ No newline at end of file
+        # La importación corre en un hilo aparte para no congelar la ventana
+        self.import_worker = CsvImportWorker(self.csv_file_path, periodo_id, laboratorio_id, docente_id,
+                                             skip_duplicates=self.skip_duplicates_check.isChecked(),
+                                             reject_overlaps=self.reject_overlaps_check.isChecked())
+        self.import_worker.progress.connect(self.on_import_progress)
+        self.import_worker.finished.connect(self.on_import_finished)
+        self.import_worker.cancelled.connect(self.on_import_cancelled)
+        self.import_worker.failed.connect(self.on_import_failed)
+        
+        self.set_import_running(True)
+        self.import_thread = start_worker(self.import_worker, self)
+    
+    def set_import_running(self, running):
+        """Muestra u oculta los controles de progreso y bloquea los de importación"""
+        self.import_btn.setEnabled(not running and bool(self.csv_file_path))
+        self.select_file_btn.setEnabled(not running)
+        self.skip_duplicates_check.setEnabled(not running)
+        self.reject_overlaps_check.setEnabled(not running)
+        self.cancel_import_btn.setEnabled(running)
+        self.import_progress.setVisible(running)
+        self.cancel_import_btn.setVisible(running)
+        self.import_status_label.setVisible(running)
+        
+        if running:
+            self.import_progress.setRange(0, 0)  # Indeterminado hasta conocer el total
+            self.import_status_label.setText("Preparando importación...")
+    
+    def on_import_progress(self, parsed, inserted, rejected, rows_per_second, total_rows):
+        """Actualiza la barra y el texto de progreso de la importación"""
+        if total_rows > 0:
+            self.import_progress.setRange(0, total_rows)
+            self.import_progress.setValue(min(parsed, total_rows))
+        
+        self.import_status_label.setText(
+            f"Leídas: {parsed}  |  Insertadas: {inserted}  |  Rechazadas: {rejected}  |  "
+            f"{rows_per_second:.0f} filas/s"
+        )
+    
+    def cancel_import(self):
+        """Solicita la cancelación de la importación en curso"""
+        if self.import_worker:
+            self.import_worker.cancel()
+            self.cancel_import_btn.setEnabled(False)
+            self.import_status_label.setText("Cancelando importación...")
+    
+    def on_import_finished(self, resultado):
+        self.import_finished_cleanup()
+        utilization_cache.invalidate()
+        mensaje = (f"Se importaron {resultado.inserted} registros correctamente.\n"
+                   f"Filas omitidas: {resultado.skipped} (duplicadas: {resultado.duplicates})\n"
+                   f"Velocidad: {resultado.rows_per_second:.0f} filas/s")
+        if resultado.rejects.count:
+            mensaje += f"\n\nFilas rechazadas:\n{resultado.rejects.summary()}"
+        QMessageBox.information(self, "Importación exitosa", mensaje)
+        self.reset_csv_import_form()
+    
+    def on_import_cancelled(self):
+        self.import_finished_cleanup()
+        QMessageBox.information(self, "Importación cancelada", 
+                              "La importación fue cancelada. No se guardó ningún registro.")
+    
+    def on_import_failed(self, message):
+        self.import_finished_cleanup()
+        QMessageBox.critical(self, "Error", f"Error al importar datos: {message}")
+    
+    def import_finished_cleanup(self):
+        """Libera el worker y restablece los controles de importación"""
+        self.import_worker = None
+        self.import_thread = None
+        self.set_import_running(False)
+    
+    def reset_csv_import_form(self):
+        """Limpia el archivo seleccionado y la vista previa"""
+        self.csv_file_path = None
+        self.import_btn.setEnabled(False)
+        self.preview_table.setRowCount(0)
+        self.preview_table.setColumnCount(0)
+        
+        # Restablecer etiqueta de archivo seleccionado
+        self.selected_file_label.setText("Ningún archivo seleccionado")
+        self.selected_file_label.setStyleSheet("font-size: 12pt; color: #aaa; margin-top: 10px;")
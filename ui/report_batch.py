@@ -0,0 +1,188 @@
+import csv
+import multiprocessing
+import os
+import re
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from PySide6.QtGui import QGuiApplication
+
+from database.catalog import catalog
+from database.database import session_scope
+from database.queries import report_pairs, report_query, iter_report_rows
+from .report_renderer import ReportInfo, ReportCancelled, render_report, report_row
+
+# Nombre del archivo con el resumen del lote, dentro de la carpeta de destino
+RESUMEN_LOTE = "resumen_reportes.csv"
+
+# Un documento del lote: ruta del PDF, filtros de report_query y textos de la cabecera
+BatchJob = namedtuple("BatchJob", ["file_path", "filtros", "info"])
+
+# Resultado de un documento; error es None si se generó correctamente
+BatchResult = namedtuple("BatchResult", ["file_path", "info", "registros", "paginas", "segundos", "error"])
+
+# Aplicación Qt de cada proceso del pool (necesaria para las fuentes de QPainter)
+_app = None
+
+
+def _file_name(*partes):
+    """Nombre de archivo seguro a partir de los textos indicados"""
+    texto = "_".join(parte for parte in partes if parte)
+    return re.sub(r"[^\w\-]+", "_", texto).strip("_") or "reporte"
+
+
+def _nombre_docente(docente):
+    return f"{docente.nombre} {docente.apellido}" if docente.apellido else docente.nombre
+
+
+def report_info(periodo_id=None, laboratorio_id=None, docente_id=None, carrera_id=None):
+    """Textos de la cabecera del reporte para esos filtros, tomados del catálogo
+
+    Tiene el mismo formato que usa Visualización al imprimir; si no se indica la
+    carrera se usa la del laboratorio.
+    """
+    laboratorio = catalog.laboratorio(laboratorio_id) if laboratorio_id else None
+    docente = catalog.docente(docente_id) if docente_id else None
+    periodo = catalog.periodo(periodo_id) if periodo_id else None
+    if not carrera_id and laboratorio:
+        carrera_id = laboratorio.carrera_id
+    carrera = catalog.carrera(carrera_id) if carrera_id else None
+
+    return ReportInfo(
+        laboratorio.nombre.upper() if laboratorio else "N/A",
+        periodo.nombre if periodo else "N/A",
+        f"Ing. {_nombre_docente(docente)}" if docente else "N/A",
+        carrera.nombre if carrera else "N/A"
+    )
+
+
+def plan_batch(periodo_id, output_dir):
+    """Lista de BatchJob, uno por cada par laboratorio/docente con registros en el período
+
+    Los textos de la cabecera de cada documento salen de report_info.
+    """
+    with session_scope() as db:
+        pares = report_pairs(db, periodo_id)
+
+    periodo = catalog.periodo(periodo_id)
+    jobs = []
+    usados = set()
+    for laboratorio_id, docente_id in pares:
+        laboratorio = catalog.laboratorio(laboratorio_id)
+        docente = catalog.docente(docente_id)
+        nombre_docente = _nombre_docente(docente) if docente else "N/A"
+        info = report_info(periodo_id, laboratorio_id, docente_id)
+
+        nombre = _file_name(periodo.nombre if periodo else "", laboratorio.nombre if laboratorio else "",
+                            nombre_docente)
+        # Dos docentes con el mismo nombre no deben sobrescribir el mismo archivo
+        if nombre in usados:
+            nombre = f"{nombre}_{docente_id}"
+        usados.add(nombre)
+
+        filtros = {"periodo_id": periodo_id, "laboratorio_id": laboratorio_id, "docente_id": docente_id}
+        jobs.append(BatchJob(os.path.join(output_dir, f"{nombre}.pdf"), filtros, info))
+    return jobs
+
+
+def _init_process():
+    """Prepara un proceso del pool: cada uno tiene su propia aplicación Qt y conexión"""
+    global _app
+    _app = QGuiApplication.instance() or QGuiApplication([])
+
+
+def render_job(job):
+    """Genera un documento del lote; se ejecuta en un proceso del pool
+
+    Los errores se devuelven en el resultado para que un documento fallido no
+    detenga el resto del lote.
+    """
+    inicio = time.perf_counter()
+    try:
+        with session_scope() as db:
+            query = report_query(db, **job.filtros)
+            total_registros = query.order_by(None).count()
+            registros = (report_row(registro) for registro in iter_report_rows(query))
+            paginas = render_report(job.file_path, registros, job.info, total_registros=total_registros)
+        return BatchResult(job.file_path, job.info, total_registros, paginas,
+                           time.perf_counter() - inicio, None)
+    except Exception as e:
+        return BatchResult(job.file_path, job.info, 0, 0, time.perf_counter() - inicio, str(e))
+
+
+def run_batch(jobs, max_workers=None, progress_callback=None, should_cancel=None):
+    """Genera los documentos del lote en paralelo y devuelve sus BatchResult
+
+    Cada documento se dibuja en un proceso distinto (QPainter no libera el GIL, por
+    lo que los hilos no aprovechan más de un núcleo). Tras cada documento terminado se
+    llama a progress_callback(terminados, total). Si should_cancel() devuelve True se
+    descartan los documentos pendientes, se espera a los que están en curso y se lanza
+    ReportCancelled; los PDF ya generados se conservan.
+    """
+    if not jobs:
+        return []
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = max(1, min(max_workers, len(jobs)))
+
+    # spawn en todas las plataformas: un proceso hijo no debe heredar por fork la
+    # conexión a SQLite ni el estado de Qt del proceso principal
+    contexto = multiprocessing.get_context("spawn")
+    resultados = []
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=contexto,
+                             initializer=_init_process) as executor:
+        futures = [executor.submit(render_job, job) for job in jobs]
+        for future in as_completed(futures):
+            resultados.append(future.result())
+            if progress_callback:
+                progress_callback(len(resultados), len(jobs))
+            if should_cancel and should_cancel():
+                executor.shutdown(wait=True, cancel_futures=True)
+                raise ReportCancelled()
+
+    # Mismo orden que el plan, no el de finalización
+    orden = {job.file_path: i for i, job in enumerate(jobs)}
+    resultados.sort(key=lambda resultado: orden[resultado.file_path])
+    return resultados
+
+
+def write_summary(path, resultados, segundos_totales):
+    """Escribe el resumen del lote en CSV: un renglón por documento y uno con el total"""
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["archivo", "laboratorio", "docente", "registros", "paginas", "segundos", "error"])
+        for resultado in resultados:
+            writer.writerow([
+                os.path.basename(resultado.file_path),
+                resultado.info.laboratorio,
+                resultado.info.docente,
+                resultado.registros,
+                resultado.paginas,
+                f"{resultado.segundos:.2f}",
+                resultado.error or ""
+            ])
+        writer.writerow([
+            "TOTAL", "", "",
+            sum(resultado.registros for resultado in resultados),
+            sum(resultado.paginas for resultado in resultados),
+            f"{segundos_totales:.2f}",
+            ""
+        ])
+
+
+def generate_period_reports(periodo_id, output_dir, max_workers=None, progress_callback=None,
+                            should_cancel=None):
+    """Genera un PDF por laboratorio/docente del período y el resumen del lote
+
+    Devuelve (ruta del resumen, resultados).
+    """
+    inicio = time.perf_counter()
+    os.makedirs(output_dir, exist_ok=True)
+    jobs = plan_batch(periodo_id, output_dir)
+    resultados = run_batch(jobs, max_workers=max_workers, progress_callback=progress_callback,
+                           should_cancel=should_cancel)
+    resumen = os.path.join(output_dir, RESUMEN_LOTE)
+    write_summary(resumen, resultados, time.perf_counter() - inicio)
+    return resumen, resultados
@@ -0,0 +1,325 @@
+import os
+from collections import namedtuple
+
+from PySide6.QtCore import Qt, QMarginsF, QRectF
+from PySide6.QtGui import QFont, QPainter, QPageLayout, QPageSize, QPdfWriter, QPen
+
+# Número de registros (celdas) por página del reporte
+REGISTROS_POR_PAGINA = 9
+
+# Resolución del PDF; las medidas del reporte están en píxeles a esta resolución
+# (la misma que QPrinter.HighResolution)
+RESOLUCION_DPI = 1200
+
+# Textos de la cabecera del reporte, ya con "N/A" si no hay filtro
+ReportInfo = namedtuple("ReportInfo", ["laboratorio", "periodo", "docente", "carrera"])
+
+# Registro del reporte con sus valores ya formateados como texto
+ReportRow = namedtuple("ReportRow", ["actividad", "fecha", "hora_entrada", "hora_salida"])
+
+
+def report_row(registro):
+    """Convierte una fila de report_query en un ReportRow con los textos del reporte"""
+    return ReportRow(
+        registro.actividad or "",
+        registro.fecha.strftime("%d/%m/%Y") if registro.fecha else "",
+        registro.hora_entrada.strftime("%H:%M") if registro.hora_entrada else "",
+        registro.hora_salida.strftime("%H:%M") if registro.hora_salida else ""
+    )
+
+
+class ReportCancelled(Exception):
+    """La generación del reporte fue cancelada y el archivo parcial eliminado"""
+
+
+def count_pages(total_registros, por_pagina=REGISTROS_POR_PAGINA):
+    """Número de páginas del reporte; siempre hay al menos una"""
+    return max(1, (total_registros + por_pagina - 1) // por_pagina)
+
+
+def iter_pages(registros, por_pagina=REGISTROS_POR_PAGINA):
+    """Agrupa los registros en páginas sin materializar la lista completa
+
+    Si no hay registros produce una sola página vacía.
+    """
+    pagina = []
+    emitidas = 0
+    for registro in registros:
+        pagina.append(registro)
+        if len(pagina) == por_pagina:
+            yield pagina
+            emitidas += 1
+            pagina = []
+    if pagina or emitidas == 0:
+        yield pagina
+
+
+def create_pdf_writer(file_path):
+    """Crea un QPdfWriter A4 horizontal con la geometría que usaba QPrinter
+
+    QPdfWriter pertenece a QtGui y se puede usar fuera del hilo de la interfaz.
+    """
+    writer = QPdfWriter(file_path)
+    writer.setResolution(RESOLUCION_DPI)
+    writer.setPageLayout(QPageLayout(QPageSize(QPageSize.A4), QPageLayout.Landscape,
+                                     QMarginsF(10, 10, 10, 10), QPageLayout.Point))
+    return writer
+
+
+def render_report(file_path, registros, info, total_registros=None, progress_callback=None,
+                  should_cancel=None):
+    """Genera el reporte PDF página por página y devuelve el número de páginas
+
+    registros puede ser cualquier iterable de ReportRow: solo se mantiene en memoria la
+    página en curso y cada página se escribe en el archivo al pasar a la siguiente.
+    Tras cada página se llama a progress_callback(página, total_páginas). Si
+    should_cancel() devuelve True se detiene, se elimina el archivo parcial y se lanza
+    ReportCancelled.
+    """
+    total_paginas = count_pages(total_registros) if total_registros is not None else 0
+
+    writer = create_pdf_writer(file_path)
+    painter = QPainter()
+    if not painter.begin(writer):
+        raise RuntimeError("No se pudo iniciar la impresión.")
+
+    layout = None
+    paginas = 0
+    cancelled = False
+    try:
+        for registros_pagina in iter_pages(registros):
+            if should_cancel and should_cancel():
+                cancelled = True
+                break
+
+            # Si no es la primera página, comenzar una nueva
+            if paginas > 0:
+                writer.newPage()
+
+            if layout is None:
+                # Todas las páginas tienen la misma geometría: medir una sola vez
+                page_rect = writer.pageLayout().paintRectPixels(writer.resolution())
+                layout = ReportLayout(painter, page_rect, info)
+            layout.draw_page(painter, registros_pagina)
+            paginas += 1
+
+            if progress_callback:
+                progress_callback(paginas, max(total_paginas, paginas))
+    finally:
+        painter.end()
+
+    if cancelled:
+        if os.path.exists(file_path):
+            os.remove(file_path)
+        raise ReportCancelled()
+
+    return paginas
+
+
+def _font(size, bold=False, italic=False):
+    font = QFont("Cambria", size)
+    font.setBold(bold)
+    font.setItalic(italic)
+    return font
+
+
+class ReportLayout:
+    """Geometría, fuentes y textos fijos del reporte, calculados una vez por documento
+
+    Los títulos, los datos del filtro, los encabezados de la tabla, los anchos de
+    columna y la firma son iguales en todas las páginas, así que sus posiciones se
+    miden al crear el layout. Por página solo se dibujan estos elementos ya medidos
+    y las celdas de los registros; el ancho de los textos centrados (fechas y horas,
+    que se repiten mucho) se guarda en un diccionario.
+    """
+
+    TITLE = "ESCUELA SUPERIOR POLITÉCNICA DE CHIMBORAZO"
+    SUBTITLE = "FACULTAD DE MECÁNICA"
+    HEADER_TEXTS = ["Actividades", "Fecha", "Hora Entrada", "Hora Salida", "Firma"]
+    NOMBRE_TECNICO = "Ing. Félix Ruiz M."
+    CARGO_TECNICO = "Técnico de Laboratorio"
+
+    # Medidas en píxeles a RESOLUCION_DPI
+    TITLE_Y = 250
+    VERTICAL_SPACING = 300  # Mismo espaciado vertical en todo el documento
+    LEFT_MARGIN = 460  # Margen izquierdo de los datos del filtro
+    TABLE_LEFT = 80
+    HEADER_HEIGHT = 456  # Altura de la fila de encabezados
+    DATA_ROW_HEIGHT = 532  # Altura de las filas de datos
+    CELL_PADDING = 10
+
+    def __init__(self, painter, page_rect, info):
+        page_width = page_rect.width()
+
+        # Fuentes del documento
+        self.title_font = _font(16, bold=True)
+        self.subtitle_font = _font(14, bold=True)
+        self.lab_font = _font(12, bold=True)
+        self.label_font = _font(11, bold=True, italic=True)
+        self.value_font = _font(11, italic=True)
+        self.header_font = _font(12, bold=True)
+        self.data_font = _font(11)
+        self.firma_font = _font(11, bold=True)
+        self.cargo_font = _font(11)
+
+        # Alineación de la actividad: a la izquierda, centrada en vertical y con ajuste de línea
+        self.activity_flags = Qt.AlignLeft | Qt.AlignVCenter | Qt.TextWordWrap
+
+        # Pinceles usados en todas las páginas
+        self.text_pen = QPen(Qt.black)
+        self.border_pen = QPen(Qt.black, 2)  # Borde exterior de la tabla
+        self.line_pen = QPen(Qt.black, 1)
+
+        # ===== TÍTULOS CENTRADOS =====
+        lab_title = f"LABORATORIO DE {info.laboratorio}"
+        subtitle_y = self.TITLE_Y + self.VERTICAL_SPACING
+        lab_y = subtitle_y + self.VERTICAL_SPACING
+        self.titles = [
+            (self.title_font, self._centered_x(painter, self.title_font, self.TITLE, page_width),
+             self.TITLE_Y, self.TITLE),
+            (self.subtitle_font, self._centered_x(painter, self.subtitle_font, self.SUBTITLE, page_width),
+             subtitle_y, self.SUBTITLE),
+            (self.lab_font, self._centered_x(painter, self.lab_font, lab_title, page_width),
+             lab_y, lab_title),
+        ]
+
+        # ===== PERÍODO, DOCENTE Y CARRERA =====
+        # Etiqueta en negrita y cursiva; el valor en cursiva, separado por dos espacios
+        painter.setFont(self.value_font)
+        espacio_width = painter.fontMetrics().horizontalAdvance("  ")
+        periodo_y = lab_y + self.VERTICAL_SPACING + 152 + 228
+        self.fields = []
+        for i, (label, value) in enumerate((("PERÍODO:", info.periodo),
+                                            ("DOCENTE:", info.docente),
+                                            ("CARRERA:", info.carrera))):
+            painter.setFont(self.label_font)
+            label_width = painter.fontMetrics().horizontalAdvance(label)
+            y = periodo_y + i * self.VERTICAL_SPACING
+            self.fields.append((y, label, self.LEFT_MARGIN + label_width + espacio_width, value))
+
+        # ===== TABLA DE REGISTROS =====
+        carrera_y = periodo_y + 2 * self.VERTICAL_SPACING
+        self.table_y = carrera_y + 200
+        self.table_width = page_width - self.TABLE_LEFT - 80
+        self.col_widths = [
+            int(self.table_width * 0.35),  # Actividades (35%)
+            int(self.table_width * 0.15),  # Fecha (15%)
+            int(self.table_width * 0.15),  # Hora Entrada (15%)
+            int(self.table_width * 0.15),  # Hora Salida (15%)
+            int(self.table_width * 0.20)   # Firma (20%)
+        ]
+        self.col_x = []
+        x_pos = self.TABLE_LEFT
+        for col_width in self.col_widths:
+            self.col_x.append(x_pos)
+            x_pos += col_width
+
+        # Encabezados centrados en sus celdas
+        painter.setFont(self.header_font)
+        fm = painter.fontMetrics()
+        header_text_y = int(self.table_y + (self.HEADER_HEIGHT / 2) + (fm.height() / 2) - fm.descent())
+        self.headers = []
+        for x_pos, col_width, header in zip(self.col_x, self.col_widths, self.HEADER_TEXTS):
+            text_x = int(x_pos + (col_width - fm.horizontalAdvance(header)) / 2)
+            self.headers.append((x_pos, col_width, text_x, header))
+        self.header_text_y = header_text_y
+
+        # Métricas de la fuente de datos para centrar fechas y horas
+        painter.setFont(self.data_font)
+        self.data_metrics = painter.fontMetrics()
+        self.data_text_offset = (self.DATA_ROW_HEIGHT / 2) + (self.data_metrics.height() / 2) \
+            - self.data_metrics.descent()
+        self._advance_cache = {}
+
+        # ===== FIRMA DEL TÉCNICO EN LA PARTE INFERIOR =====
+        bottom_margin = page_rect.height() - 608
+        self.firma = [
+            (self.firma_font,
+             self._centered_x(painter, self.firma_font, self.NOMBRE_TECNICO, page_width),
+             bottom_margin - 228, self.NOMBRE_TECNICO),
+            (self.cargo_font,
+             self._centered_x(painter, self.cargo_font, self.CARGO_TECNICO, page_width),
+             bottom_margin + 40, self.CARGO_TECNICO),
+        ]
+
+    @staticmethod
+    def _centered_x(painter, font, text, page_width):
+        painter.setFont(font)
+        return int((page_width - painter.fontMetrics().horizontalAdvance(text)) / 2)
+
+    def text_width(self, text):
+        """Ancho de un texto en la fuente de datos, calculado una vez por texto distinto"""
+        width = self._advance_cache.get(text)
+        if width is None:
+            width = self.data_metrics.horizontalAdvance(text)
+            self._advance_cache[text] = width
+        return width
+
+    def draw_page(self, painter, registros_pagina):
+        """Dibuja una página: títulos, datos del filtro, tabla de registros y firma"""
+        painter.setPen(self.text_pen)
+        painter.setBrush(Qt.NoBrush)
+
+        for font, x, y, text in self.titles:
+            painter.setFont(font)
+            painter.drawText(x, y, text)
+
+        for y, label, value_x, value in self.fields:
+            painter.setFont(self.label_font)
+            painter.drawText(self.LEFT_MARGIN, y, label)
+            painter.setFont(self.value_font)
+            painter.drawText(value_x, y, value)
+
+        # Si no hay registros se dibuja una fila vacía
+        num_filas = max(1, len(registros_pagina))
+        table_y = self.table_y
+        table_height = self.HEADER_HEIGHT + self.DATA_ROW_HEIGHT * num_filas
+
+        # Borde exterior de toda la tabla
+        painter.setPen(self.border_pen)
+        painter.drawRect(self.TABLE_LEFT, table_y, self.table_width, table_height)
+        painter.setPen(self.line_pen)
+
+        # Fila de encabezados con fondo gris
+        painter.setFont(self.header_font)
+        for x_pos, col_width, text_x, header in self.headers:
+            painter.setBrush(Qt.lightGray)
+            painter.drawRect(x_pos, table_y, col_width, self.HEADER_HEIGHT)
+            painter.setBrush(Qt.NoBrush)
+            painter.drawText(text_x, self.header_text_y, header)
+        painter.drawLine(self.TABLE_LEFT, table_y + self.HEADER_HEIGHT,
+                         self.TABLE_LEFT + self.table_width, table_y + self.HEADER_HEIGHT)
+
+        # Filas de datos
+        painter.setFont(self.data_font)
+        padding = self.CELL_PADDING
+        for fila in range(num_filas):
+            fila_y = table_y + self.HEADER_HEIGHT + fila * self.DATA_ROW_HEIGHT
+            for x_pos, col_width in zip(self.col_x, self.col_widths):
+                painter.drawRect(x_pos, fila_y, col_width, self.DATA_ROW_HEIGHT)
+
+            if fila >= len(registros_pagina):
+                continue
+            registro = registros_pagina[fila]
+
+            # Actividad alineada a la izquierda con ajuste de línea automático
+            if registro.actividad:
+                text_rect = QRectF(self.col_x[0] + padding, fila_y + padding,
+                                   self.col_widths[0] - 2 * padding, self.DATA_ROW_HEIGHT - 2 * padding)
+                painter.drawText(text_rect, self.activity_flags, registro.actividad)
+
+            # Fecha y horas centradas
+            text_y = int(fila_y + self.data_text_offset)
+            for col, texto in ((1, registro.fecha), (2, registro.hora_entrada), (3, registro.hora_salida)):
+                if texto:
+                    text_x = int(self.col_x[col] + (self.col_widths[col] - self.text_width(texto)) / 2)
+                    painter.drawText(text_x, text_y, texto)
+
+        # Líneas verticales entre columnas (una vez por página)
+        for x_pos in self.col_x[1:]:
+            painter.drawLine(x_pos, table_y, x_pos, table_y + table_height)
+
+        # Firma del técnico
+        for font, x, y, text in self.firma:
+            painter.setFont(font)
+            painter.drawText(x, y, text)
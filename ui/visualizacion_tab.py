@@ -1,17 +1,36 @@
+import os
+
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QFormLayout,
-                              QLabel, QComboBox, QPushButton, QTableWidget,
-                              QTableWidgetItem, QHeaderView, QFileDialog, QMessageBox)
-from PySide6.QtCore import Qt, QDir, QRectF, QUrl
-from PySide6.QtGui import QPainter, QPageLayout, QPixmap, QFont, QPen, QPageSize, QDesktopServices
-from PySide6.QtPrintSupport import QPrinter, QPrintDialog, QPrintPreviewDialog
-from datetime import datetime
+                              QLabel, QComboBox, QPushButton, QTableView,
+                              QHeaderView, QFileDialog, QMessageBox, QProgressBar, QSplitter)
+from PySide6.QtCore import Qt, QDir, QUrl, QTimer
+from PySide6.QtGui import QDesktopServices
+
+from database.database import session_scope
+from database.catalog import catalog
+from database.export import available_formats, format_for_path
+from database.models import RegistroUso
+from database.occupancy import DIAS_SEMANA, utilization_cache
+from database.queries import paginate_registros, registros_display_query, filter_registros
+from .heatmap_widget import HeatmapWidget
+from .registros_model import RegistrosTableModel
+from .report_renderer import ReportInfo
+from .workers import ReportWorker, BatchReportWorker, ExportWorker, CountWorker, start_worker
+
+# Tamaños de franja disponibles para el mapa de ocupación
+FRANJAS_MINUTOS = [15, 30, 60, 120]
 
-from database.database import get_db
-from database.models import Docente, Carrera, Laboratorio, Periodo, RegistroUso
 
 class VisualizacionTab(QWidget):
     def __init__(self):
         super().__init__()
+        self.report_worker = None
+        self.report_thread = None
+        # Filtros del último filtrado, usados también por el reporte
+        self.current_filters = {}
+        # Conteos en curso; solo se muestra el de la última generación de filtros
+        self.count_generation = 0
+        self.count_workers = []
         self.setup_ui()
         self.load_data()
         
@@ -68,14 +87,46 @@ class VisualizacionTab(QWidget):
         self.status_label.setStyleSheet("font-style: italic;")
         main_layout.addWidget(self.status_label)
         
-        # Tabla de resultados - Configurar para permitir selección de filas
-        self.results_table = QTableWidget()
-        self.results_table.setColumnCount(5)
-        self.results_table.setHorizontalHeaderLabels(["Docente", "Actividad", "Hora Entrada", "Hora Salida", "Fecha"])
+        # Tabla de resultados - Modelo paginado que carga filas bajo demanda al hacer scroll
+        self.results_model = RegistrosTableModel(self)
+        self.results_table = QTableView()
+        self.results_table.setModel(self.results_model)
         self.results_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        self.results_table.setSelectionBehavior(QTableWidget.SelectRows)  # Seleccionar filas completas
-        self.results_table.setSelectionMode(QTableWidget.ExtendedSelection)  # Permitir selección múltiple
-        main_layout.addWidget(self.results_table)
+        self.results_table.setSelectionBehavior(QTableView.SelectRows)  # Seleccionar filas completas
+        self.results_table.setSelectionMode(QTableView.ExtendedSelection)  # Permitir selección múltiple
+        
+        # Mapa de ocupación semanal del laboratorio filtrado, debajo de la tabla
+        heatmap_panel = QWidget()
+        heatmap_layout = QVBoxLayout(heatmap_panel)
+        heatmap_layout.setContentsMargins(0, 5, 0, 0)
+        
+        heatmap_header = QHBoxLayout()
+        heatmap_title = QLabel("Ocupación semanal del laboratorio")
+        heatmap_title.setStyleSheet("font-size: 12pt; font-weight: bold;")
+        heatmap_header.addWidget(heatmap_title)
+        heatmap_header.addStretch()
+        heatmap_header.addWidget(QLabel("Franja:"))
+        self.slot_combo = QComboBox()
+        for minutos in FRANJAS_MINUTOS:
+            self.slot_combo.addItem(f"{minutos} min", minutos)
+        self.slot_combo.setCurrentIndex(FRANJAS_MINUTOS.index(60))
+        self.slot_combo.currentIndexChanged.connect(self.update_heatmap)
+        heatmap_header.addWidget(self.slot_combo)
+        heatmap_layout.addLayout(heatmap_header)
+        
+        self.heatmap_label = QLabel("")
+        self.heatmap_label.setStyleSheet("font-style: italic;")
+        heatmap_layout.addWidget(self.heatmap_label)
+        
+        self.heatmap = HeatmapWidget()
+        heatmap_layout.addWidget(self.heatmap)
+        
+        splitter = QSplitter(Qt.Vertical)
+        splitter.addWidget(self.results_table)
+        splitter.addWidget(heatmap_panel)
+        splitter.setStretchFactor(0, 3)
+        splitter.setStretchFactor(1, 1)
+        main_layout.addWidget(splitter)
         
         # Botón para imprimir
         self.print_btn = QPushButton("Imprimir PDF")
@@ -104,6 +155,30 @@ class VisualizacionTab(QWidget):
         # Espacio flexible
         buttons_layout.addStretch()
         
+        # Progreso de la generación del reporte (visible solo mientras se genera)
+        self.report_progress = QProgressBar()
+        self.report_progress.setStyleSheet("font-size: 12pt;")
+        self.report_progress.setVisible(False)
+        buttons_layout.addWidget(self.report_progress)
+        
+        self.cancel_report_btn = QPushButton("Cancelar")
+        self.cancel_report_btn.setStyleSheet("font-size: 12pt; padding: 8px;")
+        self.cancel_report_btn.clicked.connect(self.cancel_report)
+        self.cancel_report_btn.setVisible(False)
+        buttons_layout.addWidget(self.cancel_report_btn)
+        
+        # Exportación de los registros filtrados para análisis externos
+        self.export_btn = QPushButton("Exportar Datos")
+        self.export_btn.setStyleSheet("font-size: 12pt; padding: 8px;")
+        self.export_btn.clicked.connect(self.export_data)
+        buttons_layout.addWidget(self.export_btn)
+        
+        # Un PDF por laboratorio/docente del período seleccionado
+        self.batch_report_btn = QPushButton("Reportes del Período")
+        self.batch_report_btn.setStyleSheet("font-size: 12pt; padding: 8px;")
+        self.batch_report_btn.clicked.connect(self.print_period_reports)
+        buttons_layout.addWidget(self.batch_report_btn)
+        
         # Añadir el botón de imprimir al layout de botones
         buttons_layout.addWidget(self.print_btn)
         
@@ -129,47 +204,53 @@ class VisualizacionTab(QWidget):
     def load_data(self):
         """Carga los datos iniciales en los combos"""
         try:
-            db = get_db()
-            
+            # Los combos se llenan desde la caché de catálogos
             # Cargar períodos
             self.periodo_combo.clear()
             self.periodo_combo.addItem("-- Todos --", None)
-            periodos = db.query(Periodo).all()
-            for periodo in periodos:
+            for periodo in catalog.periodos():
                 self.periodo_combo.addItem(periodo.nombre, periodo.id)
             
             # Cargar carreras
             self.carrera_combo.clear()
             self.carrera_combo.addItem("-- Todas --", None)
-            carreras = db.query(Carrera).all()
-            for carrera in carreras:
+            for carrera in catalog.carreras():
                 self.carrera_combo.addItem(carrera.nombre, carrera.id)
             
             # Cargar los laboratorios (evitando duplicados manualmente)
             self.lab_combo.clear()
             self.lab_combo.addItem("-- Todos --", None)
             lab_names = set()  # Conjunto para verificar duplicados
-            labs = db.query(Laboratorio).all()
-            for lab in labs:
+            for lab in catalog.laboratorios():
                 if lab.nombre not in lab_names:
                     self.lab_combo.addItem(lab.nombre, lab.id)
                     lab_names.add(lab.nombre)
             
             # Cargar todos los docentes
-            self.docente_combo.clear()
-            self.docente_combo.addItem("-- Todos --", None)
-            docentes = db.query(Docente).all()
-            for docente in docentes:
-                nombre_completo = f"{docente.nombre} {docente.apellido}" if docente.apellido else docente.nombre
-                self.docente_combo.addItem(nombre_completo, docente.id)
-            
-            # Mostrar todos los registros al inicio
-            self.filter_data()
+            self.load_docentes()
+            
+            # Mostrar todos los registros al inicio, después de que la pestaña se pinte
+            QTimer.singleShot(0, self.filter_data)
         except Exception as e:
             print(f"Error al cargar datos iniciales: {e}")
             import traceback
             traceback.print_exc()
     
+    def load_docentes(self):
+        """Carga todos los docentes en el combo conservando la selección actual"""
+        selected_id = self.docente_combo.currentData()
+        
+        self.docente_combo.clear()
+        self.docente_combo.addItem("-- Todos --", None)
+        for docente in catalog.docentes():
+            nombre_completo = f"{docente.nombre} {docente.apellido}" if docente.apellido else docente.nombre
+            self.docente_combo.addItem(nombre_completo, docente.id)
+        
+        if selected_id:
+            index = self.docente_combo.findData(selected_id)
+            if index >= 0:
+                self.docente_combo.setCurrentIndex(index)
+    
     def update_laboratorios(self):
         """Actualiza la lista de laboratorios según la carrera seleccionada"""
         try:
@@ -182,18 +263,11 @@ class VisualizacionTab(QWidget):
             
             carrera_id = self.carrera_combo.currentData()
             
-            db = get_db()
-            
             # Conjunto para controlar nombres únicos
             lab_names = set()
             
-            # Obtener laboratorios según la carrera seleccionada
-            if carrera_id:
-                query = db.query(Laboratorio).filter(Laboratorio.carrera_id == carrera_id)
-            else:
-                query = db.query(Laboratorio)
-            
-            labs = query.all()
+            # Laboratorios según la carrera seleccionada (todos si no hay carrera)
+            labs = catalog.laboratorios(carrera_id)
             
             # Añadir laboratorios sin duplicados
             for lab in labs:
@@ -220,82 +294,49 @@ class VisualizacionTab(QWidget):
             periodo_id = self.periodo_combo.currentData()
             laboratorio_id = self.lab_combo.currentData()
             carrera_id = self.carrera_combo.currentData()
-            
-            db = get_db()
-            
-            # Construir la consulta base
-            query = db.query(RegistroUso)
-            
-            # Filtrar por docente si está seleccionado
-            if docente_id:
-                query = query.filter(RegistroUso.docente_id == docente_id)
-            
-            # Filtrar por laboratorio si está seleccionado
-            if laboratorio_id:
-                query = query.filter(RegistroUso.laboratorio_id == laboratorio_id)
-            # Si no hay laboratorio específico pero hay carrera seleccionada, filtrar por laboratorios de esa carrera
-            elif carrera_id:
-                # Obtener todos los laboratorios de la carrera
-                labs_carrera = db.query(Laboratorio.id).filter(Laboratorio.carrera_id == carrera_id).all()
-                lab_ids = [lab[0] for lab in labs_carrera]
-                
-                if lab_ids:  # Solo aplicar el filtro si hay laboratorios en esta carrera
-                    query = query.filter(RegistroUso.laboratorio_id.in_(lab_ids))
-            
-            # Filtrar por período si está seleccionado
-            if periodo_id:
-                # Obtener las fechas del período
-                periodo = db.query(Periodo).filter(Periodo.id == periodo_id).first()
-                if periodo and hasattr(periodo, 'fecha_inicio') and hasattr(periodo, 'fecha_fin'):
-                    # Filtrar por el rango de fechas del período
-                    query = query.filter(RegistroUso.fecha.between(periodo.fecha_inicio, periodo.fecha_fin))
-            
-            # Añadir joins para poder acceder a propiedades relacionadas
-            query = query.join(Docente, RegistroUso.docente_id == Docente.id)
-            query = query.join(Laboratorio, RegistroUso.laboratorio_id == Laboratorio.id)
-            
-            # Ordenar por fecha descendente (más reciente primero)
-            query = query.order_by(RegistroUso.fecha.desc(), RegistroUso.hora_entrada.desc())
-            
-            # Obtener registros con límite para evitar sobrecarga
-            registros = query.limit(1000).all()
-            
-            # Actualizar tabla
-            self.results_table.setRowCount(0)  # Limpiar tabla
-            
-            # Guardar los IDs de los registros para poder eliminarlos más tarde
-            self.registro_ids = []
-            
-            for i, registro in enumerate(registros):
-                self.results_table.insertRow(i)
-                
-                # Guardar el ID del registro para usar en la eliminación
-                self.registro_ids.append(registro.id)
-                
-                # Docente
-                docente_nombre = f"{registro.docente.nombre} {registro.docente.apellido}" if registro.docente else ""
-                self.results_table.setItem(i, 0, QTableWidgetItem(docente_nombre))
-                
-                # Actividad
-                self.results_table.setItem(i, 1, QTableWidgetItem(registro.actividad or ""))
-                
-                # Hora entrada
-                hora_entrada = registro.hora_entrada.strftime("%H:%M") if registro.hora_entrada else ""
-                self.results_table.setItem(i, 2, QTableWidgetItem(hora_entrada))
-                
-                # Hora salida
-                hora_salida = registro.hora_salida.strftime("%H:%M") if registro.hora_salida else ""
-                self.results_table.setItem(i, 3, QTableWidgetItem(hora_salida))
-                
-                # Fecha
-                fecha = registro.fecha.strftime("%d/%m/%Y") if registro.fecha else ""
-                self.results_table.setItem(i, 4, QTableWidgetItem(fecha))
-            
-            # Actualizar el label de estado con el número de registros
-            if len(registros) == 1000:
-                self.status_label.setText(f"Se encontraron más de 1000 registros. Mostrando los 1000 más recientes.")
-            else:
-                self.status_label.setText(f"Se encontraron {len(registros)} registros.")
+            filtros = {
+                "docente_id": docente_id,
+                "laboratorio_id": laboratorio_id,
+                "carrera_id": carrera_id,
+                "periodo_id": periodo_id,
+            }
+            self.current_filters = filtros
+            
+            def build_query(db):
+                """Construye la consulta filtrada sobre la sesión dada en una sola sentencia"""
+                # Proyección plana: solo las columnas de la tabla, con el docente ya unido
+                return filter_registros(registros_display_query(db), **filtros)
+            
+            def page_fetcher(cursor, limit):
+                """Obtiene una página de registros ya formateada para la tabla"""
+                # Cada página es una unidad de trabajo corta sobre la sesión del hilo
+                with session_scope() as db:
+                    # Paginación por cursor: ordena por fecha descendente (más reciente primero)
+                    page = paginate_registros(build_query(db), cursor, limit)
+                    rows = []
+                    for registro in page.rows:
+                        docente_nombre = (f"{registro.docente_nombre} {registro.docente_apellido}"
+                                          if registro.docente_apellido else registro.docente_nombre)
+                        rows.append((
+                            registro.id,
+                            docente_nombre,
+                            registro.actividad or "",
+                            registro.hora_entrada.strftime("%H:%M") if registro.hora_entrada else "",
+                            registro.hora_salida.strftime("%H:%M") if registro.hora_salida else "",
+                            registro.fecha.strftime("%d/%m/%Y") if registro.fecha else ""
+                        ))
+                return rows, page.last_cursor if page.has_next else None
+            
+            # El modelo carga la primera página y el resto al desplazarse
+            self.results_model.set_page_fetcher(page_fetcher)
+            
+            # El total se cuenta en otro hilo después de pintar la primera página
+            self.count_generation += 1
+            generacion = self.count_generation
+            self.status_label.setText("Contando registros...")
+            QTimer.singleShot(0, lambda: self.start_count(generacion, filtros))
+            
+            self.update_heatmap()
             
         except Exception as e:
             print(f"Error al filtrar datos: {str(e)}")
@@ -303,6 +344,65 @@ class VisualizacionTab(QWidget):
             import traceback
             traceback.print_exc()
     
+    def start_count(self, generacion, filtros):
+        """Cuenta en segundo plano los registros del filtrado indicado"""
+        if generacion != self.count_generation:
+            return
+        
+        worker = CountWorker(generacion, filtros)
+        worker.finished.connect(self.on_count_finished)
+        worker.failed.connect(self.on_count_failed)
+        # Mantener la referencia al worker hasta que termine su hilo
+        self.count_workers.append(worker)
+        thread = start_worker(worker, self)
+        thread.finished.connect(lambda: self.count_workers.remove(worker))
+    
+    def on_count_finished(self, generacion, total):
+        # Un filtrado más reciente ya reemplazó los resultados
+        if generacion != self.count_generation:
+            return
+        self.status_label.setText(f"Se encontraron {total} registros.")
+    
+    def on_count_failed(self, mensaje):
+        print(f"Error al contar registros: {mensaje}")
+        self.status_label.setText("No se pudo contar los registros.")
+    
+    def update_heatmap(self):
+        """Muestra la ocupación por día y franja horaria del laboratorio del último filtro"""
+        laboratorio_id = self.current_filters.get("laboratorio_id")
+        if not laboratorio_id:
+            self.heatmap.clear()
+            self.heatmap_label.setText("Seleccione un laboratorio y pulse Filtrar para ver su ocupación.")
+            return
+        
+        slot_minutes = self.slot_combo.currentData()
+        try:
+            with session_scope() as db:
+                matriz = utilization_cache.get(db, laboratorio_id, self.current_filters.get("periodo_id"),
+                                               slot_minutes)
+        except Exception as e:
+            print(f"Error al calcular la ocupación: {str(e)}")
+            return
+        
+        if matriz is None:
+            self.heatmap.clear()
+            self.heatmap_label.setText("El laboratorio no tiene registros.")
+            return
+        
+        columnas = [f"{i * slot_minutes // 60:02d}:{i * slot_minutes % 60:02d}"
+                    for i in range(matriz.utilizacion.shape[1])]
+        
+        def tooltip(fila, columna):
+            return (f"{DIAS_SEMANA[fila]} {columnas[columna]}: "
+                    f"{matriz.utilizacion[fila, columna]:.0%} ocupado "
+                    f"({int(matriz.minutos[fila, columna])} min en {int(matriz.dias[fila])} días)")
+        
+        self.heatmap.set_matrix(matriz.utilizacion, DIAS_SEMANA, columnas, tooltip)
+        self.heatmap_label.setText(
+            f"Del {matriz.fecha_inicio.strftime('%d/%m/%Y')} al {matriz.fecha_fin.strftime('%d/%m/%Y')}: "
+            f"ocupación promedio {matriz.utilizacion.mean():.0%}, máxima {matriz.utilizacion.max():.0%}"
+        )
+    
     def ignore_wheel_event(self, event):
         """Ignora eventos de rueda de mouse para evitar cambios accidentales"""
         event.ignore()
@@ -316,9 +416,7 @@ class VisualizacionTab(QWidget):
         self.periodo_combo.clear()
         self.periodo_combo.addItem("-- Todos --", None)
         
-        db = get_db()
-        periodos = db.query(Periodo).all()
-        for periodo in periodos:
+        for periodo in catalog.periodos():
             self.periodo_combo.addItem(periodo.nombre, periodo.id)
         
         # Intentar restaurar la selección anterior
@@ -328,14 +426,32 @@ class VisualizacionTab(QWidget):
                     self.periodo_combo.setCurrentIndex(i)
                     break 
 
+    def report_info(self):
+        """Textos de la cabecera del reporte según los filtros seleccionados"""
+        laboratorio = "N/A"
+        if self.lab_combo.currentText() != "-- Todos --":
+            laboratorio = self.lab_combo.currentText().upper()
+        
+        periodo = "N/A"
+        if self.periodo_combo.currentText() != "-- Todos --":
+            periodo = self.periodo_combo.currentText()
+        
+        docente = "N/A"
+        if self.docente_combo.currentText() != "-- Todos --":
+            docente = f"Ing. {self.docente_combo.currentText()}"
+        
+        carrera = "N/A"
+        if self.carrera_combo.currentText() != "-- Todas --":
+            carrera = self.carrera_combo.currentText()
+        
+        return ReportInfo(laboratorio, periodo, docente, carrera)
+    
     def print_report(self):
-        """Imprime el reporte en PDF con formato de tabla mejorado"""
+        """Genera el reporte en PDF con formato de tabla mejorado en segundo plano"""
+        if self.report_worker is not None:
+            return
+        
         try:
-            printer = QPrinter(QPrinter.HighResolution)
-            printer.setPageSize(QPageSize(QPageSize.A4))
-            printer.setPageOrientation(QPageLayout.Landscape)
-            printer.setOutputFormat(QPrinter.PdfFormat)
-            
             file_dialog = QFileDialog()
             file_path, _ = file_dialog.getSaveFileName(
                 self, 
@@ -347,404 +463,212 @@ class VisualizacionTab(QWidget):
             if not file_path:
                 return
             
-            printer.setOutputFileName(file_path)
+            # El worker lee de la base de datos todos los registros del último filtro
+            # aplicado, ya ordenados por fecha, sin depender de las filas cargadas en la tabla
+            self.report_worker = ReportWorker(file_path, dict(self.current_filters), self.report_info())
+            self.report_worker.progress.connect(self.on_report_progress)
+            self.report_worker.finished.connect(self.on_report_finished)
+            self.report_worker.cancelled.connect(self.on_report_cancelled)
+            self.report_worker.failed.connect(self.on_report_failed)
             
-            # Obtener registros de la tabla filtrada
-            registros_filtrados = []
-            for row in range(self.results_table.rowCount()):
-                docente = self.results_table.item(row, 0).text() if self.results_table.item(row, 0) else ""
-                actividad = self.results_table.item(row, 1).text() if self.results_table.item(row, 1) else ""
-                hora_entrada = self.results_table.item(row, 2).text() if self.results_table.item(row, 2) else ""
-                hora_salida = self.results_table.item(row, 3).text() if self.results_table.item(row, 3) else ""
-                fecha = self.results_table.item(row, 4).text() if self.results_table.item(row, 4) else ""
-                
-                registros_filtrados.append({
-                    'docente': docente,
-                    'actividad': actividad,
-                    'hora_entrada': hora_entrada,
-                    'hora_salida': hora_salida,
-                    'fecha': fecha
-                })
-            
-            # Ordenar registros por fecha (de más antigua a más reciente)
-            registros_filtrados.sort(key=lambda x: datetime.strptime(x['fecha'], "%d/%m/%Y"))
-            
-            # Calcular número de páginas necesarias
-            registros_por_pagina = 9  # Aumentado de 7 a 9 celdas por página
-            total_paginas = max(1, (len(registros_filtrados) + registros_por_pagina - 1) // registros_por_pagina)
-            
-            # Iniciar el painter
-            painter = QPainter()
-            if not painter.begin(printer):
-                QMessageBox.critical(self, "Error", "No se pudo iniciar la impresión.")
+            self.set_report_running(True)
+            self.report_thread = start_worker(self.report_worker, self)
+            
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Error al generar el PDF: {str(e)}")
+    
+    def print_period_reports(self):
+        """Genera en una carpeta un PDF por cada laboratorio/docente del período seleccionado"""
+        if self.report_worker is not None:
+            return
+        
+        periodo_id = self.periodo_combo.currentData()
+        if not periodo_id:
+            QMessageBox.warning(self, "Advertencia", "Seleccione un período para generar sus reportes.")
+            return
+        
+        try:
+            output_dir = QFileDialog.getExistingDirectory(
+                self,
+                "Carpeta para los reportes del período",
+                QDir.homePath()
+            )
+            
+            if not output_dir:
                 return
             
-            try:
-                for pagina_actual in range(total_paginas):
-                    # Si no es la primera página, comenzar una nueva
-                    if pagina_actual > 0:
-                        printer.newPage()
-                    
-                    # Obtener medidas de página - CORRECCIÓN DEL ERROR
-                    page_rect = printer.pageRect(QPrinter.DevicePixel)
-                    page_width = page_rect.width()
-                    
-                    # ===== TÍTULOS CENTRADOS =====
-                    # Título principal
-                    painter.setFont(QFont("Cambria", 16, QFont.Bold))
-                    
-                    title = "ESCUELA SUPERIOR POLITÉCNICA DE CHIMBORAZO"
-                    title_metrics = painter.fontMetrics()
-                    title_width = title_metrics.horizontalAdvance(title)
-                    title_x = (page_width - title_width) / 2
-                    title_y = 250
-                    
-                    painter.drawText(int(title_x), title_y, title)
-                    
-                    # Definir espaciado vertical constante para todo el documento
-                    vertical_spacing = 300  # Usar el mismo espaciado en todo el documento
-                    
-                    # Subtítulo - Facultad
-                    painter.setFont(QFont("Cambria", 14, QFont.Bold))
-                    
-                    subtitle = "FACULTAD DE MECÁNICA"
-                    subtitle_metrics = painter.fontMetrics()
-                    subtitle_width = subtitle_metrics.horizontalAdvance(subtitle)
-                    subtitle_x = (page_width - subtitle_width) / 2
-                    subtitle_y = title_y + vertical_spacing
-                    
-                    painter.drawText(int(subtitle_x), subtitle_y, subtitle)
-                    
-                    # Tercer título - Laboratorio
-                    painter.setFont(QFont("Cambria", 12, QFont.Bold))
-                    
-                    lab_name = "N/A"  # Valor por defecto cambiado de "METROLOGÍA" a "N/A"
-                    if self.lab_combo.currentText() != "-- Todos --":
-                        lab_name = self.lab_combo.currentText().upper()
-                        
-                    lab_title = f"LABORATORIO DE {lab_name}"
-                    lab_metrics = painter.fontMetrics()
-                    lab_width = lab_metrics.horizontalAdvance(lab_title)
-                    lab_x = (page_width - lab_width) / 2
-                    lab_y = subtitle_y + vertical_spacing
-                    
-                    painter.drawText(int(lab_x), lab_y, lab_title)
-                    
-                    # ===== MARGEN IZQUIERDO FIJO EN 12CM =====
-                    left_margin = 460  # 12cm desde el borde izquierdo
-                    
-                    # ===== PERÍODO =====
-                    periodo_y = lab_y + vertical_spacing + 152 + 228  # Posición del período
-                    
-                    # "PERÍODO:" en negrita y cursiva
-                    font_periodo_label = QFont("Cambria", 11)
-                    font_periodo_label.setBold(True)
-                    font_periodo_label.setItalic(True)
-                    painter.setFont(font_periodo_label)
-                    
-                    # Dibujar "PERÍODO:" con margen izquierdo ajustado
-                    painter.drawText(left_margin, periodo_y, "PERÍODO:")
-                    
-                    # Medir el ancho de "PERÍODO:" para posicionar el valor
-                    label_width = painter.fontMetrics().horizontalAdvance("PERÍODO:")
-                    
-                    # Configurar fuente para el valor del período (solo cursiva)
-                    font_periodo_valor = QFont("Cambria", 11)
-                    font_periodo_valor.setItalic(True)
-                    font_periodo_valor.setBold(False)
-                    painter.setFont(font_periodo_valor)
-                    
-                    # Obtener el período seleccionado
-                    periodo_texto = "N/A"
-                    if self.periodo_combo.currentText() != "-- Todos --":
-                        periodo_texto = self.periodo_combo.currentText()
-                    
-                    # Dibujar el valor del período con DOS ESPACIOS adicionales
-                    espacio_width = painter.fontMetrics().horizontalAdvance("  ")
-                    
-                    # Dibujar el valor con los dos espacios adicionales
-                    painter.drawText(left_margin + label_width + espacio_width, periodo_y, periodo_texto)
-                    
-                    # ===== DOCENTE (después de período con el mismo espaciado) =====
-                    docente_y = periodo_y + vertical_spacing  # Mismo espaciado que entre títulos
-                    
-                    # Resetear completamente el painter para eliminar cualquier efecto residual
-                    painter.resetTransform()
-                    painter.save()
-                    painter.restore()
-                    painter.setPen(QPen(Qt.black))
-                    painter.setBrush(Qt.NoBrush)
-                    
-                    # "DOCENTE:" en negrita y cursiva (mismo formato que PERÍODO)
-                    font_docente_label = QFont("Cambria", 11)
-                    font_docente_label.setBold(True)
-                    font_docente_label.setItalic(True)
-                    painter.setFont(font_docente_label)
-                    
-                    # Limpiar cualquier efecto de renderizado previo
-                    painter.setOpacity(1.0)
-                    painter.setCompositionMode(QPainter.CompositionMode_SourceOver)
-                    
-                    # Dibujar "DOCENTE:" con el mismo margen izquierdo
-                    painter.drawText(left_margin, docente_y, "DOCENTE:")
-                    
-                    # Medir el ancho de "DOCENTE:" para posicionar el valor
-                    docente_label_width = painter.fontMetrics().horizontalAdvance("DOCENTE:")
-                    
-                    # Configurar fuente para el valor del docente (solo cursiva)
-                    font_docente_valor = QFont("Cambria", 11)
-                    font_docente_valor.setItalic(True)
-                    font_docente_valor.setBold(False)
-                    painter.setFont(font_docente_valor)
-                    
-                    # Obtener el docente seleccionado
-                    docente_texto = "N/A"
-                    if self.docente_combo.currentText() != "-- Todos --":
-                        docente_texto = f"Ing. {self.docente_combo.currentText()}"
-                    
-                    # Dibujar el valor del docente con DOS ESPACIOS adicionales
-                    painter.drawText(left_margin + docente_label_width + espacio_width, docente_y, docente_texto)
-                    
-                    # ===== CARRERA (después de docente con el mismo espaciado) =====
-                    carrera_y = docente_y + vertical_spacing  # Mismo espaciado que entre los campos anteriores
-                    
-                    # "CARRERA:" en negrita y cursiva (mismo formato que PERÍODO y DOCENTE)
-                    font_carrera_label = QFont("Cambria", 11)
-                    font_carrera_label.setBold(True)
-                    font_carrera_label.setItalic(True)
-                    painter.setFont(font_carrera_label)
-                    
-                    # Dibujar "CARRERA:" con el mismo margen izquierdo
-                    painter.drawText(left_margin, carrera_y, "CARRERA:")
-                    
-                    # Medir el ancho de "CARRERA:" para posicionar el valor
-                    carrera_label_width = painter.fontMetrics().horizontalAdvance("CARRERA:")
-                    
-                    # Configurar fuente para el valor de la carrera (solo cursiva)
-                    font_carrera_valor = QFont("Cambria", 11)
-                    font_carrera_valor.setItalic(True)
-                    font_carrera_valor.setBold(False)
-                    painter.setFont(font_carrera_valor)
-                    
-                    # Obtener la carrera seleccionada
-                    carrera_texto = "N/A"
-                    if self.carrera_combo.currentText() != "-- Todas --":
-                        carrera_texto = self.carrera_combo.currentText()
-                    
-                    # Dibujar el valor de la carrera con DOS ESPACIOS adicionales
-                    painter.drawText(left_margin + carrera_label_width + espacio_width, carrera_y, carrera_texto)
-                    
-                    # ===== TABLA DE REGISTROS =====
-                    # Posición inicial de la tabla (después de la información de carrera)
-                    table_y = carrera_y + 200  # 200px después de carrera
-                    
-                    # Asegurar que cualquier configuración anterior no afecte nuestro dibujo
-                    painter.resetTransform()
-                    painter.setPen(QPen(Qt.black, 1, Qt.SolidLine))
-                    
-                    # Calcular anchos de columna (proporcional al contenido típico)
-                    table_left = 80  # 2cm desde el borde izquierdo
-                    table_width = page_width - table_left - 80  # Ancho hasta el margen derecho
-                    
-                    col_widths = [
-                        int(table_width * 0.35),  # Actividades (35%)
-                        int(table_width * 0.15),  # Fecha (15%)
-                        int(table_width * 0.15),  # Hora Entrada (15%)
-                        int(table_width * 0.15),  # Hora Salida (15%)
-                        int(table_width * 0.20)   # Firma (20%)
-                    ]
-                    
-                    # Altura de la fila de encabezados
-                    header_height = 456  # 12cm (para encabezados)
-                    
-                    # Altura de las filas de datos
-                    data_row_height = 532  # 14cm (para filas de datos)
-                    
-                    # Obtener registros para esta página
-                    inicio_rango = pagina_actual * registros_por_pagina
-                    fin_rango = min(inicio_rango + registros_por_pagina, len(registros_filtrados))
-                    registros_pagina = registros_filtrados[inicio_rango:fin_rango]
-                    
-                    # Número de filas de datos en esta página (máximo 9)
-                    num_filas_datos = len(registros_pagina)
-                    # Si no hay registros, mostramos una fila vacía
-                    if num_filas_datos == 0:
-                        num_filas_datos = 1
-                    
-                    # Altura total de la tabla (encabezado + filas de datos)
-                    table_height = header_height + (data_row_height * num_filas_datos)
-                    
-                    # Dibujar el borde exterior de toda la tabla
-                    painter.setPen(QPen(Qt.black, 2))  # Borde exterior más grueso
-                    painter.drawRect(table_left, table_y, table_width, table_height)
-                    
-                    # Volver al trazo normal para las líneas interiores
-                    painter.setPen(QPen(Qt.black, 1))
-                    
-                    # ===== 1. DIBUJAR FILA DE ENCABEZADOS =====
-                    header_texts = ["Actividades", "Fecha", "Hora Entrada", "Hora Salida", "Firma"]
-                    
-                    # Fuente para encabezados
-                    header_font = QFont("Cambria", 12)
-                    header_font.setBold(True)
-                    painter.setFont(header_font)
-                    
-                    # Dibujar fila de encabezados
-                    x_pos = table_left
-                    for i, col_width in enumerate(col_widths):
-                        # Dibujar fondo gris para encabezados
-                        painter.setBrush(Qt.lightGray)
-                        painter.drawRect(x_pos, table_y, col_width, header_height)
-                        painter.setBrush(Qt.NoBrush)
-                        
-                        # Centrar texto en la celda
-                        header = header_texts[i]
-                        fm = painter.fontMetrics()
-                        text_width = fm.horizontalAdvance(header)
-                        text_height = fm.height()
-                        
-                        # Centrado normal para todas las columnas
-                        text_x = x_pos + (col_width - text_width) / 2
-                        text_y = table_y + (header_height / 2) + (text_height / 2) - fm.descent()
-                        painter.drawText(int(text_x), int(text_y), header)
-                        
-                        x_pos += col_width
-                    
-                    # Dibujar línea horizontal separando encabezados de datos
-                    painter.drawLine(table_left, table_y + header_height, 
-                                    table_left + table_width, table_y + header_height)
-                    
-                    # ===== 2. DIBUJAR FILAS DE DATOS (14cm cada una) =====
-                    # Fuente para datos
-                    data_font = QFont("Cambria", 11)
-                    painter.setFont(data_font)
-                    
-                    # Dibujar cada fila de datos o celdas vacías
-                    for fila in range(num_filas_datos):
-                        # Posición Y de esta fila de datos
-                        fila_y = table_y + header_height + (fila * data_row_height)
-                        
-                        # Dibujar celdas de esta fila
-                        x_pos = table_left
-                        for col, col_width in enumerate(col_widths):
-                            # Dibujar borde de celda
-                            painter.drawRect(x_pos, fila_y, col_width, data_row_height)
-                            
-                            # Si hay datos para esta celda, mostrarlos
-                            if fila < len(registros_pagina):
-                                registro = registros_pagina[fila]
-                                
-                                if col == 0:  # Actividad
-                                    texto = registro['actividad']
-                                    # Alineado a la izquierda con ajuste de texto automático
-                                    if texto:
-                                        # Crear un rectángulo donde dibujar el texto con margen
-                                        text_rect = QRectF(x_pos + 10, fila_y + 10, col_width - 20, data_row_height - 20)
-                                        # Dibujar texto con ajuste automático
-                                        painter.drawText(text_rect, Qt.AlignLeft | Qt.AlignVCenter | Qt.TextWordWrap, texto)
-                                
-                                elif col == 1:  # Fecha
-                                    texto = registro['fecha'] if 'fecha' in registro else ""
-                                    # Centrada
-                                    if texto:
-                                        fm = painter.fontMetrics()
-                                        text_width = fm.horizontalAdvance(texto)
-                                        text_height = fm.height()
-                                        text_x = x_pos + (col_width - text_width) / 2
-                                        text_y = fila_y + (data_row_height / 2) + (text_height / 2) - fm.descent()
-                                        painter.drawText(int(text_x), int(text_y), texto)
-                                
-                                elif col == 2:  # Hora Entrada
-                                    texto = registro['hora_entrada']
-                                    # Centrada
-                                    if texto:
-                                        fm = painter.fontMetrics()
-                                        text_width = fm.horizontalAdvance(texto)
-                                        text_height = fm.height()
-                                        text_x = x_pos + (col_width - text_width) / 2
-                                        text_y = fila_y + (data_row_height / 2) + (text_height / 2) - fm.descent()
-                                        painter.drawText(int(text_x), int(text_y), texto)
-                                
-                                elif col == 3:  # Hora Salida
-                                    texto = registro['hora_salida']
-                                    # Centrada
-                                    if texto:
-                                        fm = painter.fontMetrics()
-                                        text_width = fm.horizontalAdvance(texto)
-                                        text_height = fm.height()
-                                        text_x = x_pos + (col_width - text_width) / 2
-                                        text_y = fila_y + (data_row_height / 2) + (text_height / 2) - fm.descent()
-                                        painter.drawText(int(text_x), int(text_y), texto)
-                            
-                            # Avanzar a la siguiente columna
-                            x_pos += col_width
-                        
-                        # Dibujar líneas verticales para todas las columnas
-                        x_acumulado = table_left
-                        for i in range(len(col_widths) - 1):
-                            x_acumulado += col_widths[i]
-                            painter.drawLine(x_acumulado, table_y, 
-                                            x_acumulado, table_y + table_height)
-                        
-                    # ===== FIRMA DEL TÉCNICO EN LA PARTE INFERIOR =====
-                    # Posición base desde la parte inferior (para el cargo)
-                    bottom_margin = page_rect.height() - 608  # 16cm desde abajo
-
-                    # Posición del nombre del técnico (6cm más arriba que el cargo)
-                    nombre_y = bottom_margin - 228  # 6cm = 228px
-
-                    # Fuente para el nombre del técnico
-                    firma_font = QFont("Cambria", 11)
-                    firma_font.setBold(True)
-                    painter.setFont(firma_font)
-
-                    # Dibujar el nombre del técnico centrado más arriba
-                    nombre_tecnico = "Ing. Félix Ruiz M."
-                    nombre_width = painter.fontMetrics().horizontalAdvance(nombre_tecnico)
-                    nombre_x = (page_width - nombre_width) / 2
-                    painter.drawText(int(nombre_x), nombre_y, nombre_tecnico)
-
-                    # Fuente para el cargo (sin negrita)
-                    cargo_font = QFont("Cambria", 11)
-                    painter.setFont(cargo_font)
-
-                    # Dibujar el cargo centrado en su posición original
-                    cargo_tecnico = "Técnico de Laboratorio"
-                    cargo_width = painter.fontMetrics().horizontalAdvance(cargo_tecnico)
-                    cargo_x = (page_width - cargo_width) / 2
-                    cargo_y = bottom_margin + 40  # Mantener posición original
-                    painter.drawText(int(cargo_x), cargo_y, cargo_tecnico)
-            
-            finally:
-                painter.end()
-                
-            QMessageBox.information(
-                self, 
-                "PDF Generado", 
-                f"El reporte ha sido generado correctamente en {total_paginas} página(s)."
+            self.report_worker = BatchReportWorker(periodo_id, output_dir)
+            self.report_worker.progress.connect(self.on_batch_progress)
+            self.report_worker.finished.connect(self.on_batch_finished)
+            self.report_worker.cancelled.connect(self.on_report_cancelled)
+            self.report_worker.failed.connect(self.on_report_failed)
+            
+            self.set_report_running(True)
+            self.report_thread = start_worker(self.report_worker, self)
+            
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Error al generar los reportes: {str(e)}")
+    
+    def export_data(self):
+        """Exporta a CSV, Parquet o Excel los registros del último filtro en segundo plano"""
+        if self.report_worker is not None:
+            return
+        
+        try:
+            # Solo se ofrecen los formatos cuya librería está instalada
+            formatos = available_formats()
+            file_path, selected_filter = QFileDialog.getSaveFileName(
+                self,
+                "Exportar Registros",
+                QDir.homePath() + "/registros_laboratorio.csv",
+                ";;".join(filtro for _, filtro, _ in formatos)
             )
             
-            # Abrir automáticamente el PDF generado
-            QDesktopServices.openUrl(QUrl.fromLocalFile(file_path))
+            if not file_path:
+                return
+            
+            # La extensión escrita manda; si no tiene, se usa la del filtro elegido
+            formato = format_for_path(file_path)
+            if formato is None:
+                formato = next((clave for clave, filtro, _ in formatos if filtro == selected_filter), "csv")
+                file_path += f".{formato}"
+            
+            self.report_worker = ExportWorker(file_path, formato, dict(self.current_filters))
+            self.report_worker.progress.connect(self.on_export_progress)
+            self.report_worker.finished.connect(self.on_export_finished)
+            self.report_worker.cancelled.connect(self.on_export_cancelled)
+            self.report_worker.failed.connect(self.on_export_failed)
+            
+            self.set_report_running(True)
+            self.report_thread = start_worker(self.report_worker, self)
             
         except Exception as e:
-            QMessageBox.critical(self, "Error", f"Error al generar el PDF: {str(e)}") 
+            QMessageBox.critical(self, "Error", f"Error al exportar los registros: {str(e)}")
+    
+    def set_report_running(self, running):
+        """Muestra u oculta el progreso del reporte y bloquea los botones de imprimir"""
+        self.print_btn.setEnabled(not running)
+        self.batch_report_btn.setEnabled(not running)
+        self.export_btn.setEnabled(not running)
+        self.report_progress.setVisible(running)
+        self.cancel_report_btn.setVisible(running)
+        self.cancel_report_btn.setEnabled(running)
+        if running:
+            self.report_progress.setRange(0, 0)  # Indeterminado hasta la primera página
+    
+    def on_report_progress(self, pagina, total_paginas):
+        """Actualiza la barra de progreso con las páginas generadas"""
+        self.report_progress.setRange(0, total_paginas)
+        self.report_progress.setValue(pagina)
+        self.report_progress.setFormat(f"Página {pagina} de {total_paginas}")
+    
+    def on_batch_progress(self, terminados, total):
+        """Actualiza la barra de progreso con los documentos generados"""
+        self.report_progress.setRange(0, total)
+        self.report_progress.setValue(terminados)
+        self.report_progress.setFormat(f"Documento {terminados} de {total}")
+    
+    def on_export_progress(self, escritos, total):
+        """Actualiza la barra de progreso con los registros exportados"""
+        self.report_progress.setRange(0, max(total, escritos))
+        self.report_progress.setValue(escritos)
+        self.report_progress.setFormat(f"Registro {escritos} de {total}")
+    
+    def cancel_report(self):
+        """Solicita la cancelación del reporte en curso"""
+        if self.report_worker:
+            self.report_worker.cancel()
+            self.cancel_report_btn.setEnabled(False)
+    
+    def on_report_finished(self, file_path, total_paginas):
+        self.report_finished_cleanup()
+        QMessageBox.information(
+            self, 
+            "PDF Generado", 
+            f"El reporte ha sido generado correctamente en {total_paginas} página(s)."
+        )
+        
+        # Abrir automáticamente el PDF generado
+        QDesktopServices.openUrl(QUrl.fromLocalFile(file_path))
+    
+    def on_batch_finished(self, resumen, resultados):
+        self.report_finished_cleanup()
+        if not resultados:
+            QMessageBox.information(self, "Reportes del Período", "El período no tiene registros.")
+            return
+        
+        fallidos = [resultado for resultado in resultados if resultado.error]
+        paginas = sum(resultado.paginas for resultado in resultados)
+        mensaje = (f"Se generaron {len(resultados) - len(fallidos)} reporte(s) con {paginas} página(s) "
+                   f"en total.\nResumen: {resumen}")
+        if fallidos:
+            mensaje += f"\n\n{len(fallidos)} reporte(s) no se pudieron generar; ver el resumen."
+            QMessageBox.warning(self, "Reportes del Período", mensaje)
+        else:
+            QMessageBox.information(self, "Reportes del Período", mensaje)
+        
+        # Abrir la carpeta con los reportes
+        QDesktopServices.openUrl(QUrl.fromLocalFile(os.path.dirname(resumen)))
+    
+    def on_report_cancelled(self):
+        self.report_finished_cleanup()
+        QMessageBox.information(self, "Reporte cancelado", "La generación del reporte fue cancelada.")
+    
+    def on_report_failed(self, message):
+        self.report_finished_cleanup()
+        QMessageBox.critical(self, "Error", f"Error al generar el PDF: {message}")
+    
+    def on_export_finished(self, resultado):
+        self.report_finished_cleanup()
+        QMessageBox.information(
+            self,
+            "Exportación terminada",
+            f"Se exportaron {resultado.filas} registro(s) en {resultado.segundos:.1f} s a:\n{resultado.file_path}"
+        )
+    
+    def on_export_cancelled(self):
+        self.report_finished_cleanup()
+        QMessageBox.information(self, "Exportación cancelada", "La exportación fue cancelada.")
+    
+    def on_export_failed(self, message):
+        self.report_finished_cleanup()
+        QMessageBox.critical(self, "Error", f"Error al exportar los registros: {message}")
+    
+    def report_finished_cleanup(self):
+        """Libera el worker y restablece los controles del reporte"""
+        self.report_worker = None
+        self.report_thread = None
+        self.set_report_running(False)
 
     def delete_selected_records(self):
         """Elimina los registros seleccionados de la base de datos"""
         try:
             # Obtener las filas seleccionadas
-            selected_rows = sorted([index.row() for index in self.results_table.selectedIndexes() if index.column() == 0], reverse=True)
+            selected_rows = sorted([index.row() for index in self.results_table.selectionModel().selectedRows()], reverse=True)
             
             if not selected_rows:
                 QMessageBox.information(self, "Información", "No hay registros seleccionados para eliminar.")
                 return
             
+            # Una página vuelta a leer puede ser más corta si los datos cambiaron: en ese
+            # caso la selección ya no corresponde a lo que el usuario vio
+            registro_ids = [self.results_model.registro_id(row) for row in set(selected_rows)]
+            if None in registro_ids:
+                QMessageBox.warning(
+                    self,
+                    "Selección desactualizada",
+                    "Los registros cambiaron desde que se cargó la tabla y la selección ya no "
+                    "corresponde a los datos mostrados. No se eliminó ningún registro; "
+                    "la tabla se actualizará para que vuelva a seleccionarlos."
+                )
+                self.filter_data()
+                return
+            
             # Confirmar la eliminación
             confirmation = QMessageBox.question(
                 self,
                 "Confirmar eliminación",
-                f"¿Está seguro de que desea eliminar {len(set(selected_rows))} registro(s)?",
+                f"¿Está seguro de que desea eliminar {len(registro_ids)} registro(s)?",
                 QMessageBox.Yes | QMessageBox.No,
                 QMessageBox.No
             )
@@ -752,39 +676,29 @@ class VisualizacionTab(QWidget):
             if confirmation == QMessageBox.No:
                 return
             
-            # Eliminar registros de la base de datos
-            db = get_db()
+            # Eliminar registros de la base de datos; session_scope revierte si algo falla
             try:
                 deleted_count = 0
-                for row in set(selected_rows):
-                    # Obtener el ID del registro correspondiente a esta fila
-                    if row < len(self.registro_ids):
-                        registro_id = self.registro_ids[row]
-                        
+                with session_scope() as db:
+                    for registro_id in registro_ids:
                         # Eliminar de la base de datos
                         registro = db.query(RegistroUso).filter(RegistroUso.id == registro_id).first()
                         if registro:
                             db.delete(registro)
                             deleted_count += 1
-                
-                # Confirmar la transacción
-                db.commit()
+                utilization_cache.invalidate()
                 
                 # Mostrar mensaje de éxito
-                QMessageBox.information(
-                    self,
-                    "Eliminación exitosa",
-                    f"Se eliminaron {deleted_count} registro(s) correctamente."
-                )
+                mensaje = f"Se eliminaron {deleted_count} registro(s) correctamente."
+                if deleted_count < len(registro_ids):
+                    mensaje += f"\n{len(registro_ids) - deleted_count} ya habían sido eliminados."
+                QMessageBox.information(self, "Eliminación exitosa", mensaje)
                 
                 # Actualizar la vista
                 self.filter_data()
                 
             except Exception as e:
-                db.rollback()
                 QMessageBox.critical(self, "Error", f"Error al eliminar registros: {str(e)}")
-            finally:
-                db.close()
                 
         except Exception as e:
-            QMessageBox.critical(self, "Error", f"Error durante la eliminación: {str(e)}") 
\ No newline at end of file
+            QMessageBox.critical(self, "Error", f"Error durante la eliminación: {str(e)}") 
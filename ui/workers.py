@@ -0,0 +1,233 @@
+from PySide6.QtCore import QObject, QThread, Signal
+
+from database.database import session_scope, remove_thread_session
+from database.importer import import_csv, count_csv_rows, ImportCancelled
+from database.queries import report_query, iter_report_rows, count_registros
+
+
+class CsvImportWorker(QObject):
+    """Ejecuta la importación CSV fuera del hilo de la interfaz"""
+
+    # (filas leídas, filas insertadas, filas rechazadas, filas/s, total de filas)
+    progress = Signal(int, int, int, float, int)
+    finished = Signal(object)  # ImportResult
+    cancelled = Signal()
+    failed = Signal(str)
+
+    def __init__(self, file_path, periodo_id, laboratorio_id, docente_id, skip_duplicates=True,
+                 reject_overlaps=True):
+        super().__init__()
+        self.file_path = file_path
+        self.periodo_id = periodo_id
+        self.laboratorio_id = laboratorio_id
+        self.docente_id = docente_id
+        self.skip_duplicates = skip_duplicates
+        self.reject_overlaps = reject_overlaps
+        self.total_rows = 0
+        self._cancel_requested = False
+
+    def cancel(self):
+        """Solicita la cancelación; se atiende al terminar el bloque en curso"""
+        self._cancel_requested = True
+
+    def run(self):
+        try:
+            self.total_rows = count_csv_rows(self.file_path)
+            resultado = import_csv(
+                self.file_path,
+                self.periodo_id,
+                self.laboratorio_id,
+                self.docente_id,
+                progress_callback=self._report_progress,
+                should_cancel=lambda: self._cancel_requested,
+                skip_duplicates=self.skip_duplicates,
+                reject_overlaps=self.reject_overlaps
+            )
+            self.finished.emit(resultado)
+        except ImportCancelled:
+            self.cancelled.emit()
+        except Exception as e:
+            self.failed.emit(str(e))
+
+    def _report_progress(self, avance):
+        self.progress.emit(avance.parsed, avance.inserted, avance.rejected,
+                           avance.rows_per_second, self.total_rows)
+
+
+class ReportWorker(QObject):
+    """Genera el reporte PDF fuera del hilo de la interfaz
+
+    Los registros se leen de la base de datos en el propio hilo del worker con los
+    filtros indicados (ver database.queries.report_query), ya ordenados por fecha, y se
+    dibujan a medida que llegan del cursor.
+    """
+
+    progress = Signal(int, int)  # (página generada, total de páginas)
+    finished = Signal(str, int)  # (ruta del PDF, páginas)
+    cancelled = Signal()
+    failed = Signal(str)
+
+    def __init__(self, file_path, filtros, info):
+        super().__init__()
+        self.file_path = file_path
+        self.filtros = filtros
+        self.info = info
+        self._cancel_requested = False
+
+    def cancel(self):
+        """Solicita la cancelación; se atiende al terminar la página en curso"""
+        self._cancel_requested = True
+
+    def run(self):
+        # El generador de PDF (QtPrintSupport) se carga al pedir el primer reporte
+        from .report_renderer import render_report, report_row, ReportCancelled
+
+        try:
+            with session_scope() as db:
+                query = report_query(db, **self.filtros)
+                total_registros = query.order_by(None).count()
+                registros = (report_row(registro) for registro in iter_report_rows(query))
+                paginas = render_report(
+                    self.file_path,
+                    registros,
+                    self.info,
+                    total_registros=total_registros,
+                    progress_callback=self.progress.emit,
+                    should_cancel=lambda: self._cancel_requested
+                )
+            self.finished.emit(self.file_path, paginas)
+        except ReportCancelled:
+            self.cancelled.emit()
+        except Exception as e:
+            self.failed.emit(str(e))
+        finally:
+            # La sesión de este hilo no se vuelve a usar
+            remove_thread_session()
+
+
+class BatchReportWorker(QObject):
+    """Genera los reportes de todos los laboratorios/docentes de un período
+
+    Los documentos se dibujan en un pool de procesos (ver ui.report_batch); este
+    worker solo espera los resultados para no bloquear la interfaz.
+    """
+
+    progress = Signal(int, int)  # (documentos terminados, total de documentos)
+    finished = Signal(str, object)  # (ruta del resumen, lista de BatchResult)
+    cancelled = Signal()
+    failed = Signal(str)
+
+    def __init__(self, periodo_id, output_dir):
+        super().__init__()
+        self.periodo_id = periodo_id
+        self.output_dir = output_dir
+        self._cancel_requested = False
+
+    def cancel(self):
+        """Solicita la cancelación; los documentos en curso se terminan"""
+        self._cancel_requested = True
+
+    def run(self):
+        # El pool de procesos y el generador de PDF se cargan al pedir el lote
+        from .report_batch import generate_period_reports
+        from .report_renderer import ReportCancelled
+
+        try:
+            resumen, resultados = generate_period_reports(
+                self.periodo_id,
+                self.output_dir,
+                progress_callback=self.progress.emit,
+                should_cancel=lambda: self._cancel_requested
+            )
+            self.finished.emit(resumen, resultados)
+        except ReportCancelled:
+            self.cancelled.emit()
+        except Exception as e:
+            self.failed.emit(str(e))
+        finally:
+            remove_thread_session()
+
+
+class ExportWorker(QObject):
+    """Exporta los registros filtrados a CSV, Parquet o Excel fuera del hilo de la interfaz"""
+
+    progress = Signal(int, int)  # (registros escritos, total de registros)
+    finished = Signal(object)  # ExportResult
+    cancelled = Signal()
+    failed = Signal(str)
+
+    def __init__(self, file_path, formato, filtros):
+        super().__init__()
+        self.file_path = file_path
+        self.formato = formato
+        self.filtros = filtros
+        self._cancel_requested = False
+
+    def cancel(self):
+        """Solicita la cancelación; se atiende al terminar el bloque en curso"""
+        self._cancel_requested = True
+
+    def run(self):
+        from database.export import export_registros, ExportCancelled
+
+        try:
+            resultado = export_registros(
+                self.file_path,
+                self.formato,
+                progress_callback=self.progress.emit,
+                should_cancel=lambda: self._cancel_requested,
+                **self.filtros
+            )
+            self.finished.emit(resultado)
+        except ExportCancelled:
+            self.cancelled.emit()
+        except Exception as e:
+            self.failed.emit(str(e))
+        finally:
+            remove_thread_session()
+
+
+class CountWorker(QObject):
+    """Cuenta los registros filtrados de la Visualización fuera del hilo de la interfaz
+
+    La generación identifica el filtrado que pidió el conteo, para descartar los
+    resultados de filtros que ya se reemplazaron.
+    """
+
+    finished = Signal(int, int)  # (generación, total de registros)
+    failed = Signal(str)
+
+    def __init__(self, generacion, filtros):
+        super().__init__()
+        self.generacion = generacion
+        self.filtros = filtros
+
+    def run(self):
+        try:
+            with session_scope() as db:
+                total = count_registros(db, **self.filtros)
+            self.finished.emit(self.generacion, total)
+        except Exception as e:
+            self.failed.emit(str(e))
+        finally:
+            remove_thread_session()
+
+
+def start_worker(worker, parent=None):
+    """Mueve el worker a un QThread nuevo, lo arranca y devuelve el hilo
+
+    El hilo termina y ambos objetos se liberan cuando el worker emite
+    finished, failed o, si el worker se puede cancelar, cancelled.
+    """
+    thread = QThread(parent)
+    worker.moveToThread(thread)
+    thread.started.connect(worker.run)
+
+    for signal in (worker.finished, worker.failed, getattr(worker, "cancelled", None)):
+        if signal is not None:
+            signal.connect(thread.quit)
+    thread.finished.connect(worker.deleteLater)
+    thread.finished.connect(thread.deleteLater)
+
+    thread.start()
+    return thread
@@ -24,4 +24,32 @@ def parse_time(time_str):
     try:
         return datetime.strptime(time_str, "%H:%M").time()
     except ValueError:
-        return None 
\ No newline at end of file
+        return None 
+
+def _parse_column(values, fmt):
+    """Convierte una columna de cadenas con pandas y devuelve (serie datetime, máscara de válidos)"""
+    # Importación diferida: pandas solo se carga cuando se procesa un lote
+    import pandas as pd
+
+    serie = pd.Series(values, dtype=object).astype(str).str.strip()
+    parsed = pd.to_datetime(serie, format=fmt, errors="coerce")
+    return parsed, parsed.notna().to_numpy()
+
+
+def parse_dates(values):
+    """Convierte de una sola pasada una secuencia de cadenas dd/mm/aaaa en objetos date
+
+    Devuelve (fechas, validos): un arreglo de objetos date y una máscara booleana que
+    indica qué posiciones eran fechas válidas. Las posiciones inválidas deben ignorarse.
+    """
+    parsed, valid = _parse_column(values, "%d/%m/%Y")
+    return parsed.dt.date.to_numpy(), valid
+
+
+def parse_times(values):
+    """Convierte de una sola pasada una secuencia de cadenas hh:mm en objetos time
+
+    Devuelve (horas, validos) con el mismo formato que parse_dates.
+    """
+    parsed, valid = _parse_column(values, "%H:%M")
+    return parsed.dt.time.to_numpy(), valid
@@ -0,0 +1,77 @@
+from bisect import bisect_left, bisect_right
+
+
+def time_to_minutes(value):
+    """Convierte un objeto time en minutos desde la medianoche"""
+    return value.hour * 60 + value.minute
+
+
+def minutes_to_text(minutes):
+    """Formatea minutos desde la medianoche como hh:mm"""
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+class IntervalIndex:
+    """Índice de intervalos de ocupación por (laboratorio, fecha)
+
+    Para cada laboratorio y día guarda los intervalos ordenados por (inicio, fin) junto
+    con el máximo acumulado de los finales. Una consulta hace dos búsquedas binarias,
+    una por cada extremo, y solo recorre los candidatos entre ambas: O(log n + k) cuando
+    los intervalos guardados no se traslapan entre sí, como ocurre con los registros
+    validados.
+
+    El índice es una foto de la base de datos: se construye para cada operación (una
+    importación o un guardado) y durante una importación se completa con add() a medida
+    que se aceptan filas. No se mantiene entre operaciones porque otras pestañas pueden
+    eliminar o modificar registros.
+    """
+
+    def __init__(self):
+        # (laboratorio_id, fecha) -> (claves (inicio, fin) ordenadas, registro_id de cada
+        # clave, máximo de los finales hasta cada posición)
+        self._slots = {}
+
+    def __len__(self):
+        return sum(len(keys) for keys, _, _ in self._slots.values())
+
+    def add(self, laboratorio_id, fecha, hora_entrada, hora_salida, registro_id=None):
+        """Añade un intervalo de ocupación"""
+        start = time_to_minutes(hora_entrada)
+        end = time_to_minutes(hora_salida)
+        keys, ids, max_ends = self._slots.setdefault((laboratorio_id, fecha), ([], [], []))
+
+        # El orden solo usa (inicio, fin): los registro_id pueden ser None y no se comparan
+        pos = bisect_right(keys, (start, end))
+        keys.insert(pos, (start, end))
+        ids.insert(pos, registro_id)
+        max_ends.insert(pos, end)
+
+        # Recalcular el máximo acumulado desde la posición insertada
+        previous = max_ends[pos - 1] if pos else end
+        for k in range(pos, len(keys)):
+            previous = max(previous, keys[k][1])
+            max_ends[k] = previous
+
+    def overlaps(self, laboratorio_id, fecha, hora_entrada, hora_salida):
+        """Devuelve los intervalos (inicio, fin, registro_id) que se traslapan con el dado
+
+        Los extremos que solo se tocan (una sesión termina cuando la otra empieza) no
+        cuentan como traslape.
+        """
+        slot = self._slots.get((laboratorio_id, fecha))
+        if not slot:
+            return []
+        keys, ids, max_ends = slot
+
+        start = time_to_minutes(hora_entrada)
+        end = time_to_minutes(hora_salida)
+
+        # Solo pueden traslaparse los intervalos que empiezan antes del final consultado
+        # y que no están antes del primero cuyo final acumulado pasa del inicio consultado
+        limit = bisect_left(keys, (end,))
+        first = bisect_right(max_ends, start, 0, limit)
+        return [
+            (keys[k][0], keys[k][1], ids[k])
+            for k in range(first, limit)
+            if keys[k][1] > start
+        ]